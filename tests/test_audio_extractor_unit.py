@@ -4,6 +4,7 @@
 Feature: multi-model-orchestration, Task 6.2
 Validates: Requirements 2.1, 2.2
 """
+import io
 import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock, call
@@ -79,6 +80,20 @@ class TestAudioExtractorUnit:
             assert mock_ffmpeg.call_count == 1
             assert result1 == result2
     
+    def test_extract_cache_hit_skips_existence_check(self, extractor_with_cache, temp_dir):
+        """测试缓存命中时不检查视频文件是否存在"""
+        video_path = temp_dir / "test_video.mp4"
+        video_path.touch()
+        
+        with patch.object(extractor_with_cache, '_extract_with_ffmpeg'):
+            result1 = extractor_with_cache.extract(str(video_path))
+        
+        with patch('video_processor.audio_extractor.Path.exists') as mock_exists:
+            result2 = extractor_with_cache.extract(str(video_path))
+            mock_exists.assert_not_called()
+        
+        assert result1 == result2
+    
     def test_is_cached_returns_true_for_cached_audio(self, extractor_with_cache, temp_dir):
         """测试 is_cached 对已缓存的音频返回 True"""
         video_path = temp_dir / "test_video.mp4"
@@ -154,42 +169,116 @@ class TestAudioExtractorUnit:
             
             assert output_dir.exists()
     
-    @patch('subprocess.run')
-    def test_extract_with_ffmpeg_timeout(self, mock_run, extractor, temp_dir):
+    @patch('subprocess.Popen')
+    def test_extract_with_ffmpeg_timeout(self, mock_popen, extractor, temp_dir):
         """测试 ffmpeg 超时"""
         video_path = temp_dir / "test_video.mp4"
         video_path.touch()
         
         import subprocess
-        mock_run.side_effect = subprocess.TimeoutExpired("ffmpeg", 300)
+        mock_process = MagicMock()
+        mock_process.stderr = io.BytesIO(b"")
+        mock_process.wait.side_effect = [subprocess.TimeoutExpired("ffmpeg", 300), -9]
+        mock_popen.return_value = mock_process
         
-        with pytest.raises(ExtractionError, match="超时"):
-            extractor.extract(str(video_path))
+        with patch.object(extractor, '_probe_audio_codec', return_value=None):
+            with pytest.raises(ExtractionError, match="超时"):
+                extractor.extract(str(video_path))
+        
+        mock_process.kill.assert_called_once()
     
-    @patch('subprocess.run')
-    def test_extract_with_ffmpeg_not_found(self, mock_run, extractor, temp_dir):
+    @patch('subprocess.Popen')
+    def test_extract_with_ffmpeg_not_found(self, mock_popen, extractor, temp_dir):
         """测试 ffmpeg 未安装"""
         video_path = temp_dir / "test_video.mp4"
         video_path.touch()
         
-        mock_run.side_effect = FileNotFoundError("ffmpeg not found")
+        mock_popen.side_effect = FileNotFoundError("ffmpeg not found")
         
         with pytest.raises(ExtractionError, match="未安装"):
             extractor.extract(str(video_path))
     
-    @patch('subprocess.run')
-    def test_extract_with_ffmpeg_error(self, mock_run, extractor, temp_dir):
+    @patch('subprocess.Popen')
+    def test_extract_with_ffmpeg_error(self, mock_popen, extractor, temp_dir):
         """测试 ffmpeg 返回错误"""
         video_path = temp_dir / "test_video.mp4"
         video_path.touch()
         
+        mock_process = MagicMock()
+        mock_process.stderr = io.BytesIO(b"ffmpeg error message")
+        mock_process.wait.return_value = 1
+        mock_popen.return_value = mock_process
+        
+        with patch.object(extractor, '_probe_audio_codec', return_value=None):
+            with pytest.raises(ExtractionError, match="ffmpeg error message"):
+                extractor.extract(str(video_path))
+    
+    @patch('subprocess.Popen')
+    def test_extract_with_ffmpeg_error_keeps_stderr_tail(self, mock_popen, extractor, temp_dir):
+        """测试 ffmpeg 失败时只保留 stderr 末尾"""
+        video_path = temp_dir / "test_video.mp4"
+        video_path.touch()
+        
+        mock_process = MagicMock()
+        mock_process.stderr = io.BytesIO(b"x" * (1024 * 1024) + b"final error")
+        mock_process.wait.return_value = 1
+        mock_popen.return_value = mock_process
+        
+        with patch.object(extractor, '_probe_audio_codec', return_value=None):
+            with pytest.raises(ExtractionError) as exc_info:
+                extractor.extract(str(video_path))
+        
+        message = str(exc_info.value)
+        assert message.endswith("final error")
+        assert len(message) < 8192
+    
+    @patch('subprocess.Popen')
+    def test_extract_uses_stream_copy_for_matching_codec(self, mock_popen, extractor, temp_dir):
+        """测试源编码与目标格式一致时使用流复制"""
+        video_path = temp_dir / "test_video.mp4"
+        video_path.touch()
+        
+        mock_process = MagicMock()
+        mock_process.stderr = io.BytesIO(b"")
+        mock_process.wait.return_value = 0
+        mock_popen.return_value = mock_process
+        
+        with patch.object(extractor, '_probe_audio_codec', return_value="mp3"):
+            extractor.extract(str(video_path))
+        
+        cmd = mock_popen.call_args[0][0]
+        assert cmd[cmd.index("-c:a") + 1] == "copy"
+        assert "-q:a" not in cmd
+    
+    @patch('subprocess.Popen')
+    def test_extract_reencodes_for_different_codec(self, mock_popen, extractor, temp_dir):
+        """测试源编码与目标格式不同时重新编码"""
+        video_path = temp_dir / "test_video.mp4"
+        video_path.touch()
+        
+        mock_process = MagicMock()
+        mock_process.stderr = io.BytesIO(b"")
+        mock_process.wait.return_value = 0
+        mock_popen.return_value = mock_process
+        
+        with patch.object(extractor, '_probe_audio_codec', return_value="aac"):
+            extractor.extract(str(video_path))
+        
+        cmd = mock_popen.call_args[0][0]
+        assert "copy" not in cmd
+        assert "-q:a" in cmd
+    
+    @patch('subprocess.run')
+    def test_probe_audio_codec_is_memoized(self, mock_run, extractor):
+        """测试音频编码探测结果按路径缓存"""
         mock_result = MagicMock()
-        mock_result.returncode = 1
-        mock_result.stderr = "ffmpeg error message"
+        mock_result.returncode = 0
+        mock_result.stdout = "aac\n"
         mock_run.return_value = mock_result
         
-        with pytest.raises(ExtractionError, match="ffmpeg 命令失败"):
-            extractor.extract(str(video_path))
+        assert extractor._probe_audio_codec("/any/video.mp4") == "aac"
+        assert extractor._probe_audio_codec("/any/video.mp4") == "aac"
+        assert mock_run.call_count == 1
     
     def test_extract_multiple_videos_independently(self, extractor_with_cache, temp_dir):
         """测试独立提取多个视频"""
@@ -211,3 +300,39 @@ class TestAudioExtractorUnit:
             # 所有结果都应该被缓存
             for video_path in videos:
                 assert extractor_with_cache.is_cached(str(video_path))
+    
+    def test_extract_concurrent_caches_results(self, extractor_with_cache, temp_dir):
+        """测试并发提取的结果被批量写入缓存"""
+        from video_processor.thread_pool import ThreadPool
+        
+        videos = []
+        for i in range(20):
+            video_path = temp_dir / f"test_video_{i}.mp4"
+            video_path.touch()
+            videos.append(str(video_path))
+        
+        with patch.object(extractor_with_cache, '_extract_with_ffmpeg'):
+            with ThreadPool(max_workers=4) as pool:
+                results = extractor_with_cache.extract_concurrent(videos, thread_pool=pool)
+        
+        assert all(results[video] is not None for video in videos)
+        # 缓存容量为 10，最近写入的结果应该可以命中
+        assert extractor_with_cache.get_cached_audio(videos[-1]) == results[videos[-1]]
+    
+    def test_extract_concurrent_shared_pool_task_ids(self, extractor, temp_dir):
+        """测试重复路径和共享线程池的多次调用使用互不冲突的任务 ID"""
+        from video_processor.thread_pool import ThreadPool
+        
+        video_path = temp_dir / "test_video.mp4"
+        video_path.touch()
+        videos = [str(video_path), str(video_path)]
+        
+        with patch.object(extractor, '_extract_with_ffmpeg'):
+            with ThreadPool(max_workers=2) as pool:
+                first = extractor.extract_concurrent(videos, thread_pool=pool)
+                second = extractor.extract_concurrent(videos, thread_pool=pool)
+                submitted = pool.submitted_count
+        
+        assert first[str(video_path)] is not None
+        assert second[str(video_path)] is not None
+        assert submitted == 4
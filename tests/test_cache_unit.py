@@ -2,7 +2,9 @@
 缓存系统单元测试
 """
 import pytest
-from video_processor.cache import LRUCache, CacheKeyGenerator
+from video_processor.cache import (
+    LRUCache, ClockCache, SQLiteCache, TwoTierCache, CacheKeyGenerator, create_cache
+)
 from video_processor.exceptions import CacheError
 
 
@@ -111,6 +113,63 @@ class TestLRUCacheUnit:
         time.sleep(1.1)
         assert cache.get("key1") is None
 
+    
+    def test_cache_str_fast_path(self):
+        """测试字符串键快速路径"""
+        cache = LRUCache(max_size=2)
+        cache.set_str("key1", "value1")
+        assert cache.get_str("key1") == "value1"
+        assert cache.get("key1") == "value1"
+        assert cache.get_str("missing") is None
+        
+        # 与 set 共享驱逐策略
+        cache.set_str("key2", "value2")
+        cache.set_str("key3", "value3")
+        assert cache.size() == 2
+        assert cache.get_str("key1") is None
+        
+        stats = cache.get_stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 2
+
+    
+    def test_cache_set_many(self):
+        """测试批量设置"""
+        cache = LRUCache(max_size=3)
+        cache.set_many([("key1", "value1"), ("key2", "value2")])
+        assert cache.get("key1") == "value1"
+        assert cache.get("key2") == "value2"
+        
+        # 批量写入同样遵守容量限制
+        cache.set_many([("key3", "value3"), ("key4", "value4")])
+        assert cache.size() == 3
+        assert cache.get("key1") is None
+        assert cache.get("key4") == "value4"
+    
+    def test_cache_on_evict(self):
+        """测试容量驱逐回调"""
+        evicted = []
+        cache = LRUCache(max_size=2, on_evict=lambda k, v: evicted.append((k, v)))
+        cache.set("key1", "value1")
+        cache.set_str("key2", "value2")
+        cache.get("key1")
+        cache.set_str("key3", "value3")
+        
+        assert evicted == [("key2", "value2")]
+        
+        # 显式删除不触发回调
+        cache.delete("key1")
+        assert len(evicted) == 1
+    
+    def test_cache_items(self):
+        """测试获取缓存项快照"""
+        cache = LRUCache(max_size=3)
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")
+        cache.get("key1")
+        
+        assert cache.items() == [("key2", "value2"), ("key1", "value1")]
+
 
 class TestCacheKeyGenerator:
     """缓存键生成器单元测试"""
@@ -176,3 +235,111 @@ class TestCacheKeyGenerator:
         
         key3 = gen.generate_key("arg1", "arg2", kwarg1="value2")
         assert key1 != key3
+
+
+class TestClockCacheUnit:
+    """CLOCK 缓存单元测试"""
+    
+    def test_clock_set_and_get(self):
+        """测试设置、获取和删除"""
+        cache = ClockCache(max_size=10)
+        cache.set("key1", "value1")
+        cache.set_str("key2", "value2")
+        
+        assert cache.get("key1") == "value1"
+        assert cache.get_str("key2") == "value2"
+        assert cache.get("nonexistent") is None
+        assert cache.delete("key1")
+        assert "key1" not in cache
+        assert cache.size() == 1
+    
+    def test_clock_second_chance_eviction(self):
+        """测试被引用过的项获得二次机会"""
+        cache = ClockCache(max_size=3)
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")
+        cache.set("key3", "value3")
+        
+        # 引用 key1，插入新项时应驱逐未被引用的 key2
+        cache.get("key1")
+        cache.set("key4", "value4")
+        
+        assert cache.get("key1") == "value1"
+        assert cache.get("key2") is None
+        assert cache.get("key3") == "value3"
+        assert cache.get("key4") == "value4"
+        assert cache.size() == 3
+    
+    def test_clock_ttl_expiration(self):
+        """测试 TTL 过期"""
+        import time
+        cache = ClockCache(max_size=10, ttl=1)
+        cache.set("key1", "value1")
+        time.sleep(1.1)
+        
+        assert cache.get("key1") is None
+        assert "key1" not in cache
+    
+    def test_create_cache_policy(self):
+        """测试按策略创建缓存"""
+        assert isinstance(create_cache(max_size=10), LRUCache)
+        assert isinstance(create_cache(max_size=10, policy="clock"), ClockCache)
+        with pytest.raises(CacheError):
+            create_cache(max_size=10, policy="fifo")
+
+
+class TestTwoTierCache:
+    """两级缓存单元测试"""
+    
+    def test_survives_restart(self, tmp_path):
+        """测试持久化层在重新打开后仍可命中，并提升到内存层"""
+        path = tmp_path / "cache.db"
+        cache = TwoTierCache(LRUCache(max_size=10), SQLiteCache(path))
+        cache.set("key1", "总结")
+        cache.close()
+        
+        l1 = LRUCache(max_size=10)
+        cache = TwoTierCache(l1, SQLiteCache(path))
+        assert "key1" not in l1
+        assert cache.get("key1") == "总结"
+        assert l1.get("key1") == "总结"
+        cache.close()
+    
+    def test_l1_eviction_falls_back_to_l2(self, tmp_path):
+        """测试内存层驱逐后从持久化层读回"""
+        cache = TwoTierCache(LRUCache(max_size=1), SQLiteCache(tmp_path / "cache.db"))
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")
+        
+        assert cache.get("key1") == "value1"
+        assert cache.get_stats()["l2"]["hits"] == 1
+        cache.close()
+    
+    def test_delete_and_clear(self, tmp_path):
+        """测试删除和清空作用于两层"""
+        cache = TwoTierCache(LRUCache(max_size=10), SQLiteCache(tmp_path / "cache.db"))
+        cache.set_many([("key1", "value1"), ("key2", "value2")])
+        
+        assert cache.delete("key1")
+        assert cache.get("key1") is None
+        assert not cache.delete("key1")
+        
+        cache.clear()
+        assert "key2" not in cache
+        assert len(cache.l2) == 0
+        cache.close()
+    
+    def test_sqlite_ttl_and_unserializable(self, tmp_path):
+        """测试持久化层的过期和不可序列化的值"""
+        cache = SQLiteCache(tmp_path / "cache.db", ttl=60)
+        cache.set("key1", "value1")
+        assert cache.get("key1") == "value1"
+        
+        with cache._conn:
+            cache._conn.execute("UPDATE cache SET ts = 0")
+        assert cache.get("key1") is None
+        assert "key1" not in cache
+        
+        with pytest.raises(CacheError):
+            cache.set("key2", object())
+        cache.close()
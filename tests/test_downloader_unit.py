@@ -59,6 +59,15 @@ class TestVideoDownloaderUnit:
         with pytest.raises(DownloadError):
             downloader._detect_platform(url)
     
+    def test_detect_platform_uses_host_only(self, downloader):
+        """测试平台检测只看域名，不看路径和查询参数"""
+        url = "https://www.example.com/redirect?to=youtube.com"
+        with pytest.raises(DownloadError):
+            downloader._detect_platform(url)
+        
+        url = "https://WWW.YOUTUBE.COM/watch?v=dQw4w9WgXcQ"
+        assert downloader._detect_platform(url) == "youtube"
+    
     def test_is_cached_not_exists(self, downloader):
         """测试检查不存在的缓存"""
         url = "https://www.youtube.com/watch?v=test"
@@ -0,0 +1,41 @@
+"""
+共用 HTTP 会话单元测试
+"""
+import asyncio
+
+import openai
+
+from video_processor.http_session import shared_openai_session
+
+
+class TestSharedOpenAISession:
+    """共用 HTTP 会话单元测试"""
+    
+    def test_session_set_and_restored(self):
+        """测试上下文内设置 openai.aiosession，退出后恢复并关闭会话"""
+        async def main():
+            seen = []
+            
+            async def child():
+                seen.append(openai.aiosession.get())
+            
+            async with shared_openai_session(limit=4) as session:
+                assert openai.aiosession.get() is session
+                await asyncio.gather(child(), child())
+            
+            assert openai.aiosession.get() is None
+            return session, seen
+        
+        session, seen = asyncio.run(main())
+        assert seen == [session, session]
+        assert session.closed
+    
+    def test_existing_session_not_replaced(self):
+        """测试调用方已设置的会话不被替换"""
+        async def main():
+            async with shared_openai_session() as outer:
+                async with shared_openai_session() as inner:
+                    assert inner is None
+                    assert openai.aiosession.get() is outer
+        
+        asyncio.run(main())
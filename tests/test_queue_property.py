@@ -117,12 +117,12 @@ class TestMessageQueueProperty:
                 
                 # 检查任务状态
                 status = queue.get_status(task.task_id)
-                if status["retry_count"] < 3:
+                if status["retry_count"] <= status["max_retries"]:
                     # 应该重新入队
-                    assert status["status"] == TaskStatus.PENDING.value
+                    assert status["status"] == "pending"
                 else:
                     # 应该标记为失败
-                    assert status["status"] == TaskStatus.FAILED.value
+                    assert status["status"] == "failed"
     
     @given(
         num_tasks=st.integers(min_value=1, max_value=100),
@@ -160,7 +160,7 @@ class TestMessageQueueProperty:
         
         # 验证初始状态
         status = queue.get_status(task_id)
-        assert status["status"] == TaskStatus.PENDING.value
+        assert status["status"] == "pending"
         
         # 出队任务
         task = queue.dequeue(timeout=1)
@@ -168,11 +168,11 @@ class TestMessageQueueProperty:
         
         # 验证运行状态
         status = queue.get_status(task_id)
-        assert status["status"] == TaskStatus.RUNNING.value
+        assert status["status"] == "running"
         
         # 标记为完成
         queue.mark_completed(task_id)
         
         # 验证完成状态
         status = queue.get_status(task_id)
-        assert status["status"] == TaskStatus.COMPLETED.value
+        assert status["status"] == "completed"
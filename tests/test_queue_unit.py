@@ -25,6 +25,15 @@ class TestMessageQueueUnit:
         assert task_id is not None
         assert queue.get_queue_length() == 1
     
+    def test_queue_task_ids_unique_hex(self):
+        """测试任务 ID 为互不相同的 32 位十六进制串"""
+        queue = MessageQueue(max_size=10000)
+        task_ids = queue.enqueue_many([(TaskType.DOWNLOAD, {}) for _ in range(5000)])
+        
+        assert len(set(task_ids)) == 5000
+        assert all(len(task_id) == 32 for task_id in task_ids)
+        int(task_ids[0], 16)
+    
     def test_queue_dequeue(self):
         """测试任务出队"""
         queue = MessageQueue(max_size=100)
@@ -50,7 +59,7 @@ class TestMessageQueueUnit:
         queue.mark_completed(task_id)
         
         status = queue.get_status(task_id)
-        assert status["status"] == TaskStatus.COMPLETED.value
+        assert status["status"] == "completed"
     
     def test_queue_mark_failed(self):
         """测试标记任务失败"""
@@ -61,7 +70,7 @@ class TestMessageQueueUnit:
         queue.mark_failed(task_id, "测试错误")
         
         status = queue.get_status(task_id)
-        assert status["status"] == TaskStatus.PENDING.value  # 应该重试
+        assert status["status"] == "pending"  # 应该重试
         assert status["retry_count"] == 1
     
     def test_queue_max_retries(self):
@@ -83,9 +92,40 @@ class TestMessageQueueUnit:
         queue.mark_failed(task_id, "最终错误")
         
         status = queue.get_status(task_id)
-        assert status["status"] == TaskStatus.FAILED.value
+        assert status["status"] == "failed"
         assert status["retry_count"] == 4  # 初始 + 3 次重试 + 1 次最终失败
     
+    def test_queue_retry_when_full_marks_failed(self):
+        """测试重试时队列已满则任务直接标记为失败"""
+        queue = MessageQueue(max_size=1)
+        task_id = queue.enqueue(TaskType.DOWNLOAD, {})
+        queue.dequeue(timeout=1)
+        queue.enqueue(TaskType.DOWNLOAD, {})
+        
+        queue.mark_failed(task_id, "boom")
+        
+        assert queue.get_status(task_id)["status"] == "failed"
+        stats = queue.get_stats()
+        assert stats["failed_tasks"] == 1
+        assert stats["pending_tasks"] == 1
+        assert stats["running_tasks"] == 0
+    
+    def test_queue_retry_not_starved(self):
+        """测试重试任务与新任务交替取出，不排在全部积压任务之后"""
+        from video_processor.queue import RETRY_SHARE
+        
+        queue = MessageQueue(max_size=100)
+        task_id = queue.enqueue(TaskType.DOWNLOAD, {"index": 0})
+        queue.enqueue_many([(TaskType.DOWNLOAD, {"index": i}) for i in range(1, 20)])
+        
+        queue.dequeue(timeout=1)
+        queue.mark_failed(task_id, "retry")
+        assert queue.get_stats()["retry_queue_length"] == 1
+        
+        taken = [queue.dequeue(timeout=1).task_id for _ in range(RETRY_SHARE)]
+        assert task_id in taken
+        assert taken[0] != task_id  # 新任务优先
+    
     def test_queue_get_status(self):
         """测试获取任务状态"""
         queue = MessageQueue(max_size=100)
@@ -94,7 +134,7 @@ class TestMessageQueueUnit:
         status = queue.get_status(task_id)
         assert status is not None
         assert status["task_id"] == task_id
-        assert status["status"] == TaskStatus.PENDING.value
+        assert status["status"] == "pending"
     
     def test_queue_get_nonexistent_status(self):
         """测试获取不存在的任务状态"""
@@ -124,6 +164,26 @@ class TestMessageQueueUnit:
         assert stats["running_tasks"] == 0
         assert stats["completed_tasks"] == 1
     
+    def test_queue_enqueue_records_pending_before_publishing(self):
+        """测试 PENDING 转换在任务对消费者可见之前记录，入队失败时撤销"""
+        queue = MessageQueue(max_size=1)
+        put_nowait = queue._put_nowait
+        recorded = []
+        
+        def checking_put(task, *args, **kwargs):
+            recorded.append(queue.get_stats()["pending_tasks"])
+            return put_nowait(task, *args, **kwargs)
+        
+        queue._put_nowait = checking_put
+        queue.enqueue(TaskType.DOWNLOAD, {"index": 0})
+        with pytest.raises(QueueError):
+            queue.enqueue(TaskType.DOWNLOAD, {"index": 1})
+        
+        assert recorded == [1, 2]
+        stats = queue.get_stats()
+        assert stats["total_tasks"] == 1
+        assert stats["pending_tasks"] == 1
+    
     def test_queue_clear(self):
         """测试清空队列"""
         queue = MessageQueue(max_size=100)
@@ -201,3 +261,206 @@ class TestMessageQueueUnit:
         queue.dequeue(timeout=1)
         
         assert queue.get_pending_count() == 2
+    
+    def test_queue_dequeue_batch(self):
+        """测试批量出队"""
+        queue = MessageQueue(max_size=100)
+        
+        task_ids = [queue.enqueue(TaskType.DOWNLOAD, {"index": i}) for i in range(5)]
+        
+        batch = queue.dequeue_batch(3, timeout=1)
+        
+        assert [task.task_id for task in batch] == task_ids[:3]
+        assert all(task.status == TaskStatus.RUNNING for task in batch)
+        assert queue.get_queue_length() == 2
+        assert len(queue.dequeue_batch(10, timeout=1)) == 2
+        assert queue.dequeue_batch(10, timeout=0.1) == []
+    
+    def test_queue_enqueue_many(self):
+        """测试批量入队"""
+        queue = MessageQueue(max_size=100)
+        
+        task_ids = queue.enqueue_many([(TaskType.DOWNLOAD, {"index": i}) for i in range(4)])
+        
+        assert len(task_ids) == 4
+        assert queue.get_queue_length() == 4
+        assert queue.get_pending_count() == 4
+        batch = queue.dequeue_batch(10, timeout=1)
+        assert [task.task_id for task in batch] == task_ids
+        assert [task.input_data["index"] for task in batch] == [0, 1, 2, 3]
+    
+    def test_queue_enqueue_many_over_capacity(self):
+        """测试批量入队超出容量时整批失败"""
+        queue = MessageQueue(max_size=3)
+        queue.enqueue(TaskType.DOWNLOAD, {})
+        
+        with pytest.raises(QueueError):
+            queue.enqueue_many([(TaskType.DOWNLOAD, {}) for _ in range(3)])
+        
+        assert queue.get_queue_length() == 1
+    
+    def test_queue_rejected_enqueue_not_registered(self):
+        """测试队列已满时被拒绝的任务不会留在任务映射中"""
+        queue = MessageQueue(max_size=1)
+        queue.enqueue(TaskType.DOWNLOAD, {})
+        
+        with pytest.raises(QueueError):
+            queue.enqueue(TaskType.DOWNLOAD, {})
+        
+        assert len(queue.tasks) == 1
+        assert queue.get_stats()["pending_tasks"] == 1
+    
+    def test_queue_dequeued_task_is_registered(self):
+        """测试消费者取到的任务已在任务映射中登记"""
+        import threading
+        
+        queue = MessageQueue(max_size=1000)
+        missing = []
+        
+        def consume():
+            while True:
+                task = queue.dequeue(timeout=1)
+                if task is None:
+                    return
+                if not queue.mark_completed(task.task_id):
+                    missing.append(task.task_id)
+        
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        for i in range(200):
+            queue.enqueue(TaskType.DOWNLOAD, {"index": i})
+        queue.close()
+        consumer.join(timeout=5)
+        
+        assert missing == []
+    
+    def test_queue_capacity_released_on_dequeue(self):
+        """测试出队后容量归还，满队列可再次入队"""
+        queue = MessageQueue(max_size=2)
+        queue.enqueue_many([(TaskType.DOWNLOAD, {}), (TaskType.DOWNLOAD, {})])
+        
+        with pytest.raises(QueueError):
+            queue.enqueue(TaskType.DOWNLOAD, {})
+        
+        queue.dequeue(timeout=1)
+        queue.enqueue(TaskType.DOWNLOAD, {})
+        assert queue.get_queue_length() == 2
+    
+    def test_queue_concurrent_producers_consumers(self):
+        """测试多生产者多消费者下每个任务恰好被取出一次"""
+        import threading
+        
+        queue = MessageQueue(max_size=1000)
+        taken = []
+        
+        def produce():
+            for i in range(100):
+                queue.enqueue(TaskType.DOWNLOAD, {"index": i})
+        
+        def consume():
+            while True:
+                batch = queue.dequeue_batch(8, timeout=1)
+                if not batch:
+                    return
+                taken.extend(task.task_id for task in batch)
+        
+        consumers = [threading.Thread(target=consume) for _ in range(4)]
+        producers = [threading.Thread(target=produce) for _ in range(4)]
+        for thread in consumers + producers:
+            thread.start()
+        for thread in producers:
+            thread.join()
+        queue.close()
+        for thread in consumers:
+            thread.join(timeout=5)
+        
+        assert len(taken) == len(set(taken)) == 400
+        assert queue.get_queue_length() == 0
+    
+    def test_queue_status_counters_match_tasks(self):
+        """测试维护的状态计数与任务实际状态一致"""
+        queue = MessageQueue(max_size=100)
+        task_ids = queue.enqueue_many([(TaskType.DOWNLOAD, {"index": i}) for i in range(6)])
+        queue.dequeue_batch(4, timeout=1)
+        queue.mark_completed(task_ids[0])
+        queue.mark_completed_many(task_ids[1:2])
+        queue.mark_failed(task_ids[2], "retry")
+        
+        stats = queue.get_stats()
+        statuses = [task.status for task in queue.tasks.values()]
+        
+        assert stats["pending_tasks"] == statuses.count(TaskStatus.PENDING) == 3
+        assert stats["running_tasks"] == statuses.count(TaskStatus.RUNNING) == 1
+        assert stats["completed_tasks"] == statuses.count(TaskStatus.COMPLETED) == 2
+        assert stats["failed_tasks"] == 0
+        assert queue.get_pending_count() == 3
+    
+    def test_queue_evicts_terminal_tasks(self):
+        """测试已结束任务超过保留时间后被移除"""
+        queue = MessageQueue(max_size=100, terminal_ttl=0)
+        first, second = queue.enqueue_many([(TaskType.DOWNLOAD, {}), (TaskType.DOWNLOAD, {})])
+        queue.dequeue_batch(2, timeout=1)
+        
+        queue.mark_completed(first)
+        queue.mark_completed(second)
+        
+        # 到期任务在后续状态变更时清理
+        assert queue.get_status(first) is None
+        stats = queue.get_stats()
+        assert stats["completed_count"] == 2
+        assert stats["completed_tasks"] == len(queue.tasks)
+    
+    def test_queue_limits_terminal_tasks(self):
+        """测试已结束任务超过数量上限时提前移除最早结束的任务"""
+        queue = MessageQueue(max_size=100, terminal_ttl=None, terminal_limit=3)
+        task_ids = queue.enqueue_many([(TaskType.DOWNLOAD, {}) for _ in range(5)])
+        queue.dequeue_batch(5, timeout=1)
+        
+        for task_id in task_ids:
+            queue.mark_completed(task_id)
+        
+        assert [queue.get_status(task_id) is None for task_id in task_ids] == [
+            True, True, False, False, False
+        ]
+        stats = queue.get_stats()
+        assert stats["completed_count"] == 5
+        assert stats["completed_tasks"] == len(queue.tasks) == 3
+    
+    def test_queue_close_wakes_blocked_consumer(self):
+        """测试关闭队列唤醒阻塞的批量出队"""
+        import threading
+        
+        queue = MessageQueue(max_size=100)
+        results = []
+        consumer = threading.Thread(target=lambda: results.append(queue.dequeue_batch(10)))
+        consumer.start()
+        
+        time.sleep(0.1)
+        queue.close()
+        consumer.join(timeout=2)
+        
+        assert not consumer.is_alive()
+        assert results == [[]]
+    
+    def test_queue_close_drains_remaining(self):
+        """测试关闭后仍可取出剩余任务"""
+        queue = MessageQueue(max_size=100)
+        queue.enqueue(TaskType.DOWNLOAD, {"index": 0})
+        queue.close()
+        
+        assert len(queue.dequeue_batch(10)) == 1
+        assert queue.dequeue_batch(10) == []
+    
+    def test_queue_mark_completed_many(self):
+        """测试批量标记完成"""
+        queue = MessageQueue(max_size=100)
+        
+        task_ids = [queue.enqueue(TaskType.DOWNLOAD, {"index": i}) for i in range(3)]
+        queue.dequeue_batch(3, timeout=1)
+        
+        marked = queue.mark_completed_many(task_ids + ["nonexistent"])
+        
+        assert marked == 3
+        stats = queue.get_stats()
+        assert stats["completed_tasks"] == 3
+        assert stats["completed_count"] == 3
@@ -0,0 +1,86 @@
+"""
+速率限制器单元测试
+"""
+import asyncio
+import time
+
+import pytest
+
+from video_processor import rate_limiter
+from video_processor.rate_limiter import RateLimiter, count_tokens, estimate_tokens
+
+
+class TestRateLimiterUnit:
+    """速率限制器单元测试"""
+    
+    def test_invalid_limits(self):
+        """测试非正限额被拒绝"""
+        with pytest.raises(ValueError):
+            RateLimiter(max_requests_per_minute=0)
+        with pytest.raises(ValueError):
+            RateLimiter(max_tokens_per_minute=-1)
+    
+    def test_estimate_tokens(self):
+        """测试 token 估计"""
+        assert estimate_tokens("a" * 400, max_length=200) == 150
+    
+    def test_count_tokens(self):
+        """测试 token 计数（未安装 tiktoken 时按字符数估计）"""
+        assert count_tokens("") == 0
+        if rate_limiter.tiktoken is None:
+            assert count_tokens("a" * 400) == 100
+        else:
+            assert 0 < count_tokens("hello world") < len("hello world")
+    
+    def test_acquire_within_capacity_is_immediate(self):
+        """测试容量充足时立即返回并扣减"""
+        limiter = RateLimiter(max_requests_per_minute=60, max_tokens_per_minute=6000)
+        
+        start = time.monotonic()
+        asyncio.run(limiter.acquire(1000))
+        
+        assert time.monotonic() - start < 0.05
+        assert limiter.available_request_capacity < 60
+        assert limiter.available_token_capacity < 5001
+    
+    def test_acquire_waits_for_token_refill(self):
+        """测试 token 容量不足时等待补充"""
+        # 每秒补充 100 个 token
+        limiter = RateLimiter(max_requests_per_minute=6000, max_tokens_per_minute=6000)
+        
+        async def run():
+            await limiter.acquire(6000)
+            start = time.monotonic()
+            await limiter.acquire(10)
+            return time.monotonic() - start
+        
+        assert asyncio.run(run()) >= 0.08
+    
+    def test_acquire_waits_for_request_refill(self):
+        """测试请求数容量不足时等待补充"""
+        # 每秒补充 20 个请求
+        limiter = RateLimiter(max_requests_per_minute=1200, max_tokens_per_minute=60000)
+        limiter.available_request_capacity = 0
+        
+        start = time.monotonic()
+        asyncio.run(limiter.acquire())
+        
+        assert time.monotonic() - start >= 0.04
+    
+    def test_oversized_request_does_not_block_forever(self):
+        """测试超过每分钟限额的单次请求在桶满时放行"""
+        limiter = RateLimiter(max_requests_per_minute=60, max_tokens_per_minute=100)
+        
+        asyncio.run(asyncio.wait_for(limiter.acquire(10 ** 6), timeout=1))
+    
+    def test_acquire_sync_waits_for_refill(self):
+        """测试同步 acquire 与异步共用令牌桶并阻塞等待补充"""
+        # 每秒补充 20 个请求
+        limiter = RateLimiter(max_requests_per_minute=1200, max_tokens_per_minute=60000)
+        asyncio.run(limiter.acquire())
+        limiter.available_request_capacity = 0
+        
+        start = time.monotonic()
+        limiter.acquire_sync()
+        
+        assert time.monotonic() - start >= 0.04
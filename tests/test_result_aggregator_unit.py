@@ -85,6 +85,82 @@ class TestResultAggregatorUnit:
         assert saved_data["transcript"] == "Test transcript"
         assert saved_data["summary"] == "Test summary"
     
+    def test_save_overwrites_atomically(self, aggregator, sample_metadata, temp_storage_dir):
+        """测试重复保存覆盖原文件且不残留临时文件"""
+        result = aggregator.aggregate(
+            task_id="task_001",
+            video_metadata=sample_metadata,
+            video_path="/path/to/video.mp4",
+            audio_path="/path/to/audio.mp3",
+            transcript="Old transcript",
+            summary="Test summary",
+            processing_time=5.0
+        )
+        aggregator.save(result)
+        result = aggregator.aggregate(
+            task_id="task_001",
+            video_metadata=sample_metadata,
+            video_path="/path/to/video.mp4",
+            audio_path="/path/to/audio.mp3",
+            transcript="New transcript",
+            summary="Test summary",
+            processing_time=5.0
+        )
+        filepath = aggregator.save(result)
+        
+        with open(filepath, 'r', encoding='utf-8') as f:
+            assert json.load(f)["transcript"] == "New transcript"
+        assert not list(temp_storage_dir.glob(".*.tmp"))
+    
+    def test_filter_large_result_file(self, aggregator, sample_metadata):
+        """测试超过 mmap 阈值的大结果文件可以正常加载"""
+        transcript = "长文本" * 30000
+        result = aggregator.aggregate(
+            task_id="task_large",
+            video_metadata=sample_metadata,
+            video_path="/path/to/video.mp4",
+            audio_path="/path/to/audio.mp3",
+            transcript=transcript,
+            summary="Test summary",
+            processing_time=5.0
+        )
+        aggregator.save(result)
+        
+        results = aggregator.list_all()
+        assert len(results) == 1
+        assert results[0].transcript == transcript
+    
+    def test_write_behind_save(self, temp_storage_dir, sample_metadata):
+        """测试后台写入：flush 后文件和索引可见，close 写完排队中的结果"""
+        aggregator = ResultAggregator(storage_dir=temp_storage_dir, write_behind=True)
+        for i in range(5):
+            result = aggregator.aggregate(
+                task_id=f"task_{i:03d}",
+                video_metadata=sample_metadata,
+                video_path=f"/path/to/video{i}.mp4",
+                audio_path=f"/path/to/audio{i}.mp3",
+                transcript=f"Transcript {i}",
+                summary=f"Summary {i}",
+                processing_time=1.0
+            )
+            filepath = aggregator.save(result)
+        
+        aggregator.flush()
+        assert Path(filepath).exists()
+        assert len(aggregator.filter_by_source("youtube")) == 5
+        
+        aggregator.save(aggregator.aggregate(
+            task_id="task_last",
+            video_metadata=sample_metadata,
+            video_path="/path/to/video.mp4",
+            audio_path="/path/to/audio.mp3",
+            transcript="Last",
+            summary="Last",
+            processing_time=1.0
+        ))
+        aggregator.close()
+        assert (temp_storage_dir / "task_last.json").exists()
+    
     def test_retrieve_result(self, aggregator, sample_metadata):
         """测试检索结果"""
         # 创建并保存结果
@@ -136,6 +212,33 @@ class TestResultAggregatorUnit:
         assert query_result["transcript"] == "Test transcript"
         assert "created_at" in query_result
     
+    def test_query_serves_saved_bytes(self, aggregator, sample_metadata):
+        """测试已保存结果的查询与 to_dict 一致，重新聚合后返回新内容"""
+        result = aggregator.aggregate(
+            task_id="task_001",
+            video_metadata=sample_metadata,
+            video_path="/path/to/video.mp4",
+            audio_path="/path/to/audio.mp3",
+            transcript="Test transcript",
+            summary="Test summary",
+            processing_time=5.0
+        )
+        aggregator.save(result)
+        
+        assert "task_001" in aggregator._bytes_cache
+        assert aggregator.query("task_001") == result.to_dict()
+        
+        updated = aggregator.aggregate(
+            task_id="task_001",
+            video_metadata=sample_metadata,
+            video_path="/path/to/video.mp4",
+            audio_path="/path/to/audio.mp3",
+            transcript="Updated transcript",
+            summary="Test summary",
+            processing_time=5.0
+        )
+        assert aggregator.query("task_001") == updated.to_dict()
+    
     def test_filter_by_date(self, aggregator, sample_metadata):
         """测试按日期过滤"""
         # 创建多个结果
@@ -324,6 +427,31 @@ class TestResultAggregatorUnit:
         assert stats["results_by_platform"]["youtube"] == 3
         assert stats["total_processing_time"] == 15.0
     
+    def test_index_tracks_directory_changes(self, aggregator, sample_metadata):
+        """测试索引跟随存储目录中文件的增删和损坏"""
+        for i in range(3):
+            result = aggregator.aggregate(
+                task_id=f"task_{i:03d}",
+                video_metadata=sample_metadata,
+                video_path=f"/path/to/video{i}.mp4",
+                audio_path=f"/path/to/audio{i}.mp3",
+                transcript=f"Transcript {i}",
+                summary=f"Summary {i}",
+                processing_time=5.0
+            )
+            aggregator.save(result)
+        
+        # 绕过聚合器直接删除和损坏文件
+        (aggregator.storage_dir / "task_000.json").unlink()
+        (aggregator.storage_dir / "task_001.json").write_text("{not json", encoding='utf-8')
+        
+        assert [r.task_id for r in aggregator.list_all()] == ["task_002"]
+        assert aggregator.get_stats()["total_results"] == 1
+        
+        # 新的聚合器实例复用已有索引
+        reopened = ResultAggregator(storage_dir=aggregator.storage_dir)
+        assert [r.task_id for r in reopened.filter_by_source("youtube")] == ["task_002"]
+    
     def test_cache_retrieval(self, aggregator, sample_metadata):
         """测试缓存检索"""
         result = aggregator.aggregate(
@@ -343,6 +471,27 @@ class TestResultAggregatorUnit:
         assert cached_result.task_id == "task_001"
         assert "task_001" in aggregator._results_cache
     
+    def test_cache_bounded(self, temp_storage_dir, sample_metadata):
+        """测试结果缓存有上限，超出时驱逐最久未使用的结果"""
+        aggregator = ResultAggregator(storage_dir=temp_storage_dir, cache_size=2)
+        for i in range(3):
+            result = aggregator.aggregate(
+                task_id=f"task_{i:03d}",
+                video_metadata=sample_metadata,
+                video_path=f"/path/to/video{i}.mp4",
+                audio_path=f"/path/to/audio{i}.mp3",
+                transcript=f"Transcript {i}",
+                summary=f"Summary {i}",
+                processing_time=5.0
+            )
+            aggregator.save(result)
+            if i == 1:
+                aggregator.retrieve("task_000")
+        
+        assert list(aggregator._results_cache) == ["task_000", "task_002"]
+        # 被驱逐的结果仍可从文件读回
+        assert aggregator.retrieve("task_001").task_id == "task_001"
+    
     def test_result_to_dict(self, aggregator, sample_metadata):
         """测试结果转换为字典"""
         result = aggregator.aggregate(
@@ -362,3 +511,89 @@ class TestResultAggregatorUnit:
         assert result_dict["transcript"] == "Test transcript"
         assert result_dict["summary"] == "Test summary"
         assert "created_at" in result_dict
+        # 字典中的长字符串引用结果自身的字段，不另存副本
+        assert result_dict["transcript"] is result.transcript
+        assert result_dict["summary"] is result.summary
+    
+    def test_result_to_json(self, aggregator, sample_metadata):
+        """测试结果序列化为 JSON 字节串"""
+        result = aggregator.aggregate(
+            task_id="task_001",
+            video_metadata=sample_metadata,
+            video_path="/path/to/video.mp4",
+            audio_path="/path/to/audio.mp3",
+            transcript="测试转录",
+            summary="Test summary",
+            processing_time=5.0
+        )
+        
+        data = result.to_json()
+        
+        assert isinstance(data, bytes)
+        assert json.loads(data) == result.to_dict()
+        assert result.to_dict()["created_at"] == result.created_at.isoformat()
+    
+    def test_result_to_json_memoized(self, sample_metadata):
+        """测试耗时较长的结果复用序列化结果，极短的不缓存"""
+        slow = ProcessingResult(
+            task_id="task_001",
+            video_metadata=sample_metadata,
+            video_path="/path/to/video.mp4",
+            audio_path="/path/to/audio.mp3",
+            transcript="Test transcript",
+            summary="Test summary",
+            processing_time=5.0
+        )
+        fast = ProcessingResult(
+            task_id="task_002",
+            video_metadata=sample_metadata,
+            video_path="/path/to/video.mp4",
+            audio_path="/path/to/audio.mp3",
+            transcript="Test transcript",
+            summary="Test summary",
+            processing_time=0.0001
+        )
+        
+        assert slow.to_json() is slow.to_json()
+        assert "_cached_json" not in slow.to_dict()
+        fast.to_json()
+        assert fast._cached_json is None
+    
+    def test_result_to_dict_cached_copy(self, sample_metadata):
+        """测试 to_dict 复用缓存但返回互不影响的拷贝"""
+        result = ProcessingResult(
+            task_id="task_001",
+            video_metadata=sample_metadata,
+            video_path="/path/to/video.mp4",
+            audio_path="/path/to/audio.mp3",
+            transcript="Test transcript",
+            summary="Test summary",
+            processing_time=5.0
+        )
+        
+        first = result.to_dict()
+        first["summary"] = "changed"
+        first["video_metadata"]["title"] = "changed"
+        second = result.to_dict()
+        
+        assert second["summary"] == "Test summary"
+        assert second["video_metadata"]["title"] == sample_metadata.title
+        assert "_cached_dict" not in second
+    
+    def test_result_repr_omits_long_text(self, sample_metadata):
+        """测试 repr 只显示转录和摘要的长度"""
+        result = ProcessingResult(
+            task_id="task_001",
+            video_metadata=sample_metadata,
+            video_path="/path/to/video.mp4",
+            audio_path="/path/to/audio.mp3",
+            transcript="x" * 10000,
+            summary="Test summary",
+            processing_time=5.0
+        )
+        
+        text = repr(result)
+        
+        assert "transcript=<10000 chars>" in text
+        assert "summary=<12 chars>" in text
+        assert "x" * 100 not in text
@@ -313,7 +313,7 @@ class TestConcurrentProcessingIsolation:
             max_size=10
         )
     )
-    @patch('openai.ChatCompletion.create')
+    @patch('openai.ChatCompletion.acreate')
     def test_concurrent_processing_isolation(self, mock_create, transcripts, models):
         """属性测试：并发处理隔离
         
@@ -343,7 +343,7 @@ class TestConcurrentProcessingIsolation:
         assert len(results) == len(transcripts)
         
         # 验证所有结果都不为 None
-        for result in results.values():
+        for result in results:
             assert result is not None
     
     @given(
@@ -354,7 +354,7 @@ class TestConcurrentProcessingIsolation:
             unique=True
         )
     )
-    @patch('openai.ChatCompletion.create')
+    @patch('openai.ChatCompletion.acreate')
     def test_concurrent_processing_no_cross_contamination(self, mock_create, transcripts):
         """属性测试：并发处理无交叉污染
         
@@ -381,7 +381,7 @@ class TestConcurrentProcessingIsolation:
         assert len(results) == len(transcripts)
         
         # 验证所有结果都不相同（除非转录文本相同）
-        unique_results = set(results.values())
+        unique_results = set(results)
         # 由于我们有不同的转录文本，应该有多个不同的结果
         assert len(unique_results) >= 1
     
@@ -393,7 +393,7 @@ class TestConcurrentProcessingIsolation:
             unique=True
         )
     )
-    @patch('openai.ChatCompletion.create')
+    @patch('openai.ChatCompletion.acreate')
     def test_concurrent_processing_cache_isolation(self, mock_create, transcripts):
         """属性测试：并发处理缓存隔离
         
@@ -429,7 +429,7 @@ class TestConcurrentProcessingIsolation:
             unique=True
         )
     )
-    @patch('openai.ChatCompletion.create')
+    @patch('openai.ChatCompletion.acreate')
     def test_concurrent_processing_error_isolation(self, mock_create, transcripts):
         """属性测试：并发处理错误隔离
         
@@ -459,11 +459,11 @@ class TestConcurrentProcessingIsolation:
         assert len(results) == len(transcripts)
         
         # 验证至少有一个失败的结果
-        failed_results = [r for r in results.values() if r is None]
+        failed_results = [r for r in results if r is None]
         assert len(failed_results) >= 1
         
         # 验证至少有一个成功的结果
-        successful_results = [r for r in results.values() if r is not None]
+        successful_results = [r for r in results if r is not None]
         assert len(successful_results) >= 1
 
 
@@ -80,6 +80,23 @@ class TestModelSelector:
         )
         assert model == "gpt-4"
     
+    def test_select_model_escalates_when_context_too_small(self):
+        """测试输入超出所选模型上下文窗口时改用能容纳的最便宜模型"""
+        with patch('video_processor.summary_generator.count_tokens', return_value=9000):
+            model = self.selector.select_model("News content", content_type="news")
+        assert model == "gpt-4-turbo"
+        
+        assert self.selector._fit_context("gpt-3.5-turbo", 1000) == "gpt-3.5-turbo"
+        assert self.selector._fit_context("gpt-3.5-turbo", 5000) == "gpt-4-turbo"
+        assert self.selector._fit_context("gpt-4", 10**6) == "gpt-4-turbo"
+    
+    def test_select_model_uses_precomputed_token_count(self):
+        """测试传入 token 数时不再对转录文本计数"""
+        with patch('video_processor.summary_generator.count_tokens') as mock_count:
+            model = self.selector.select_model("News content", content_type="news", token_count=9000)
+        assert model == "gpt-4-turbo"
+        mock_count.assert_not_called()
+    
     def test_get_model_info(self):
         """测试获取模型信息"""
         info = self.selector.get_model_info("gpt-4")
@@ -188,6 +205,39 @@ class TestSummaryGenerator:
         with pytest.raises(SummarizationError):
             self.generator.generate(transcript)
     
+    @patch('openai.ChatCompletion.create')
+    def test_generate_stream(self, mock_create):
+        """测试流式生成：逐段返回，结束后写入缓存"""
+        def chunk(delta):
+            c = MagicMock()
+            c.choices[0].delta = delta
+            return c
+        
+        mock_create.return_value = iter([
+            chunk({"role": "assistant"}),
+            chunk({"content": "Streamed "}),
+            chunk({"content": "summary."}),
+            chunk({}),
+        ])
+        
+        transcript = "Test transcript for streaming"
+        parts = list(self.generator.generate_stream(transcript))
+        
+        assert parts == ["Streamed ", "summary."]
+        assert mock_create.call_args[1]["stream"] is True
+        # 缓存命中时一次返回完整总结
+        assert list(self.generator.generate_stream(transcript)) == ["Streamed summary."]
+        assert self.generator.generate(transcript) == "Streamed summary."
+        assert mock_create.call_count == 1
+    
+    @patch('openai.ChatCompletion.create')
+    def test_generate_stream_api_error(self, mock_create):
+        """测试流式生成的 API 错误处理"""
+        mock_create.side_effect = Exception("API Error")
+        
+        with pytest.raises(SummarizationError):
+            list(self.generator.generate_stream("Test transcript"))
+    
     @patch('openai.ChatCompletion.create')
     def test_generate_empty_response(self, mock_create):
         """测试空 API 响应"""
@@ -281,7 +331,7 @@ class TestSummaryGenerator:
         call_args = mock_create.call_args
         assert call_args[1]["max_tokens"] == 50  # 200 // 4
     
-    @patch('openai.ChatCompletion.create')
+    @patch('openai.ChatCompletion.acreate')
     def test_generate_concurrent(self, mock_create):
         """测试并发生成总结"""
         mock_response = MagicMock()
@@ -296,13 +346,237 @@ class TestSummaryGenerator:
         
         results = self.generator.generate_concurrent(transcripts)
         
-        # 应该返回字典
-        assert isinstance(results, dict)
-        # 应该有 3 个结果
-        assert len(results) == 3
-        # 所有值都应该是 "Summary"
-        for value in results.values():
-            assert value == "Summary"
+        # 应该返回与输入按下标对应的列表
+        assert results == ["Summary", "Summary", "Summary"]
+    
+    @patch('openai.ChatCompletion.acreate')
+    def test_generate_concurrent_keeps_same_prefix_items(self, mock_create):
+        """测试前缀相同的转录文本各自保留结果"""
+        def fake_create(**kwargs):
+            response = MagicMock()
+            content = kwargs["messages"][-1]["content"]
+            response.choices[0].message.content = "A" if "xA" in content else "B"
+            return response
+        
+        mock_create.side_effect = fake_create
+        prefix = "x" * 60
+        transcripts = [prefix + "A", prefix + "B"]
+        
+        results = self.generator.generate_concurrent(transcripts)
+        
+        assert results == ["A", "B"]
+    
+    @patch('openai.ChatCompletion.acreate')
+    def test_generate_concurrent_deduplicates(self, mock_create):
+        """测试重复的转录文本只请求一次"""
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = "Summary"
+        mock_create.return_value = mock_response
+        
+        results = self.generator.generate_concurrent(["A", "B", "A", "A"])
+        
+        assert results == ["Summary"] * 4
+        assert mock_create.call_count == 2
+    
+    def test_generate_concurrent_fail_fast(self):
+        """测试 fail_fast：第一个失败后取消其余请求"""
+        import asyncio
+        
+        async def fake_openai(transcript, model, max_length):
+            if transcript == "Transcript 0":
+                raise SummarizationError("401 Unauthorized")
+            await asyncio.sleep(5)
+            return "Summary"
+        
+        transcripts = [f"Transcript {i}" for i in range(4)]
+        with patch.object(self.generator, '_agenerate_with_openai', side_effect=fake_openai):
+            results = self.generator.generate_concurrent(transcripts, fail_fast=True)
+        
+        assert results == [None, None, None, None]
+    
+    def test_generate_concurrent_deadline(self):
+        """测试 deadline：到时未完成的请求被取消，结果为 None"""
+        import asyncio
+        
+        async def fake_openai(transcript, model, max_length):
+            if transcript == "Slow":
+                await asyncio.sleep(5)
+            return f"Summary of {transcript}"
+        
+        with patch.object(self.generator, '_agenerate_with_openai', side_effect=fake_openai):
+            results = self.generator.generate_concurrent(["Fast", "Slow"], deadline=0.2)
+        
+        assert results == ["Summary of Fast", None]
+    
+    @patch('openai.ChatCompletion.create')
+    def test_generate_passes_request_timeout(self, mock_create):
+        """测试每个请求都带上超时时间"""
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = "Summary"
+        mock_create.return_value = mock_response
+        
+        generator = SummaryGenerator(request_timeout=5.0)
+        generator.generate("Test transcript")
+        
+        assert mock_create.call_args[1]["request_timeout"] == 5.0
+    
+    def test_agenerate_concurrent_bounded(self):
+        """测试异步并发生成受 max_concurrency 限制"""
+        import asyncio
+        
+        in_flight = [0]
+        peak = [0]
+        
+        async def fake_openai(transcript, model, max_length):
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+            await asyncio.sleep(0.01)
+            in_flight[0] -= 1
+            return f"Summary of {transcript}"
+        
+        transcripts = [f"Transcript {i}" for i in range(8)]
+        with patch.object(self.generator, '_agenerate_with_openai', side_effect=fake_openai):
+            results = asyncio.run(
+                self.generator.agenerate_concurrent(transcripts, max_concurrency=3)
+            )
+        
+        assert results == [f"Summary of {t}" for t in transcripts]
+        assert peak[0] == 3
+    
+    @patch('openai.ChatCompletion.create')
+    def test_generate_batched(self, mock_create):
+        """测试批量生成：每组一次请求，按编号拆分结果并写入缓存"""
+        import json
+        
+        def fake_create(**kwargs):
+            prompt = kwargs["messages"][1]["content"]
+            count = prompt.count("转录文本 ")
+            response = MagicMock()
+            response.choices[0].message.content = json.dumps(
+                {str(i): f"Summary {i}" for i in range(1, count + 1)}
+            )
+            return response
+        
+        mock_create.side_effect = fake_create
+        transcripts = [f"Transcript {i}" for i in range(5)]
+        
+        results = self.generator.generate_batched(transcripts, model="gpt-4", batch_size=2)
+        
+        assert mock_create.call_count == 3
+        assert results == ["Summary 1", "Summary 2", "Summary 1", "Summary 2", "Summary 1"]
+        assert self.generator.get_cached_summary("Transcript 4", "gpt-4") == "Summary 1"
+    
+    @patch('openai.ChatCompletion.create')
+    def test_generate_batched_gpt4_request_is_well_formed(self, mock_create):
+        """测试 gpt-4 的合并请求不带 response_format，且每组不超出上下文窗口"""
+        import json
+        from video_processor.rate_limiter import count_tokens
+        
+        def fake_create(**kwargs):
+            prompt = kwargs["messages"][1]["content"]
+            count = prompt.count("转录文本 ")
+            response = MagicMock()
+            # 未启用 JSON 模式时回复可能包在代码块中
+            response.choices[0].message.content = "```json\n" + json.dumps(
+                {str(i): f"Summary {i}" for i in range(1, count + 1)}
+            ) + "\n```"
+            return response
+        
+        mock_create.side_effect = fake_create
+        # 每段约 3000 tokens，gpt-4 的 8192 窗口一组最多容纳两段
+        transcripts = [f"{i} " + "word " * 2400 for i in range(5)]
+        
+        results = self.generator.generate_batched(transcripts, model="gpt-4", batch_size=10)
+        
+        assert results == ["Summary 1", "Summary 2", "Summary 1", "Summary 2", "Summary 1"]
+        assert mock_create.call_count == 3
+        for call in mock_create.call_args_list:
+            kwargs = call[1]
+            assert "response_format" not in kwargs
+            prompt_tokens = count_tokens(kwargs["messages"][1]["content"])
+            assert prompt_tokens + kwargs["max_tokens"] <= ModelSelector.MODELS["gpt-4"]["max_tokens"]
+    
+    @patch('openai.ChatCompletion.create')
+    def test_generate_batched_counts_tokens_once(self, mock_create):
+        """测试批量生成时每段转录文本只计数一次，选择模型和分组共用"""
+        response = MagicMock()
+        response.choices[0].message.content = '{"1": "Summary 1", "2": "Summary 2"}'
+        mock_create.return_value = response
+        
+        with patch('video_processor.summary_generator.count_tokens', return_value=10) as mock_count:
+            results = self.generator.generate_batched(["A text", "B text"])
+        
+        assert results == ["Summary 1", "Summary 2"]
+        assert mock_count.call_count == 2
+    
+    @patch('openai.ChatCompletion.create')
+    def test_generate_batched_derives_each_key_once(self, mock_create):
+        """测试每项的缓存键只计算一次，逐条生成的回退也沿用该键"""
+        responses = []
+        for content in ['{"1": "Summary 1"}', "Single 2"]:
+            response = MagicMock()
+            response.choices[0].message.content = content
+            responses.append(response)
+        mock_create.side_effect = responses
+        key_generator = self.generator.key_generator
+        
+        with patch.object(
+            key_generator, 'generate_summary_key', wraps=key_generator.generate_summary_key
+        ) as mock_key:
+            results = self.generator.generate_batched(["A text", "B text"], model="gpt-4")
+        
+        assert results == ["Summary 1", "Single 2"]
+        assert mock_key.call_count == 2
+        assert self.generator.get_cached_summary("B text", "gpt-4") == "Single 2"
+    
+    @patch('openai.ChatCompletion.create')
+    def test_generate_batched_unknown_model(self, mock_create):
+        """测试 MODELS 之外的模型按最小的已知上下文窗口分组"""
+        import json
+        
+        def fake_create(**kwargs):
+            count = kwargs["messages"][1]["content"].count("转录文本 ")
+            response = MagicMock()
+            response.choices[0].message.content = json.dumps(
+                {str(i): f"Summary {i}" for i in range(1, count + 1)}
+            )
+            return response
+        
+        mock_create.side_effect = fake_create
+        # 每段约 1500 tokens，4096 的窗口一组只容纳两段
+        transcripts = [f"{i} " + "word " * 1200 for i in range(3)]
+        
+        results = self.generator.generate_batched(transcripts, model="gpt-4o")
+        
+        assert results == ["Summary 1", "Summary 2", "Summary 1"]
+        assert mock_create.call_count == 2
+        assert mock_create.call_args[1]["model"] == "gpt-4o"
+    
+    @patch('openai.ChatCompletion.create')
+    def test_generate_batched_json_mode_model(self, mock_create):
+        """测试支持 JSON 模式的模型在合并请求中带 response_format"""
+        response = MagicMock()
+        response.choices[0].message.content = '{"1": "Summary 1"}'
+        mock_create.return_value = response
+        
+        self.generator.generate_batched(["A text"], model="gpt-3.5-turbo")
+        
+        assert mock_create.call_args[1]["response_format"] == {"type": "json_object"}
+    
+    @patch('openai.ChatCompletion.create')
+    def test_generate_batched_falls_back_per_item(self, mock_create):
+        """测试合并回复无法解析时逐条生成"""
+        responses = []
+        for content in ["not json", "Single 1", "Single 2"]:
+            response = MagicMock()
+            response.choices[0].message.content = content
+            responses.append(response)
+        mock_create.side_effect = responses
+        
+        results = self.generator.generate_batched(["A text", "B text"], model="gpt-4")
+        
+        assert results == ["Single 1", "Single 2"]
+        assert mock_create.call_count == 3
     
     def test_build_prompt(self):
         """测试提示词构建"""
@@ -0,0 +1,78 @@
+"""
+任务元数据表单元测试
+"""
+import pytest
+from video_processor.task_table import TaskTable
+
+
+class TestTaskTableUnit:
+    """任务元数据表单元测试"""
+    
+    def test_table_initialization(self):
+        """测试初始化"""
+        table = TaskTable(capacity=10)
+        assert table.capacity == 10
+        assert len(table) == 0
+    
+    def test_table_invalid_capacity(self):
+        """测试无效容量"""
+        with pytest.raises(ValueError):
+            TaskTable(capacity=0)
+    
+    def test_table_add_and_get(self):
+        """测试登记和读取"""
+        table = TaskTable(capacity=10)
+        table.add("task_001", "https://youtube.com/watch?v=test", 100.0)
+        
+        metadata = table.get("task_001")
+        
+        assert metadata == {
+            "video_url": "https://youtube.com/watch?v=test",
+            "status": "processing",
+            "start_time": 100.0,
+        }
+        assert table.get("nonexistent") is None
+    
+    def test_table_status_transitions(self):
+        """测试状态变更"""
+        table = TaskTable(capacity=10)
+        table.add("task_001", "url1", 100.0)
+        table.add("task_002", "url2", 100.0, thread_isolated=True)
+        
+        assert table.mark_completed("task_001", 105.0)
+        assert table.mark_failed("task_002", "boom")
+        assert not table.mark_completed("nonexistent", 1.0)
+        
+        completed = table.get("task_001")
+        assert completed["status"] == "completed"
+        assert completed["end_time"] == 105.0
+        
+        failed = table.get("task_002")
+        assert failed["status"] == "failed"
+        assert failed["error"] == "boom"
+        assert failed["thread_isolated"] is True
+    
+    def test_table_extra_items(self):
+        """测试附加字段"""
+        table = TaskTable(capacity=10)
+        table.add("task_001", "url1", 100.0)
+        
+        table.set_extra("task_001", "queue_tasks", {"download": "q1"})
+        table.set_extra_item("task_001", "queue_tasks", "extract", "q2")
+        
+        assert table.get("task_001")["queue_tasks"] == {"download": "q1", "extract": "q2"}
+    
+    def test_table_evicts_least_recently_used(self):
+        """测试容量满时回收最久未使用的任务"""
+        table = TaskTable(capacity=2)
+        table.add("task_001", "url1", 1.0)
+        table.add("task_002", "url2", 2.0)
+        
+        # 访问 task_001，使 task_002 成为最久未使用
+        table.get("task_001")
+        table.add("task_003", "url3", 3.0)
+        
+        assert len(table) == 2
+        assert "task_002" not in table
+        assert table.get("task_001")["video_url"] == "url1"
+        assert table.get("task_003") == {"video_url": "url3", "status": "processing", "start_time": 3.0}
@@ -217,3 +217,115 @@ class TestThreadPoolUnit:
         assert not pool.is_done("nonexistent")
         
         pool.shutdown()
+    
+    def test_thread_pool_counts_from_done_callbacks(self):
+        """测试完成/失败计数由工作线程记录，重复等待不会重复计数"""
+        pool = ThreadPool(max_workers=2)
+        
+        def failing_task():
+            raise ValueError("Test error")
+        
+        for i in range(3):
+            pool.submit(f"task_{i}", lambda: "done")
+        pool.submit("task_fail", failing_task)
+        
+        assert pool.wait_all(timeout=10)
+        assert pool.wait_all(timeout=10)
+        
+        stats = pool.get_stats()
+        assert stats["submitted_count"] == 4
+        assert stats["completed_count"] == 3
+        assert stats["failed_count"] == 1
+        
+        pool.shutdown()
+    
+    def test_thread_pool_running_and_pending_counts(self):
+        """测试运行中、排队中和已取消任务数由计数推出"""
+        import threading
+        
+        pool = ThreadPool(max_workers=1)
+        started = threading.Event()
+        release = threading.Event()
+        
+        def blocking_task():
+            started.set()
+            release.wait(5)
+        
+        pool.submit("running", blocking_task)
+        started.wait(5)
+        pool.submit("queued", lambda: "done")
+        pool.submit("cancelled", lambda: "done")
+        assert pool.cancel("cancelled")
+        
+        stats = pool.get_stats()
+        assert stats["active_tasks"] == 1
+        assert stats["pending_tasks"] == 1
+        assert stats["cancelled_tasks"] == 1
+        assert pool.get_active_count() == 2
+        assert pool.get_pending_count() == 1
+        
+        release.set()
+        pool.wait_all(timeout=10)
+        stats = pool.get_stats()
+        assert stats["active_tasks"] == 0
+        assert stats["pending_tasks"] == 0
+        assert stats["completed_tasks"] == 2
+        
+        pool.shutdown()
+    
+    def test_thread_pool_get_result_releases_future(self):
+        """测试取回结果后释放 Future"""
+        pool = ThreadPool(max_workers=2)
+        
+        pool.submit("task_1", lambda: "done")
+        assert pool.get_result("task_1", timeout=5) == "done"
+        assert "task_1" not in pool.futures
+        assert pool.get_result("task_1", timeout=1) is None
+        
+        pool.shutdown()
+    
+    def test_thread_pool_bounds_retained_futures(self):
+        """测试未取回的已结束任务最多保留 max_retained 个"""
+        pool = ThreadPool(max_workers=2, max_retained=3)
+        
+        for i in range(10):
+            pool.submit(f"task_{i}", lambda i=i: i)
+        
+        # 关闭时等待工作线程退出，所有完成回调都已执行
+        pool.shutdown(wait=True)
+        
+        assert len(pool.futures) == 3
+        assert pool.submitted_count == 10
+        assert pool.completed_count == 10
+    
+    def test_thread_pool_invalid_max_retained(self):
+        """测试无效的保留上限"""
+        with pytest.raises(ValueError):
+            ThreadPool(max_retained=0)
+    
+    def test_thread_pool_wait_all_fail_fast(self):
+        """测试 fail_fast：任一任务失败即取消排队中的任务"""
+        pool = ThreadPool(max_workers=1)
+        
+        def failing_task():
+            raise ValueError("Test error")
+        
+        pool.submit("failing", failing_task)
+        for i in range(5):
+            pool.submit(f"task_{i}", time.sleep, 0.2)
+        
+        start = time.monotonic()
+        assert pool.wait_all(timeout=10, fail_fast=True) is False
+        assert time.monotonic() - start < 0.5
+        assert pool.get_stats()["cancelled_tasks"] >= 4
+        
+        pool.shutdown()
+    
+    def test_thread_pool_wait_all_fail_fast_success(self):
+        """测试 fail_fast：全部成功时返回 True"""
+        pool = ThreadPool(max_workers=2)
+        for i in range(3):
+            pool.submit(f"task_{i}", lambda i=i: i)
+        
+        assert pool.wait_all(timeout=10, fail_fast=True) is True
+        pool.shutdown()
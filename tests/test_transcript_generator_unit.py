@@ -4,9 +4,10 @@
 Feature: multi-model-orchestration, Task 7.2
 Validates: Requirements 3.1, 3.2
 """
+import os
 import pytest
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 import tempfile
 
 from video_processor.transcript_generator import TranscriptGenerator
@@ -62,6 +63,28 @@ class TestTranscriptGeneratorUnit:
             with pytest.raises(TranscriptionError):
                 generator.generate(str(audio_path))
     
+    def test_generate_with_unreadable_audio(self, generator, temp_dir):
+        """测试音频路径存在但无法读取时抛出 TranscriptionError"""
+        # 目录存在，但打开读取指纹时抛出 IsADirectoryError（OSError）
+        with pytest.raises(TranscriptionError):
+            generator.generate(str(temp_dir))
+    
+    def test_generate_fingerprints_audio_once(self, generator_with_cache, temp_dir):
+        """测试一次生成只计算一次音频指纹，查询和写入缓存共用"""
+        audio_path = temp_dir / "test_audio.mp3"
+        audio_path.write_bytes(b"audio")
+        key_generator = generator_with_cache.key_generator
+        
+        with patch.object(generator_with_cache, '_transcribe_with_whisper', return_value="测试转录文本"), \
+                patch.object(
+                    key_generator, 'generate_transcript_fingerprint_key',
+                    wraps=key_generator.generate_transcript_fingerprint_key,
+                ) as mock_fingerprint:
+            generator_with_cache.generate(str(audio_path))
+        
+        assert mock_fingerprint.call_count == 1
+        assert generator_with_cache.get_cached_transcript(str(audio_path)) == "测试转录文本"
+    
     def test_generate_caches_result(self, generator_with_cache, temp_dir):
         """测试生成结果被缓存"""
         audio_path = temp_dir / "test_audio.mp3"
@@ -175,6 +198,110 @@ class TestTranscriptGeneratorUnit:
             for audio_path in audios:
                 assert generator_with_cache.is_cached(str(audio_path))
     
+    def test_cache_key_follows_file_content(self, generator_with_cache, temp_dir):
+        """测试缓存键按文件指纹：修改文件后不返回过期转录，同一文件的不同路径写法共用缓存"""
+        audio_path = temp_dir / "test_audio.mp3"
+        audio_path.write_bytes(b"old audio")
+        
+        with patch.object(generator_with_cache, '_transcribe_with_whisper') as mock_whisper:
+            mock_whisper.side_effect = ["旧转录", "新转录"]
+            assert generator_with_cache.generate(str(audio_path)) == "旧转录"
+            assert generator_with_cache.is_cached(os.path.relpath(audio_path))
+            
+            audio_path.write_bytes(b"new audio content")
+            assert not generator_with_cache.is_cached(str(audio_path))
+            assert generator_with_cache.generate(str(audio_path)) == "新转录"
+        
+        assert generator_with_cache.get_cached_transcript("/nonexistent/audio.mp3") is None
+        assert not generator_with_cache.is_cached("/nonexistent/audio.mp3")
+    
+    def test_generate_concurrent_async(self, generator_with_cache, temp_dir):
+        """测试并发转录走异步路径，单个失败不影响其他音频"""
+        audios = []
+        for i in range(3):
+            audio_path = temp_dir / f"audio_{i}.mp3"
+            audio_path.touch()
+            audios.append(str(audio_path))
+        
+        async def fake_whisper(audio_path, language="auto"):
+            if audio_path.endswith("audio_1.mp3"):
+                raise TranscriptionError("Whisper 失败")
+            return f"转录 {Path(audio_path).stem}"
+        
+        with patch.object(
+            generator_with_cache, '_atranscribe_with_whisper', AsyncMock(side_effect=fake_whisper)
+        ):
+            results = generator_with_cache.generate_concurrent(audios)
+        
+        assert results == {
+            audios[0]: "转录 audio_0",
+            audios[1]: None,
+            audios[2]: "转录 audio_2",
+        }
+        assert generator_with_cache.is_cached(audios[0])
+    
+    def test_generate_concurrent_deduplicates_paths(self, generator_with_cache, temp_dir):
+        """测试指向同一文件的路径只转录一次"""
+        audio_path = temp_dir / "audio.mp3"
+        audio_path.touch()
+        relative = os.path.relpath(audio_path)
+        audios = [str(audio_path), relative, str(audio_path)]
+        
+        whisper = AsyncMock(return_value="转录")
+        with patch.object(generator_with_cache, '_atranscribe_with_whisper', whisper):
+            results = generator_with_cache.generate_concurrent(audios)
+        
+        assert whisper.call_count == 1
+        assert results == {str(audio_path): "转录", relative: "转录"}
+    
+    def test_atranscribe_streams_multipart_upload(self, generator, temp_dir):
+        """测试异步转录直接以 multipart 上传音频文件并解析回复"""
+        import asyncio
+        from aiohttp import web
+        from aiohttp.test_utils import TestServer
+        
+        audio_path = temp_dir / "test_audio.mp3"
+        audio_path.write_bytes(b"\x00\x01" * 50000)
+        generator.api_key = "test_key"
+        received = []
+        
+        async def handle(request):
+            form = await request.post()
+            size = len(form["file"].file.read())
+            received.append({
+                "auth": request.headers["Authorization"],
+                "model": form["model"],
+                "language": form.get("language"),
+                "filename": form["file"].filename,
+                "size": size,
+            })
+            if size == 0:
+                return web.json_response({"error": {"message": "empty"}}, status=400)
+            return web.json_response({"text": "流式转录"})
+        
+        async def main():
+            app = web.Application(client_max_size=1024 ** 2)
+            app.router.add_post("/v1/audio/transcriptions", handle)
+            async with TestServer(app) as server:
+                with patch('openai.api_base', str(server.make_url("/v1"))):
+                    text = await generator._atranscribe_with_whisper(str(audio_path), "zh")
+                    
+                    empty_path = temp_dir / "empty.mp3"
+                    empty_path.touch()
+                    with pytest.raises(TranscriptionError, match="HTTP 400"):
+                        await generator._atranscribe_with_whisper(str(empty_path))
+            return text
+        
+        assert asyncio.run(main()) == "流式转录"
+        assert received[0] == {
+            "auth": "Bearer test_key",
+            "model": "whisper-1",
+            "language": "zh",
+            "filename": "test_audio.mp3",
+            "size": 100000,
+        }
+        assert received[1]["language"] is None
+    
     def test_transcribe_with_whisper_api_key_missing(self, generator, temp_dir):
         """测试 Whisper API 密钥缺失"""
         audio_path = temp_dir / "test_audio.mp3"
@@ -0,0 +1,62 @@
+"""
+批量预取随机字节的 UUID / 随机 ID 生成
+"""
+import os
+import threading
+import uuid
+
+# 每次预取可生成的 UUID 个数
+_POOL_SIZE = 4096
+
+_local = threading.local()
+
+# fork 后子进程必须丢弃继承来的缓冲，否则会与父进程生成相同的 ID
+_generation = 0
+
+
+def _after_fork_in_child() -> None:
+    global _generation
+    _generation += 1
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def _take_random16() -> bytes:
+    """从当前线程的随机字节缓冲中取出 16 字节，缓冲耗尽时重新预取"""
+    local = _local
+    buf = getattr(local, "buf", None)
+    off = getattr(local, "off", 0)
+    if buf is None or off >= len(buf) or local.generation != _generation:
+        buf = local.buf = os.urandom(16 * _POOL_SIZE)
+        local.generation = _generation
+        off = 0
+    local.off = off + 16
+    return buf[off:off + 16]
+
+
+def fast_uuid() -> str:
+    """
+    生成随机 UUID（version 4）字符串，格式与 str(uuid.uuid4()) 相同
+    
+    每个线程一次读取 16*4096 字节随机数并按 16 字节切分，
+    生成 4096 个 ID 只需一次 os.urandom 系统调用。
+    
+    Returns:
+        UUID 字符串
+    """
+    return str(uuid.UUID(bytes=_take_random16(), version=4))
+
+
+def fast_hex_id() -> str:
+    """
+    生成 128 位随机 ID 的 32 位十六进制字符串
+    
+    与 fast_uuid 共用随机字节缓冲，但不构造 UUID 对象、不设置版本位、
+    不插入连字符，适合只需唯一性的内部 ID。
+    
+    Returns:
+        十六进制 ID 字符串
+    """
+    return _take_random16().hex()
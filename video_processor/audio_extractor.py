@@ -3,8 +3,11 @@
 
 从视频文件中提取音频流，支持多种音频格式和并发处理。
 """
+import itertools
 import subprocess
 import logging
+import threading
+from collections import deque
 from pathlib import Path
 from typing import Optional, Dict
 import hashlib
@@ -15,6 +18,38 @@ from video_processor.logger import get_logger
 
 logger = get_logger(__name__)
 
+# ffmpeg stderr 只保留最后若干块用于诊断，避免缓冲整个进度日志
+STDERR_CHUNK_SIZE = 4096
+STDERR_TAIL_CHUNKS = 64
+STDERR_REPORT_BYTES = 4096
+
+# 并发提取时每完成多少个结果批量回写一次缓存
+CACHE_FLUSH_BATCH = 16
+
+# 输出格式到可直接流复制（-c:a copy）的源音频编码
+COPY_COMPATIBLE_CODECS = {
+    "mp3": "mp3",
+    "m4a": "aac",
+    "aac": "aac",
+}
+
+# 并发提取批次编号，与下标组成线程池任务 ID，多次调用共享线程池时不会冲突
+_extract_batches = itertools.count()
+
+
+def _drain_stream(stream, tail: deque) -> None:
+    """持续读取流并只保留末尾的若干块
+    
+    Args:
+        stream: 二进制输出流
+        tail: 定长 deque，保存最近读取的数据块
+    """
+    try:
+        for chunk in iter(lambda: stream.read(STDERR_CHUNK_SIZE), b""):
+            tail.append(chunk)
+    finally:
+        stream.close()
+
 
 class AudioExtractor:
     """音频提取器类
@@ -40,14 +75,17 @@ class AudioExtractor:
         self.cache = cache
         self.audio_format = audio_format
         self.key_generator = CacheKeyGenerator()
+        # 视频路径到源音频编码的探测结果
+        self._codec_cache: Dict[str, Optional[str]] = {}
     
-    def extract(self, video_path: str) -> str:
+    def extract(self, video_path: str, update_cache: bool = True) -> str:
         """提取音频
         
         从视频文件中提取音频，支持缓存。
         
         Args:
             video_path: 视频文件路径
+            update_cache: 是否立即写入缓存（批量提取时由调用方统一回写）
             
         Returns:
             音频文件路径
@@ -58,22 +96,23 @@ class AudioExtractor:
         """
         # 保存原始路径用于缓存键生成
         original_video_path = video_path
-        video_path_obj = Path(video_path)
-        
-        if not video_path_obj.exists():
-            logger.error(f"视频文件不存在: {video_path_obj}")
-            raise FileNotFoundError(f"视频文件不存在: {video_path_obj}")
         
         # 生成缓存键 - 使用原始视频路径
-        cache_key = self.key_generator.generate_extract_key(original_video_path)
+        cache_key = self.key_generator.plain_extract_key(original_video_path)
         
-        # 检查缓存
+        # 先检查缓存，命中时无需访问文件系统
         if self.cache is not None:
-            cached_result = self.cache.get(cache_key)
+            cached_result = self.cache.get_str(cache_key)
             if cached_result:
                 logger.info(f"从缓存返回音频: {cached_result}")
                 return cached_result
         
+        video_path_obj = Path(video_path)
+        
+        if not video_path_obj.exists():
+            logger.error(f"视频文件不存在: {video_path_obj}")
+            raise FileNotFoundError(f"视频文件不存在: {video_path_obj}")
+        
         # 生成输出文件路径
         video_hash = hashlib.md5(original_video_path.encode()).hexdigest()
         audio_file = self.output_dir / f"{video_hash}.{self.audio_format}"
@@ -83,8 +122,8 @@ class AudioExtractor:
             self._extract_with_ffmpeg(str(video_path_obj), str(audio_file))
             
             # 缓存结果
-            if self.cache is not None:
-                self.cache.set(cache_key, str(audio_file))
+            if self.cache is not None and update_cache:
+                self.cache.set_str(cache_key, str(audio_file))
             
             logger.info(f"成功提取音频: {audio_file}")
             return str(audio_file)
@@ -103,8 +142,19 @@ class AudioExtractor:
         Raises:
             ExtractionError: 提取失败
         """
-        try:
-            # 构建 ffmpeg 命令
+        # 构建 ffmpeg 命令
+        source_codec = self._probe_audio_codec(video_path)
+        if source_codec is not None and source_codec == COPY_COMPATIBLE_CODECS.get(self.audio_format):
+            # 源编码与目标格式一致，直接复制音频流，无需重新编码
+            cmd = [
+                "ffmpeg",
+                "-i", video_path,
+                "-vn",
+                "-c:a", "copy",
+                "-y",  # 覆盖输出文件
+                audio_path
+            ]
+        else:
             cmd = [
                 "ffmpeg",
                 "-i", video_path,
@@ -113,24 +163,79 @@ class AudioExtractor:
                 "-y",  # 覆盖输出文件
                 audio_path
             ]
+        
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                bufsize=0
+            )
+        except FileNotFoundError:
+            raise ExtractionError("ffmpeg 未安装或不在 PATH 中")
+        
+        # 后台线程消费 stderr，内存占用上限为 STDERR_TAIL_CHUNKS 个数据块
+        tail = deque(maxlen=STDERR_TAIL_CHUNKS)
+        reader = threading.Thread(
+            target=_drain_stream,
+            args=(process.stderr, tail),
+            daemon=True
+        )
+        reader.start()
+        
+        try:
+            returncode = process.wait(timeout=300)  # 5 分钟超时
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            raise ExtractionError("音频提取超时")
+        finally:
+            reader.join()
+        
+        if returncode != 0:
+            stderr = b"".join(tail)[-STDERR_REPORT_BYTES:]
+            raise ExtractionError(
+                f"ffmpeg 命令失败: {stderr.decode('utf-8', errors='replace')}"
+            )
+    
+    def _probe_audio_codec(self, video_path: str) -> Optional[str]:
+        """使用 ffprobe 探测视频中第一条音频流的编码
+        
+        结果按视频路径缓存，同一文件只探测一次。
+        
+        Args:
+            video_path: 视频文件路径
             
-            # 执行命令
+        Returns:
+            音频编码名称（如 "mp3"、"aac"），探测失败则返回 None
+        """
+        if video_path in self._codec_cache:
+            return self._codec_cache[video_path]
+        
+        cmd = [
+            "ffprobe",
+            "-v", "error",
+            "-select_streams", "a:0",
+            "-show_entries", "stream=codec_name",
+            "-of", "csv=p=0",
+            video_path
+        ]
+        
+        codec = None
+        try:
             result = subprocess.run(
                 cmd,
                 capture_output=True,
                 text=True,
-                timeout=300  # 5 分钟超时
+                timeout=30
             )
-            
-            if result.returncode != 0:
-                raise ExtractionError(
-                    f"ffmpeg 命令失败: {result.stderr}"
-                )
+            if result.returncode == 0:
+                codec = result.stdout.strip() or None
+        except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+            logger.debug(f"ffprobe 探测失败: {e}")
         
-        except subprocess.TimeoutExpired:
-            raise ExtractionError("音频提取超时")
-        except FileNotFoundError:
-            raise ExtractionError("ffmpeg 未安装或不在 PATH 中")
+        self._codec_cache[video_path] = codec
+        return codec
     
     def is_cached(self, video_path: str) -> bool:
         """检查音频是否已缓存
@@ -144,8 +249,8 @@ class AudioExtractor:
         if self.cache is None:
             return False
         
-        cache_key = self.key_generator.generate_extract_key(str(video_path))
-        return self.cache.get(cache_key) is not None
+        cache_key = self.key_generator.plain_extract_key(str(video_path))
+        return self.cache.get_str(cache_key) is not None
     
     def get_cached_audio(self, video_path: str) -> Optional[str]:
         """获取缓存的音频文件
@@ -159,8 +264,8 @@ class AudioExtractor:
         if self.cache is None:
             return None
         
-        cache_key = self.key_generator.generate_extract_key(str(video_path))
-        return self.cache.get(cache_key)
+        cache_key = self.key_generator.plain_extract_key(str(video_path))
+        return self.cache.get_str(cache_key)
     
     def delete_cached_audio(self, video_path: str) -> None:
         """删除缓存的音频
@@ -171,7 +276,7 @@ class AudioExtractor:
         if self.cache is None:
             return
         
-        cache_key = self.key_generator.generate_extract_key(str(video_path))
+        cache_key = self.key_generator.plain_extract_key(str(video_path))
         self.cache.delete(cache_key)
         logger.info(f"已删除缓存的音频: {video_path}")
     
@@ -198,19 +303,30 @@ class AudioExtractor:
                     results[video_path] = None
         else:
             # 使用线程池并发提取
-            futures = {}
-            for video_path in video_paths:
-                task_id = f"extract_{hash(video_path)}"
-                future = thread_pool.submit(task_id, self.extract, video_path)
-                futures[video_path] = future
+            batch = next(_extract_batches)
+            task_ids = []
+            for i, video_path in enumerate(video_paths):
+                task_id = f"extract_{batch}_{i}"
+                thread_pool.submit(task_id, self.extract, video_path, False)
+                task_ids.append(task_id)
             
-            # 收集结果
-            for video_path, future in futures.items():
+            # 收集结果，提取出的音频按批回写缓存
+            pending = []
+            for video_path, task_id in zip(video_paths, task_ids):
                 try:
-                    audio_path = thread_pool.get_result(f"extract_{hash(video_path)}")
+                    audio_path = thread_pool.get_result(task_id)
                     results[video_path] = audio_path
+                    if audio_path is not None:
+                        pending.append((self.key_generator.plain_extract_key(str(video_path)), audio_path))
                 except Exception as e:
                     logger.error(f"提取 {video_path} 的音频失败: {e}")
                     results[video_path] = None
+                
+                if self.cache is not None and len(pending) >= CACHE_FLUSH_BATCH:
+                    self.cache.set_many(pending)
+                    pending = []
+            
+            if self.cache is not None and pending:
+                self.cache.set_many(pending)
         
         return results
@@ -1,10 +1,13 @@
 """
-缓存系统 - LRU 缓存实现
+缓存系统 - LRU / CLOCK 缓存实现
 """
 import hashlib
+import json
+import os
+import sqlite3
 import time
-from typing import Any, Optional, Dict
-from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional, Dict, List, Iterable, Tuple, Union
 from threading import Lock
 
 from .logger import get_logger
@@ -13,6 +16,40 @@ from .exceptions import CacheError
 logger = get_logger(__name__)
 
 
+# 空闲节点池上限
+_FREE_LIST_MAX = 256
+
+# 持久化缓存表结构
+_SQLITE_CACHE_SCHEMA = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    ts REAL NOT NULL
+);
+"""
+
+# 转录、总结缓存键的摘要字节数（BLAKE2b-128，十六进制键长度与 MD5 相同）
+KEY_DIGEST_SIZE = 16
+
+# 音频指纹读取的文件头、尾字节数
+FINGERPRINT_CHUNK_SIZE = 4096
+
+
+class _Entry:
+    """缓存项，同时作为 LRU 双向链表的节点"""
+    
+    __slots__ = ("key", "value", "ts", "prev", "next")
+    
+    def __init__(self):
+        self.key = None
+        self.value = None
+        self.ts = 0.0
+        self.prev = self
+        self.next = self
+
+
 class LRUCache:
     """
     LRU (Least Recently Used) 缓存实现
@@ -22,29 +59,117 @@ class LRUCache:
     - 自动驱逐最近最少使用的项
     - 线程安全
     - 支持 TTL (Time To Live)
+    
+    内部使用 dict + 双向链表：链表头之后是最近最少使用的项，
+    链表尾是最近使用的项。被驱逐的节点进入空闲池供后续复用。
     """
     
-    def __init__(self, max_size: int = 1000, ttl: Optional[int] = None):
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl: Optional[int] = None,
+        on_evict: Optional[Callable[[str, Any], None]] = None,
+    ):
         """
         初始化 LRU 缓存
         
         Args:
             max_size: 最大缓存项数
             ttl: 缓存过期时间（秒），None 表示不过期
+            on_evict: 容量驱逐回调，参数为被驱逐的键和值；在释放锁之后、
+                由触发驱逐的写入线程调用（过期和显式删除不触发）
         """
         if max_size <= 0:
             raise CacheError("max_size 必须大于 0")
         
         self.max_size = max_size
         self.ttl = ttl
-        self.cache: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self.on_evict = on_evict
+        self.cache: Dict[str, _Entry] = {}
+        self._head = _Entry()  # 哨兵节点
+        self._free: List[_Entry] = []
+        self._evicted: List[Tuple[str, Any]] = []  # 待通知 on_evict 的驱逐项
         self.lock = Lock()
         self.hits = 0
         self.misses = 0
     
-    def _generate_key(self, *args, **kwargs) -> str:
+    def _unlink(self, entry: _Entry) -> None:
+        """将节点从链表中摘除"""
+        entry.prev.next = entry.next
+        entry.next.prev = entry.prev
+    
+    def _append(self, entry: _Entry) -> None:
+        """将节点追加到链表尾（最近使用）"""
+        head = self._head
+        last = head.prev
+        entry.prev = last
+        entry.next = head
+        last.next = entry
+        head.prev = entry
+    
+    def _acquire_entry(self, key: str, value: Any) -> _Entry:
+        """从空闲池取出节点（没有则新建）并填充数据"""
+        entry = self._free.pop() if self._free else _Entry()
+        entry.key = key
+        entry.value = value
+        entry.ts = time.time()
+        return entry
+    
+    def _release_entry(self, entry: _Entry) -> None:
+        """释放节点引用的数据，并放回空闲池"""
+        entry.key = None
+        entry.value = None
+        entry.prev = entry.next = entry
+        if len(self._free) < _FREE_LIST_MAX:
+            self._free.append(entry)
+    
+    def _remove(self, key: str) -> None:
+        """删除指定键（调用方需持有锁且键存在）"""
+        entry = self.cache.pop(key)
+        self._unlink(entry)
+        self._release_entry(entry)
+    
+    def _insert(self, key: str, value: Any) -> Optional[str]:
+        """
+        插入或替换键值（调用方需持有锁）
+        
+        Returns:
+            被驱逐的键，没有驱逐则返回 None
+        """
+        cache = self.cache
+        evicted = None
+        entry = cache.get(key)
+        if entry is not None:
+            self._unlink(entry)
+            entry.value = value
+            entry.ts = time.time()
+        else:
+            if len(cache) >= self.max_size:
+                lru = self._head.next
+                evicted = lru.key
+                if self.on_evict is not None:
+                    self._evicted.append((evicted, lru.value))
+                self._remove(evicted)
+            entry = self._acquire_entry(key, value)
+            cache[key] = entry
+        self._append(entry)
+        return evicted
+    
+    def _notify_evicted(self) -> None:
+        """在锁外把积攒的驱逐项交给 on_evict 回调"""
+        if not self._evicted:
+            return
+        with self.lock:
+            pending, self._evicted = self._evicted, []
+        for key, value in pending:
+            try:
+                self.on_evict(key, value)
+            except Exception as e:
+                logger.error(f"驱逐回调失败: {key}, 错误: {str(e)}")
+    
+    def _generate_key_generic(self, *args, **kwargs) -> str:
         """
-        生成缓存键
+        生成通用缓存键（任意参数组合）
         
         Args:
             *args: 位置参数
@@ -81,25 +206,25 @@ class LRUCache:
             缓存值，如果不存在或已过期则返回 None
         """
         with self.lock:
-            if key not in self.cache:
+            entry = self.cache.get(key)
+            if entry is None:
                 self.misses += 1
                 logger.debug(f"缓存未命中: {key}")
                 return None
             
-            value, timestamp = self.cache[key]
-            
             # 检查是否过期
-            if self._is_expired(timestamp):
-                del self.cache[key]
+            if self._is_expired(entry.ts):
+                self._remove(key)
                 self.misses += 1
                 logger.debug(f"缓存已过期: {key}")
                 return None
             
             # 移到末尾（最近使用）
-            self.cache.move_to_end(key)
+            self._unlink(entry)
+            self._append(entry)
             self.hits += 1
             logger.debug(f"缓存命中: {key}")
-            return value
+            return entry.value
     
     def set(self, key: str, value: Any) -> None:
         """
@@ -114,20 +239,68 @@ class LRUCache:
         """
         with self.lock:
             try:
-                # 如果键已存在，删除它
-                if key in self.cache:
-                    del self.cache[key]
-                
                 # 如果缓存满，驱逐最近最少使用的项
-                if len(self.cache) >= self.max_size:
-                    lru_key, _ = self.cache.popitem(last=False)
-                    logger.debug(f"驱逐 LRU 项: {lru_key}")
-                
-                # 添加新项
-                self.cache[key] = (value, time.time())
+                evicted = self._insert(key, value)
+                if evicted is not None:
+                    logger.debug(f"驱逐 LRU 项: {evicted}")
                 logger.debug(f"缓存设置: {key}")
             except Exception as e:
                 raise CacheError(f"缓存设置失败: {str(e)}")
+        self._notify_evicted()
+    
+    def get_str(self, key: str) -> Optional[Any]:
+        """
+        获取缓存值（字符串键快速路径）
+        
+        适用于调用方已持有唯一字符串键的场景：不做哈希、不格式化调试日志。
+        
+        Args:
+            key: 缓存键
+        
+        Returns:
+            缓存值，如果不存在或已过期则返回 None
+        """
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            if self.ttl is not None and time.time() - entry.ts > self.ttl:
+                self._remove(key)
+                self.misses += 1
+                return None
+            
+            self._unlink(entry)
+            self._append(entry)
+            self.hits += 1
+            return entry.value
+    
+    def set_str(self, key: str, value: Any) -> None:
+        """
+        设置缓存值（字符串键快速路径）
+        
+        Args:
+            key: 缓存键
+            value: 缓存值
+        """
+        with self.lock:
+            self._insert(key, value)
+        self._notify_evicted()
+    
+    def set_many(self, pairs: Iterable[Tuple[str, Any]]) -> None:
+        """
+        批量设置缓存值
+        
+        整批写入只获取一次锁，适合并发任务集中完成后的回写。
+        
+        Args:
+            pairs: (缓存键, 缓存值) 序列
+        """
+        with self.lock:
+            for key, value in pairs:
+                self._insert(key, value)
+        self._notify_evicted()
     
     def delete(self, key: str) -> bool:
         """
@@ -141,7 +314,7 @@ class LRUCache:
         """
         with self.lock:
             if key in self.cache:
-                del self.cache[key]
+                self._remove(key)
                 logger.debug(f"缓存删除: {key}")
                 return True
             return False
@@ -150,6 +323,7 @@ class LRUCache:
         """清空所有缓存"""
         with self.lock:
             self.cache.clear()
+            self._head.prev = self._head.next = self._head
             self.hits = 0
             self.misses = 0
             logger.info("缓存已清空")
@@ -159,6 +333,22 @@ class LRUCache:
         with self.lock:
             return len(self.cache)
     
+    def items(self) -> List[Tuple[str, Any]]:
+        """
+        获取所有缓存项的快照（按最近最少使用到最近使用排列，不影响顺序）
+        
+        Returns:
+            (缓存键, 缓存值) 列表
+        """
+        with self.lock:
+            items = []
+            head = self._head
+            entry = head.next
+            while entry is not head:
+                items.append((entry.key, entry.value))
+                entry = entry.next
+            return items
+    
     def get_stats(self) -> Dict[str, Any]:
         """
         获取缓存统计信息
@@ -189,6 +379,557 @@ class LRUCache:
             return key in self.cache
 
 
+class ClockCache:
+    """
+    CLOCK（二次机会）缓存实现，与 LRUCache 接口一致
+    
+    特性：
+    - 命中路径不加锁：只读取槽位并置引用位
+    - 插入时加锁，时钟指针跳过并清除已置位的槽位，驱逐第一个未被引用的项
+    - 支持 TTL (Time To Live)
+    
+    每个槽位保存 (key, value, ts) 元组，整体替换，读取方据 key 校验槽位
+    未被并发复用。命中/未命中计数不加锁，统计值为近似值。
+    """
+    
+    def __init__(self, max_size: int = 1000, ttl: Optional[int] = None):
+        """
+        初始化 CLOCK 缓存
+        
+        Args:
+            max_size: 最大缓存项数
+            ttl: 缓存过期时间（秒），None 表示不过期
+        """
+        if max_size <= 0:
+            raise CacheError("max_size 必须大于 0")
+        
+        self.max_size = max_size
+        self.ttl = ttl
+        self.lock = Lock()
+        self._reset()
+    
+    def _reset(self) -> None:
+        """重置所有槽位（调用方需持有锁或处于初始化阶段）"""
+        self.cache: Dict[str, int] = {}  # 键到槽位的映射
+        self._entries: List[Optional[Tuple[str, Any, float]]] = [None] * self.max_size
+        self._referenced = bytearray(self.max_size)
+        self._free: List[int] = list(range(self.max_size - 1, -1, -1))
+        self._hand = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def _lookup(self, key: str) -> Optional[Any]:
+        """无锁查找，返回值或 None（调用方负责计数）"""
+        slot = self.cache.get(key)
+        if slot is None:
+            return None
+        
+        entry = self._entries[slot]
+        if entry is None or entry[0] != key:
+            return None  # 槽位已被并发复用
+        
+        if self.ttl is not None and time.time() - entry[2] > self.ttl:
+            with self.lock:
+                if self.cache.get(key) == slot and self._entries[slot] is entry:
+                    self._remove_slot(key, slot)
+            return None
+        
+        self._referenced[slot] = 1
+        return entry[1]
+    
+    def _remove_slot(self, key: str, slot: int) -> None:
+        """删除指定键（调用方需持有锁）"""
+        del self.cache[key]
+        self._entries[slot] = None
+        self._referenced[slot] = 0
+        self._free.append(slot)
+    
+    def _insert(self, key: str, value: Any) -> Optional[str]:
+        """
+        插入或替换键值（调用方需持有锁）
+        
+        Returns:
+            被驱逐的键，没有驱逐则返回 None
+        """
+        now = time.time()
+        slot = self.cache.get(key)
+        if slot is not None:
+            self._entries[slot] = (key, value, now)
+            self._referenced[slot] = 1
+            return None
+        
+        evicted = None
+        if self._free:
+            slot = self._free.pop()
+        else:
+            # 转动时钟指针：已引用的槽位清零并跳过，驱逐第一个未引用的槽位
+            referenced = self._referenced
+            hand = self._hand
+            while referenced[hand]:
+                referenced[hand] = 0
+                hand = (hand + 1) % self.max_size
+            slot = hand
+            self._hand = (hand + 1) % self.max_size
+            evicted = self._entries[slot][0]
+            del self.cache[evicted]
+        
+        # 先写槽位再发布映射，读取方总能看到完整的元组
+        self._entries[slot] = (key, value, now)
+        self._referenced[slot] = 0
+        self.cache[key] = slot
+        return evicted
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        获取缓存值
+        
+        Args:
+            key: 缓存键
+        
+        Returns:
+            缓存值，如果不存在或已过期则返回 None
+        """
+        value = self._lookup(key)
+        if value is None:
+            self.misses += 1
+            logger.debug(f"缓存未命中: {key}")
+            return None
+        
+        self.hits += 1
+        logger.debug(f"缓存命中: {key}")
+        return value
+    
+    def set(self, key: str, value: Any) -> None:
+        """
+        设置缓存值
+        
+        Args:
+            key: 缓存键
+            value: 缓存值
+        
+        Raises:
+            CacheError: 如果缓存操作失败
+        """
+        with self.lock:
+            try:
+                evicted = self._insert(key, value)
+                if evicted is not None:
+                    logger.debug(f"驱逐 CLOCK 项: {evicted}")
+                logger.debug(f"缓存设置: {key}")
+            except Exception as e:
+                raise CacheError(f"缓存设置失败: {str(e)}")
+    
+    def get_str(self, key: str) -> Optional[Any]:
+        """
+        获取缓存值（字符串键快速路径，不格式化调试日志）
+        
+        Args:
+            key: 缓存键
+        
+        Returns:
+            缓存值，如果不存在或已过期则返回 None
+        """
+        value = self._lookup(key)
+        if value is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return value
+    
+    def set_str(self, key: str, value: Any) -> None:
+        """
+        设置缓存值（字符串键快速路径）
+        
+        Args:
+            key: 缓存键
+            value: 缓存值
+        """
+        with self.lock:
+            self._insert(key, value)
+    
+    def set_many(self, pairs: Iterable[Tuple[str, Any]]) -> None:
+        """
+        批量设置缓存值（只获取一次锁）
+        
+        Args:
+            pairs: (缓存键, 缓存值) 序列
+        """
+        with self.lock:
+            for key, value in pairs:
+                self._insert(key, value)
+    
+    def delete(self, key: str) -> bool:
+        """
+        删除缓存项
+        
+        Args:
+            key: 缓存键
+        
+        Returns:
+            是否成功删除
+        """
+        with self.lock:
+            slot = self.cache.get(key)
+            if slot is None:
+                return False
+            self._remove_slot(key, slot)
+            logger.debug(f"缓存删除: {key}")
+            return True
+    
+    def clear(self) -> None:
+        """清空所有缓存"""
+        with self.lock:
+            self._reset()
+            logger.info("缓存已清空")
+    
+    def size(self) -> int:
+        """获取当前缓存大小"""
+        return len(self.cache)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计信息
+        
+        Returns:
+            统计信息字典
+        """
+        with self.lock:
+            total = self.hits + self.misses
+            hit_rate = (self.hits / total * 100) if total > 0 else 0
+            
+            return {
+                "size": len(self.cache),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": f"{hit_rate:.2f}%",
+                "total_requests": total,
+            }
+    
+    def __len__(self) -> int:
+        """获取缓存大小"""
+        return self.size()
+    
+    def __contains__(self, key: str) -> bool:
+        """检查键是否在缓存中"""
+        return key in self.cache
+
+
+class SQLiteCache:
+    """
+    基于 SQLite 的持久化缓存
+    
+    作为内存缓存的第二层，进程重启后仍可命中。值以 JSON 文本存储，
+    因此只适合可 JSON 序列化的值（转录文本、总结等字符串）。
+    数据库使用 WAL 日志和 synchronous=NORMAL，单次写入不等待 fsync。
+    
+    特性：
+    - 容量只受磁盘限制
+    - 线程安全（单连接 + 锁）
+    - 支持 TTL (Time To Live)
+    """
+    
+    def __init__(self, path: Union[str, Path], ttl: Optional[int] = None):
+        """
+        初始化持久化缓存
+        
+        Args:
+            path: 数据库文件路径，父目录不存在时自动创建
+            ttl: 缓存过期时间（秒），None 表示不过期
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        self.path = path
+        self.ttl = ttl
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.executescript(_SQLITE_CACHE_SCHEMA)
+    
+    def _expired(self, ts: float) -> bool:
+        """检查写入时间为 ts 的项是否过期"""
+        return self.ttl is not None and time.time() - ts > self.ttl
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        获取缓存值
+        
+        Args:
+            key: 缓存键
+        
+        Returns:
+            缓存值，如果不存在或已过期则返回 None
+        """
+        with self.lock:
+            row = self._conn.execute(
+                "SELECT value, ts FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or self._expired(row[1]):
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+    
+    def set(self, key: str, value: Any) -> None:
+        """
+        设置缓存值
+        
+        Args:
+            key: 缓存键
+            value: 可 JSON 序列化的缓存值
+        
+        Raises:
+            CacheError: 如果值无法序列化或写入失败
+        """
+        self.set_many([(key, value)])
+    
+    def set_many(self, pairs: Iterable[Tuple[str, Any]]) -> None:
+        """
+        批量设置缓存值（一个事务）
+        
+        Args:
+            pairs: (缓存键, 缓存值) 序列
+        
+        Raises:
+            CacheError: 如果值无法序列化或写入失败
+        """
+        now = time.time()
+        try:
+            rows = [
+                (key, json.dumps(value, ensure_ascii=False), now)
+                for key, value in pairs
+            ]
+            with self.lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO cache (key, value, ts) VALUES (?, ?, ?)", rows
+                )
+        except (TypeError, ValueError, sqlite3.Error) as e:
+            raise CacheError(f"持久化缓存写入失败: {str(e)}")
+    
+    get_str = get
+    set_str = set
+    
+    def delete(self, key: str) -> bool:
+        """
+        删除缓存项
+        
+        Args:
+            key: 缓存键
+        
+        Returns:
+            是否成功删除
+        """
+        with self.lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+    
+    def clear(self) -> None:
+        """清空所有缓存"""
+        with self.lock, self._conn:
+            self._conn.execute("DELETE FROM cache")
+            self.hits = 0
+            self.misses = 0
+        logger.info("持久化缓存已清空")
+    
+    def size(self) -> int:
+        """获取当前缓存大小（含已过期未清理的项）"""
+        with self.lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计信息
+        
+        Returns:
+            统计信息字典
+        """
+        size = self.size()
+        with self.lock:
+            total = self.hits + self.misses
+            hit_rate = (self.hits / total * 100) if total > 0 else 0
+            
+            return {
+                "size": size,
+                "path": str(self.path),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": f"{hit_rate:.2f}%",
+                "total_requests": total,
+            }
+    
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self.lock:
+            self._conn.close()
+    
+    def __len__(self) -> int:
+        """获取缓存大小"""
+        return self.size()
+    
+    def __contains__(self, key: str) -> bool:
+        """检查键是否在缓存中（未过期）"""
+        with self.lock:
+            row = self._conn.execute("SELECT ts FROM cache WHERE key = ?", (key,)).fetchone()
+        return row is not None and not self._expired(row[0])
+
+
+class TwoTierCache:
+    """
+    两级缓存：内存缓存 + 持久化缓存
+    
+    读取先查内存（L1），未命中再查持久化层（L2），L2 命中的值提升到 L1；
+    写入同时写两层。接口与 LRUCache 一致，可直接作为各生成器的 cache 参数，
+    使转录和总结在进程重启后仍可从本地命中，而不必重新调用 API。
+    """
+    
+    def __init__(self, l1: Any, l2: SQLiteCache):
+        """
+        初始化两级缓存
+        
+        Args:
+            l1: 内存缓存（LRUCache 或 ClockCache）
+            l2: 持久化缓存
+        """
+        self.l1 = l1
+        self.l2 = l2
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        获取缓存值
+        
+        Args:
+            key: 缓存键
+        
+        Returns:
+            缓存值，两层都不存在时返回 None
+        """
+        value = self.l1.get(key)
+        if value is not None:
+            return value
+        
+        value = self.l2.get(key)
+        if value is not None:
+            self.l1.set(key, value)
+        return value
+    
+    def get_str(self, key: str) -> Optional[Any]:
+        """获取缓存值（字符串键快速路径）"""
+        value = self.l1.get_str(key)
+        if value is not None:
+            return value
+        
+        value = self.l2.get(key)
+        if value is not None:
+            self.l1.set_str(key, value)
+        return value
+    
+    def set(self, key: str, value: Any) -> None:
+        """
+        设置缓存值（同时写入两层）
+        
+        Args:
+            key: 缓存键
+            value: 可 JSON 序列化的缓存值
+        
+        Raises:
+            CacheError: 如果缓存操作失败
+        """
+        self.l1.set(key, value)
+        self.l2.set(key, value)
+    
+    def set_str(self, key: str, value: Any) -> None:
+        """设置缓存值（字符串键快速路径，同时写入两层）"""
+        self.l1.set_str(key, value)
+        self.l2.set(key, value)
+    
+    def set_many(self, pairs: Iterable[Tuple[str, Any]]) -> None:
+        """
+        批量设置缓存值（同时写入两层）
+        
+        Args:
+            pairs: (缓存键, 缓存值) 序列
+        """
+        pairs = list(pairs)
+        self.l1.set_many(pairs)
+        self.l2.set_many(pairs)
+    
+    def delete(self, key: str) -> bool:
+        """
+        删除缓存项（两层都删除）
+        
+        Args:
+            key: 缓存键
+        
+        Returns:
+            任一层是否删除了该键
+        """
+        deleted = self.l1.delete(key)
+        return self.l2.delete(key) or deleted
+    
+    def clear(self) -> None:
+        """清空两层缓存"""
+        self.l1.clear()
+        self.l2.clear()
+    
+    def size(self) -> int:
+        """获取内存层缓存大小"""
+        return self.l1.size()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计信息
+        
+        Returns:
+            内存层统计信息，持久化层统计在 "l2" 键下
+        """
+        stats = self.l1.get_stats()
+        stats["l2"] = self.l2.get_stats()
+        return stats
+    
+    def close(self) -> None:
+        """关闭持久化层"""
+        self.l2.close()
+    
+    def __len__(self) -> int:
+        """获取内存层缓存大小"""
+        return self.size()
+    
+    def __contains__(self, key: str) -> bool:
+        """检查键是否在任一层中"""
+        return key in self.l1 or key in self.l2
+
+
+# 可选的缓存淘汰策略
+CACHE_POLICIES = {
+    "lru": LRUCache,
+    "clock": ClockCache,
+}
+
+
+def create_cache(max_size: int = 1000, ttl: Optional[int] = None, policy: str = "lru"):
+    """
+    按淘汰策略创建缓存
+    
+    Args:
+        max_size: 最大缓存项数
+        ttl: 缓存过期时间（秒），None 表示不过期
+        policy: 淘汰策略，"lru" 或 "clock"
+    
+    Returns:
+        缓存实例
+    
+    Raises:
+        CacheError: 如果策略不支持
+    """
+    cache_class = CACHE_POLICIES.get(policy)
+    if cache_class is None:
+        raise CacheError(f"不支持的缓存策略: {policy}")
+    return cache_class(max_size=max_size, ttl=ttl)
+
+
 class CacheKeyGenerator:
     """缓存键生成器"""
     
@@ -202,16 +943,61 @@ class CacheKeyGenerator:
         """生成提取缓存键"""
         return hashlib.md5(f"extract:{video_path}".encode()).hexdigest()
     
+    @staticmethod
+    def plain_extract_key(video_path: str) -> str:
+        """生成不经哈希的提取缓存键（配合 get_str/set_str 使用）"""
+        return "extract:" + video_path
+    
+    @staticmethod
+    def plain_metadata_key(url: str) -> str:
+        """生成不经哈希的视频元数据缓存键（配合 get_str/set_str 使用）"""
+        return "metadata:" + url
+    
     @staticmethod
     def generate_transcript_key(audio_path: str) -> str:
         """生成转录缓存键"""
-        return hashlib.md5(f"transcript:{audio_path}".encode()).hexdigest()
+        return hashlib.blake2b(
+            f"transcript:{audio_path}".encode(), digest_size=KEY_DIGEST_SIZE
+        ).hexdigest()
+    
+    @staticmethod
+    def generate_transcript_fingerprint_key(audio_path: Union[str, Path]) -> str:
+        """
+        按音频文件内容指纹生成转录缓存键
+        
+        指纹由文件标识（设备号和 inode）、大小、修改时间（纳秒）以及开头和末尾
+        各 4KB 计算，不读取整个文件：同一路径上的文件被替换或修改后键随之改变，
+        不会返回过期的转录；经不同路径写法（相对路径、符号链接）访问同一文件时
+        键相同。
+        
+        Args:
+            audio_path: 音频文件路径
+        
+        Returns:
+            缓存键
+        
+        Raises:
+            OSError: 如果文件不存在或无法读取
+        """
+        with open(audio_path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            digest = hashlib.blake2b(b"transcript:", digest_size=KEY_DIGEST_SIZE)
+            digest.update(
+                f"{stat.st_dev}:{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}:".encode()
+            )
+            digest.update(f.read(FINGERPRINT_CHUNK_SIZE))
+            if stat.st_size > FINGERPRINT_CHUNK_SIZE:
+                f.seek(max(stat.st_size - FINGERPRINT_CHUNK_SIZE, FINGERPRINT_CHUNK_SIZE))
+                digest.update(f.read(FINGERPRINT_CHUNK_SIZE))
+        return digest.hexdigest()
     
     @staticmethod
     def generate_summary_key(transcript: str, model: str = "default") -> str:
-        """生成总结缓存键"""
-        key_str = f"summary:{transcript}:{model}"
-        return hashlib.md5(key_str.encode()).hexdigest()
+        """生成总结缓存键（分段更新摘要，避免拼接出完整键字符串的副本）"""
+        digest = hashlib.blake2b(b"summary:", digest_size=KEY_DIGEST_SIZE)
+        digest.update(transcript.encode())
+        digest.update(f":{model}".encode())
+        return digest.hexdigest()
     
     @staticmethod
     def generate_key(*args, **kwargs) -> str:
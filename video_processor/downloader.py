@@ -2,6 +2,8 @@
 视频下载器 - 支持 YouTube 和 Bilibili
 """
 import os
+import functools
+import hashlib
 from pathlib import Path
 from typing import Optional, Dict, Any
 from urllib.parse import urlparse
@@ -13,6 +15,26 @@ from .config import VIDEOS_DIR, DOWNLOAD_TIMEOUT, DOWNLOAD_RETRIES
 
 logger = get_logger(__name__)
 
+_md5 = hashlib.md5
+
+
+@functools.lru_cache(maxsize=1024)
+def _detect_platform_cached(netloc: str) -> Optional[str]:
+    """
+    根据 URL 的网络位置检测视频平台（结果按 netloc 缓存）
+    
+    Args:
+        netloc: URL 的网络位置部分
+    
+    Returns:
+        平台名称，不支持的平台返回 None
+    """
+    if "youtube.com" in netloc or "youtu.be" in netloc:
+        return "youtube"
+    elif "bilibili.com" in netloc or "b23.tv" in netloc:
+        return "bilibili"
+    return None
+
 
 class VideoDownloader:
     """
@@ -48,12 +70,12 @@ class VideoDownloader:
         Raises:
             DownloadError: 如果平台不支持
         """
-        if "youtube.com" in url or "youtu.be" in url:
-            return "youtube"
-        elif "bilibili.com" in url or "b23.tv" in url:
-            return "bilibili"
-        else:
+        # 没有协议头的 URL 解析不出 netloc，退回使用整个 URL
+        netloc = urlparse(url).netloc.lower() or url
+        platform = _detect_platform_cached(netloc)
+        if platform is None:
             raise DownloadError(f"不支持的平台: {url}")
+        return platform
     
     def _get_ydl_opts(self, output_path: str) -> Dict[str, Any]:
         """
@@ -97,8 +119,7 @@ class VideoDownloader:
             # 生成输出文件名
             if filename is None:
                 # 使用 URL 的哈希作为文件名
-                import hashlib
-                filename = hashlib.md5(url.encode()).hexdigest()
+                filename = _md5(url.encode()).hexdigest()
             
             output_path = str(self.output_dir / filename)
             
@@ -133,8 +154,7 @@ class VideoDownloader:
         """
         try:
             if filename is None:
-                import hashlib
-                filename = hashlib.md5(url.encode()).hexdigest()
+                filename = _md5(url.encode()).hexdigest()
             
             # 检查是否存在任何匹配的文件
             for file in self.output_dir.glob(f"{filename}*"):
@@ -160,8 +180,7 @@ class VideoDownloader:
         """
         try:
             if filename is None:
-                import hashlib
-                filename = hashlib.md5(url.encode()).hexdigest()
+                filename = _md5(url.encode()).hexdigest()
             
             # 查找匹配的文件
             for file in self.output_dir.glob(f"{filename}*"):
@@ -187,8 +206,7 @@ class VideoDownloader:
         """
         try:
             if filename is None:
-                import hashlib
-                filename = hashlib.md5(url.encode()).hexdigest()
+                filename = _md5(url.encode()).hexdigest()
             
             deleted = False
             for file in self.output_dir.glob(f"{filename}*"):
@@ -0,0 +1,52 @@
+"""
+OpenAI 异步请求共用的 HTTP 会话
+"""
+import contextlib
+from typing import Any, AsyncIterator, Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# 共用会话的最大连接数（openai 0.28 的异步请求经 aiohttp 发出）
+DEFAULT_CONNECTION_LIMIT = 100
+
+
+@contextlib.asynccontextmanager
+async def shared_openai_session(limit: int = DEFAULT_CONNECTION_LIMIT) -> AsyncIterator[Optional[Any]]:
+    """
+    在上下文内让 openai 的异步请求共用一个 aiohttp 会话
+    
+    openai 0.28 在未设置 openai.aiosession 时为每个异步请求新建并关闭一个
+    ClientSession，每次都要重新建立 TCP 和 TLS 连接。这里创建一个带连接池的
+    会话并写入 openai.aiosession（ContextVar），上下文内发出的请求及其创建
+    的任务复用池中的长连接；退出时恢复原值并关闭会话。
+    
+    调用方已设置了会话、或 openai / aiohttp 不可用时不做任何事。
+    
+    Args:
+        limit: 连接池的最大连接数
+    
+    Yields:
+        正在使用的会话，未接管时为 None
+    """
+    try:
+        import aiohttp
+        import openai
+    except ImportError:
+        yield None
+        return
+    
+    aiosession = getattr(openai, "aiosession", None)
+    if aiosession is None or aiosession.get() is not None:
+        yield None
+        return
+    
+    connector = aiohttp.TCPConnector(limit=limit, limit_per_host=limit)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        token = aiosession.set(session)
+        logger.debug("openai 异步请求共用 HTTP 会话，连接上限 %d", limit)
+        try:
+            yield session
+        finally:
+            aiosession.reset(token)
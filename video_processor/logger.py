@@ -1,47 +1,184 @@
 """
 日志系统配置
 """
+import atexit
+import functools
+import io
 import logging
+import logging.handlers
+import os
+import queue
 import sys
-from datetime import datetime
-from typing import Optional
-
-
-class LogFormatter(logging.Formatter):
-    """自定义日志格式化器"""
-    
-    COLORS = {
-        'DEBUG': '\033[36m',      # 青色
-        'INFO': '\033[32m',       # 绿色
-        'WARNING': '\033[33m',    # 黄色
-        'ERROR': '\033[31m',      # 红色
-        'CRITICAL': '\033[35m',   # 紫色
-        'RESET': '\033[0m',       # 重置
-    }
-    
-    def format(self, record):
-        """格式化日志记录"""
-        log_color = self.COLORS.get(record.levelname, self.COLORS['RESET'])
-        reset_color = self.COLORS['RESET']
-        
-        # 添加时间戳、错误类型和上下文信息
-        record.msg = (
-            f"{log_color}[{record.levelname}]{reset_color} "
-            f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
-            f"[{record.name}] "
-            f"{record.msg}"
+import time
+from typing import Dict, Optional, TextIO
+
+
+_RESET = '\033[0m'
+
+# 各级别的颜色在导入时确定，过滤器按 levelno 直接取用
+_COLORS = {
+    logging.DEBUG: '\033[36m',      # 青色
+    logging.INFO: '\033[32m',       # 绿色
+    logging.WARNING: '\033[33m',    # 黄色
+    logging.ERROR: '\033[31m',      # 红色
+    logging.CRITICAL: '\033[35m',   # 紫色
+}
+
+# 带颜色的级别标签按级别预先拼好，每条记录只做一次替换
+_PREFIX_BY_LEVELNO = {
+    levelno: f'{color}[{logging.getLevelName(levelno)}]{_RESET}'
+    for levelno, color in _COLORS.items()
+}
+
+# 记录器名称不写死在格式串中：子模块记录器的记录会传播到同一处理器
+LOG_FORMAT = '%(prefix)s [%(asctime)s] [%(name)s] %(message)s'
+# 输出不是终端或设置了 NO_COLOR 时使用的无颜色格式
+PLAIN_LOG_FORMAT = '[%(levelname)s] [%(asctime)s] [%(name)s] %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# 内存缓冲的记录条数上限，达到上限或出现 ERROR 及以上级别时批量写出
+BUFFER_CAPACITY = 256
+
+# 缓冲记录的最长滞留时间（秒）：最早一条缓冲记录等待超过该时间，或队列空闲
+# 该时间后也写出，交互运行或安静下来的工作线程不会长时间看不到进度日志
+FLUSH_INTERVAL = 0.5
+
+# 控制台输出缓冲区大小，多条记录合并成一次 write 系统调用
+STREAM_BUFFER_SIZE = 65536
+
+# 所有控制台处理器共用的缓冲输出流
+_console_stream: Optional[TextIO] = None
+
+# 每个日志记录器名称对应的后台监听器及其缓冲处理器
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
+
+class ColorFilter(logging.Filter):
+    """为日志记录附加颜色字段（color/reset 及拼好的 prefix），不改动 msg/args"""
+    
+    def filter(self, record):
+        levelno = record.levelno
+        prefix = _PREFIX_BY_LEVELNO.get(levelno)
+        if prefix is None:
+            prefix = f'[{record.levelname}]'
+        record.prefix = prefix
+        record.color = _COLORS.get(levelno, _RESET)
+        record.reset = _RESET
+        return True
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """
+    按秒缓存时间戳字符串的格式化器，同一秒内的记录复用上次 strftime 结果
+    
+    实例在多个监听线程间共享，(秒, 字符串) 作为一个元组整体替换，
+    不会读到不匹配的组合。
+    """
+    
+    def __init__(self, fmt=None, datefmt=None):
+        super().__init__(fmt=fmt, datefmt=datefmt)
+        self._last = (-1, '')
+    
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        last = self._last
+        if last[0] == second:
+            return last[1]
+        asctime = time.strftime(datefmt or DATE_FORMAT, self.converter(record.created))
+        self._last = (second, asctime)
+        return asctime
+
+
+class _DeferredFlushStreamHandler(logging.StreamHandler):
+    """只写入不逐条刷新的流处理器，刷新交给上游缓冲处理器按批触发"""
+    
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class _BatchMemoryHandler(logging.handlers.MemoryHandler):
+    """整批写出缓冲记录后再刷新一次目标流，最早的缓冲记录滞留超过 FLUSH_INTERVAL 时也写出"""
+    
+    def shouldFlush(self, record):
+        return (
+            super().shouldFlush(record)
+            or record.created - self.buffer[0].created >= FLUSH_INTERVAL
+        )
+    
+    def flush(self):
+        with self.lock:
+            super().flush()
+            if self.target is not None:
+                self.target.flush()
+
+
+class _IdleFlushQueueListener(logging.handlers.QueueListener):
+    """队列空闲 FLUSH_INTERVAL 秒后写出处理器中的缓冲记录，再阻塞等待下一条"""
+    
+    def dequeue(self, block):
+        try:
+            return self.queue.get(timeout=FLUSH_INTERVAL)
+        except queue.Empty:
+            for handler in self.handlers:
+                handler.flush()
+            return self.queue.get(block)
+
+
+# 所有控制台处理器共用的格式化器
+_FORMATTER = _CachedTimeFormatter(fmt=LOG_FORMAT, datefmt=DATE_FORMAT)
+_PLAIN_FORMATTER = _CachedTimeFormatter(fmt=PLAIN_LOG_FORMAT, datefmt=DATE_FORMAT)
+
+
+def _get_console_stream(line_buffered: bool) -> TextIO:
+    """
+    获取带 64KB 缓冲的标准输出流
+    
+    直接在 stdout 的文件描述符上建立缓冲，不接管 sys.stdout 本身；
+    stdout 没有真实文件描述符时（如被测试框架替换）退回 sys.stdout。
+    
+    Args:
+        line_buffered: 是否按行刷新
+    
+    Returns:
+        控制台输出流
+    """
+    global _console_stream
+    
+    if _console_stream is None:
+        try:
+            raw = io.FileIO(sys.stdout.fileno(), 'w', closefd=False)
+        except (AttributeError, OSError, ValueError):
+            return sys.stdout
+        _console_stream = io.TextIOWrapper(
+            io.BufferedWriter(raw, buffer_size=STREAM_BUFFER_SIZE),
+            encoding=getattr(sys.stdout, 'encoding', None) or 'utf-8',
+            errors='backslashreplace',
+            write_through=False,
+            line_buffering=line_buffered
         )
-        
-        return super().format(record)
+    elif _console_stream.line_buffering != line_buffered:
+        _console_stream.reconfigure(line_buffering=line_buffered)
+    
+    return _console_stream
 
 
-def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
+def setup_logger(
+    name: str,
+    level: int = logging.INFO,
+    line_buffered: Optional[bool] = None
+) -> logging.Logger:
     """
     设置日志记录器
     
     Args:
         name: 日志记录器名称
         level: 日志级别
+        line_buffered: 控制台是否按行刷新，None 表示仅在终端交互时按行刷新
     
     Returns:
         配置好的日志记录器
@@ -49,29 +186,141 @@ def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     logger = logging.getLogger(name)
     logger.setLevel(level)
     
-    # 移除已有的处理器
+    # 已由本函数配置过的记录器只更新级别，不重建处理器和后台线程
+    listener = _listeners.get(name)
+    if listener is not None and any(
+        getattr(h, '_vp_configured', False) for h in logger.handlers
+    ):
+        for buffer_handler in listener.handlers:
+            buffer_handler.target.setLevel(level)
+        if line_buffered is not None:
+            _get_console_stream(line_buffered)
+        return logger
+    
+    # 移除已有的处理器，并停止之前的后台监听器
     logger.handlers.clear()
+    _stop_listener(name)
     
     # 创建控制台处理器
-    console_handler = logging.StreamHandler(sys.stdout)
+    isatty = getattr(sys.stdout, 'isatty', None)
+    interactive = bool(isatty and isatty())
+    if line_buffered is None:
+        line_buffered = interactive
+    console_handler = _DeferredFlushStreamHandler(_get_console_stream(line_buffered))
     console_handler.setLevel(level)
     
-    # 设置格式化器
-    formatter = LogFormatter(
-        fmt='%(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
+    # 设置格式化器：仅在终端上且未设置 NO_COLOR 时输出 ANSI 颜色
+    use_color = interactive and os.environ.get('NO_COLOR') is None
+    if use_color:
+        console_handler.addFilter(ColorFilter())
+        console_handler.setFormatter(_FORMATTER)
+    else:
+        console_handler.setFormatter(_PLAIN_FORMATTER)
+    
+    # 控制台写出放到后台线程，并经内存缓冲合并成批量 write（按时间兜底写出）
+    buffer_handler = _BatchMemoryHandler(
+        capacity=BUFFER_CAPACITY,
+        flushLevel=logging.ERROR,
+        target=console_handler
+    )
+    record_queue = queue.SimpleQueue()
+    listener = _IdleFlushQueueListener(
+        record_queue, buffer_handler, respect_handler_level=True
     )
-    console_handler.setFormatter(formatter)
+    listener.start()
+    _listeners[name] = listener
     
-    # 添加处理器到日志记录器
-    logger.addHandler(console_handler)
+    # 日志记录器上只挂队列处理器，调用线程只做入队
+    queue_handler = logging.handlers.QueueHandler(record_queue)
+    queue_handler._vp_configured = True
+    logger.addHandler(queue_handler)
     
     return logger
 
 
-def get_logger(name: str) -> logging.Logger:
-    """获取日志记录器"""
-    return logging.getLogger(name)
+def _stop_listener(name: str) -> None:
+    """停止指定记录器的后台监听器，并写出缓冲中的剩余记录"""
+    listener = _listeners.pop(name, None)
+    if listener is None:
+        return
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+def _shutdown() -> None:
+    """进程退出时停止所有后台监听器，并刷新控制台缓冲"""
+    for name in list(_listeners):
+        _stop_listener(name)
+    if _console_stream is not None:
+        _console_stream.flush()
+
+
+atexit.register(_shutdown)
+
+
+class LazyLogger:
+    """
+    延迟格式化的日志记录器包装
+    
+    级别未启用时直接返回，不构造任何字符串。调用方应使用 %-风格参数，
+    例如 log.debug("got %s items", n)，而不是预先拼好的 f-string，
+    参数只会在记录真正被处理时才插值。
+    """
+    
+    __slots__ = ('_l',)
+    
+    def __init__(self, l: logging.Logger):
+        self._l = l
+    
+    def debug(self, msg, *args, **kwargs):
+        l = self._l
+        if l.isEnabledFor(logging.DEBUG):
+            kwargs['stacklevel'] = kwargs.get('stacklevel', 1) + 1
+            l._log(logging.DEBUG, msg, args, **kwargs)
+    
+    def info(self, msg, *args, **kwargs):
+        l = self._l
+        if l.isEnabledFor(logging.INFO):
+            kwargs['stacklevel'] = kwargs.get('stacklevel', 1) + 1
+            l._log(logging.INFO, msg, args, **kwargs)
+    
+    def warning(self, msg, *args, **kwargs):
+        l = self._l
+        if l.isEnabledFor(logging.WARNING):
+            kwargs['stacklevel'] = kwargs.get('stacklevel', 1) + 1
+            l._log(logging.WARNING, msg, args, **kwargs)
+    
+    def error(self, msg, *args, **kwargs):
+        l = self._l
+        if l.isEnabledFor(logging.ERROR):
+            kwargs['stacklevel'] = kwargs.get('stacklevel', 1) + 1
+            l._log(logging.ERROR, msg, args, **kwargs)
+    
+    def exception(self, msg, *args, exc_info=True, **kwargs):
+        l = self._l
+        if l.isEnabledFor(logging.ERROR):
+            kwargs['stacklevel'] = kwargs.get('stacklevel', 1) + 1
+            l._log(logging.ERROR, msg, args, exc_info=exc_info, **kwargs)
+    
+    def critical(self, msg, *args, **kwargs):
+        l = self._l
+        if l.isEnabledFor(logging.CRITICAL):
+            kwargs['stacklevel'] = kwargs.get('stacklevel', 1) + 1
+            l._log(logging.CRITICAL, msg, args, **kwargs)
+    
+    def isEnabledFor(self, level: int) -> bool:
+        return self._l.isEnabledFor(level)
+    
+    def __getattr__(self, name):
+        # 其余属性（setLevel、handlers 等）转发给底层记录器
+        return getattr(self._l, name)
+
+
+@functools.lru_cache(maxsize=256)
+def get_logger(name: str) -> LazyLogger:
+    """获取日志记录器（延迟格式化包装，按名称缓存）"""
+    return LazyLogger(logging.getLogger(name))
 
 
 # 创建全局日志记录器
@@ -1,29 +1,64 @@
 """
 核心数据模型定义
 """
+import json
+import operator
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict, Any
-from enum import Enum
+from typing import Optional, Dict, Any, Tuple
+from enum import IntEnum
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，缺失时退回标准库 json
+    orjson = None
 
-class TaskStatus(str, Enum):
-    """任务状态枚举"""
-    PENDING = "pending"
-    RUNNING = "running"
-    COMPLETED = "completed"
-    FAILED = "failed"
 
+# orjson 原生序列化 dataclass 与 datetime（无时区时间按 isoformat 原样输出）
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_DATACLASS if orjson is not None else 0
 
-class TaskType(str, Enum):
-    """任务类型枚举"""
-    DOWNLOAD = "download"
-    EXTRACT = "extract"
-    TRANSCRIBE = "transcribe"
-    SUMMARIZE = "summarize"
+# to_dict 的字段名及一次取出全部字段值的 attrgetter
+_VM_KEYS = ("url", "title", "duration", "platform", "upload_date", "channel")
+_VM_GET = operator.attrgetter(*_VM_KEYS)
+_RESULT_KEYS = ("video_path", "audio_path", "transcript", "summary", "processing_time")
+_RESULT_GET = operator.attrgetter(*_RESULT_KEYS)
 
+# 预先绑定，默认时间戳工厂省去每次构造时的属性查找
+_now = datetime.now
 
-@dataclass
+# 处理耗时超过该值（秒）的结果才记忆化其序列化结果
+MEMOIZE_MIN_PROCESSING_TIME = 0.001
+
+
+class TaskStatus(IntEnum):
+    """
+    任务状态枚举（进程内按整数比较，对外输出 _STATUS_NAMES 中的名称）
+    
+    成员是单例，状态字段只会被赋值为枚举成员，比较时可直接用 `is`。
+    """
+    PENDING = 0
+    RUNNING = 1
+    COMPLETED = 2
+    FAILED = 3
+
+
+# 状态的对外名称，按枚举值索引
+_STATUS_NAMES = ("pending", "running", "completed", "failed")
+
+
+class TaskType(IntEnum):
+    """任务类型枚举（对外输出 _TASK_TYPE_NAMES 中的名称，比较同样可用 `is`）"""
+    DOWNLOAD = 0
+    EXTRACT = 1
+    TRANSCRIBE = 2
+    SUMMARIZE = 3
+
+
+# 任务类型的对外名称，按枚举值索引
+_TASK_TYPE_NAMES = ("download", "extract", "transcribe", "summarize")
+
+
+@dataclass(slots=True, frozen=True)
 class VideoMetadata:
     """视频元数据"""
     url: str
@@ -34,7 +69,7 @@ class VideoMetadata:
     channel: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Task:
     """处理任务"""
     task_id: str
@@ -43,39 +78,84 @@ class Task:
     retry_count: int = 0
     max_retries: int = 3
     status: TaskStatus = TaskStatus.PENDING
-    created_at: datetime = field(default_factory=datetime.now)
-    updated_at: datetime = field(default_factory=datetime.now)
+    created_at: datetime = field(default_factory=_now)
+    updated_at: datetime = field(default_factory=_now)
     error_message: Optional[str] = None
+    # 本任务完成后在同一工作线程中接着执行的后续阶段
+    next_stages: Tuple[TaskType, ...] = ()
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ProcessingResult:
     """处理结果"""
     task_id: str
     video_metadata: VideoMetadata
     video_path: str
     audio_path: str
-    transcript: str
-    summary: str
+    # 转录和摘要可能很长，不参与 repr/比较/哈希
+    transcript: str = field(repr=False, compare=False)
+    summary: str = field(repr=False, compare=False)
     processing_time: float  # 秒
-    created_at: datetime = field(default_factory=datetime.now)
+    created_at: datetime = field(default_factory=_now)
+    # 序列化结果缓存，仅对耗时超过阈值的结果记忆化
+    _cached_json: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+    # 字典形式缓存（字符串与字段共享），to_dict 返回其浅拷贝
+    _cached_dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __repr__(self) -> str:
+        return (
+            f"ProcessingResult(task_id={self.task_id!r}, "
+            f"video_metadata={self.video_metadata!r}, "
+            f"video_path={self.video_path!r}, audio_path={self.audio_path!r}, "
+            f"transcript=<{len(self.transcript)} chars>, "
+            f"summary=<{len(self.summary)} chars>, "
+            f"processing_time={self.processing_time!r}, "
+            f"created_at={self.created_at!r})"
+        )
+    
+    def to_json(self) -> bytes:
+        """序列化为 JSON 字节串"""
+        cached = self._cached_json
+        if cached is not None:
+            return cached
+        
+        data = None
+        if orjson is not None:
+            try:
+                data = orjson.dumps(self, option=_ORJSON_OPTIONS)
+            except orjson.JSONEncodeError:
+                pass  # 含孤立代理字符等 orjson 拒绝的字符串，退回标准库
+        if data is None:
+            data = json.dumps(self._to_builtins()).encode('ascii')
+        
+        # 实例不可变，序列化结果可安全复用；过小的结果不值得占用内存
+        if self.processing_time > MEMOIZE_MIN_PROCESSING_TIME:
+            object.__setattr__(self, '_cached_json', data)
+        return data
     
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典"""
-        return {
+        """
+        转换为字典
+        
+        首次调用时由字段直接构造并缓存，之后返回缓存的浅拷贝（连同 video_metadata
+        子字典），调用方修改返回值不会影响缓存。转录和摘要在字典中引用实例上的同一
+        字符串对象，缓存不会再持有一份副本。
+        """
+        cached = self._cached_dict
+        if cached is None:
+            cached = self._to_builtins()
+            object.__setattr__(self, '_cached_dict', cached)
+        
+        result = cached.copy()
+        result["video_metadata"] = cached["video_metadata"].copy()
+        return result
+    
+    def _to_builtins(self) -> Dict[str, Any]:
+        """由字段构造字典（to_dict 及 orjson 不可用时的序列化使用）"""
+        result = {
             "task_id": self.task_id,
-            "video_metadata": {
-                "url": self.video_metadata.url,
-                "title": self.video_metadata.title,
-                "duration": self.video_metadata.duration,
-                "platform": self.video_metadata.platform,
-                "upload_date": self.video_metadata.upload_date,
-                "channel": self.video_metadata.channel,
-            },
-            "video_path": self.video_path,
-            "audio_path": self.audio_path,
-            "transcript": self.transcript,
-            "summary": self.summary,
-            "processing_time": self.processing_time,
-            "created_at": self.created_at.isoformat(),
+            "video_metadata": dict(zip(_VM_KEYS, _VM_GET(self.video_metadata))),
         }
+        result.update(zip(_RESULT_KEYS, _RESULT_GET(self)))
+        result["created_at"] = self.created_at.isoformat()
+        return result
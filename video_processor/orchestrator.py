@@ -4,10 +4,14 @@
 编排器是系统的核心组件，负责协调所有处理阶段的执行，
 包括视频下载、音频提取、转录生成和总结生成。
 """
-import uuid
+import functools
+import json
+import os
+import queue
 import time
+from concurrent.futures import wait as futures_wait
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Callable, Type, Iterable, Iterator
 from pathlib import Path
 
 from .models import (
@@ -16,14 +20,18 @@ from .models import (
     ProcessingResult,
     TaskStatus,
     TaskType,
+    _TASK_TYPE_NAMES,
 )
 from .downloader import VideoDownloader
 from .audio_extractor import AudioExtractor
 from .transcript_generator import TranscriptGenerator
 from .summary_generator import SummaryGenerator, ModelSelector
-from .cache import LRUCache, CacheKeyGenerator
+from .cache import LRUCache, CacheKeyGenerator, create_cache
 from .queue import MessageQueue
 from .thread_pool import ThreadPool
+from .task_table import TaskTable
+from .result_aggregator import ResultAggregator
+from ._uuid_pool import fast_uuid
 from .logger import get_logger
 from .exceptions import (
     VideoProcessingError,
@@ -33,8 +41,105 @@ from .exceptions import (
     SummarizationError,
 )
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，缺失时退回标准库 json
+    orjson = None
+
 logger = get_logger(__name__)
 
+# 队列工作线程每次批量取出的任务数。下载任务会在同一线程中接着执行后续
+# 阶段，一个任务可能耗时数分钟，批量取出会让一个线程囤积多个视频而其他
+# 线程空闲，因此默认每次只取一个
+QUEUE_BATCH_SIZE = 1
+
+# 队列模式下下载任务之后由同一工作线程接着执行的阶段
+PIPELINE_NEXT_STAGES = (TaskType.EXTRACT, TaskType.TRANSCRIBE, TaskType.SUMMARIZE)
+
+# 工作线程连续执行链接阶段的时间片（秒），超时且队列非空时把剩余阶段交回队列
+PIPELINE_CHAIN_TIME_SLICE = 60.0
+
+# 批量并发处理的工作线程数上限，视频数量再多也只占用这么多线程
+BATCH_MAX_WORKERS = min(os.cpu_count() or 4, 16)
+
+# 内存中默认保留的处理结果数
+RESULT_CACHE_SIZE = 10000
+
+# 预先绑定的序列化函数，导出循环中省去模块属性查找
+_json_dumps_indented = functools.partial(json.dumps, ensure_ascii=False, indent=2)
+if orjson is not None:
+    _orjson_dumps = orjson.dumps
+    _ORJSON_INDENT_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+else:
+    _orjson_dumps = None
+
+
+def _make_stage(
+    error_cls: Type[VideoProcessingError],
+    fail_message: str,
+    component: Any,
+    lookup_name: Optional[str],
+    produce_name: str,
+    hit_message: str,
+    done_message: str,
+    done_arg: Callable[[str], Any] = str,
+) -> Callable[[str, str], str]:
+    """
+    生成管道阶段函数：先查缓存，未命中时执行处理，异常统一映射为阶段错误类型
+    
+    Args:
+        error_cls: 阶段错误类型，已是该类型的异常原样抛出
+        fail_message: 包装其他异常时的错误消息前缀
+        component: 阶段处理器实例
+        lookup_name: 处理器上的缓存查找方法名，None 表示处理方法自带缓存
+        produce_name: 处理器上的处理方法名（每次调用时取方法，便于替换或打桩）
+        hit_message: 缓存命中日志（%-风格，参数为任务 ID 和缓存值）
+        done_message: 处理完成日志（%-风格，参数为任务 ID 和 done_arg(结果)）
+        done_arg: 从结果中取出完成日志参数的函数
+    
+    Returns:
+        阶段函数 stage(task_id, arg) -> 结果
+    """
+    def stage(task_id: str, arg: str) -> str:
+        try:
+            # 检查缓存
+            if lookup_name is not None:
+                cached = getattr(component, lookup_name)(arg)
+                if cached:
+                    logger.info(hit_message, task_id, cached)
+                    return cached
+            
+            value = getattr(component, produce_name)(arg)
+            logger.info(done_message, task_id, done_arg(value))
+            return value
+        
+        except error_cls:
+            raise
+        except Exception as e:
+            raise error_cls(f"{fail_message}: {str(e)}")
+    
+    return stage
+
+
+def _dumps_indented_bytes(obj: Any) -> bytes:
+    """序列化为带 2 空格缩进的 UTF-8 JSON 字节串（优先使用 orjson，免去解码再编码）"""
+    if _orjson_dumps is not None:
+        try:
+            return _orjson_dumps(obj, option=_ORJSON_INDENT_OPTIONS)
+        except orjson.JSONEncodeError:
+            pass  # 含孤立代理字符等 orjson 拒绝的字符串，退回标准库
+    return _json_dumps_indented(obj).encode('utf-8')
+
+
+def _dumps_indented(obj: Any) -> str:
+    """序列化为带 2 空格缩进的 JSON 字符串（优先使用 orjson）"""
+    if _orjson_dumps is not None:
+        try:
+            return _orjson_dumps(obj, option=_ORJSON_INDENT_OPTIONS).decode('utf-8')
+        except orjson.JSONEncodeError:
+            pass  # 含孤立代理字符等 orjson 拒绝的字符串，退回标准库
+    return _json_dumps_indented(obj)
+
 
 class Orchestrator:
     """
@@ -59,6 +164,9 @@ class Orchestrator:
         cache_size: int = 1000,
         max_workers: Optional[int] = None,
         queue_size: int = 10000,
+        cache_policy: str = "lru",
+        result_cache_size: int = RESULT_CACHE_SIZE,
+        result_spill_dir: Optional[str] = None,
     ):
         """
         初始化编排器
@@ -67,9 +175,13 @@ class Orchestrator:
             cache_size: 缓存大小
             max_workers: 最大工作线程数
             queue_size: 消息队列大小
+            cache_policy: 缓存淘汰策略，"lru" 或 "clock"（命中路径无锁）
+            result_cache_size: 内存中保留的处理结果数和任务元数据数，超出时按 LRU 驱逐
+            result_spill_dir: 被驱逐结果的落盘目录，get_result 未命中内存时从此处读回；
+                None 表示驱逐即丢弃
         """
         # 初始化缓存
-        self.cache = LRUCache(max_size=cache_size)
+        self.cache = create_cache(max_size=cache_size, policy=cache_policy)
         self.cache_key_generator = CacheKeyGenerator()
         
         # 初始化各个处理器
@@ -79,13 +191,47 @@ class Orchestrator:
         self.summary_generator = SummaryGenerator(cache=self.cache)
         self.model_selector = ModelSelector()
         
+        # 生成下载 / 提取 / 转录阶段函数（签名均为 (task_id, 输入) -> 输出）
+        self._download_video = _make_stage(
+            DownloadError, "视频下载失败",
+            self.downloader, "get_cached_file", "download",
+            "[%s] 从缓存返回视频: %s", "[%s] 视频下载完成: %s",
+        )
+        # extract 先查内存缓存，命中时不访问文件系统，无需在此重复查找
+        self._extract_audio = _make_stage(
+            ExtractionError, "音频提取失败",
+            self.audio_extractor, None, "extract",
+            "", "[%s] 音频提取完成: %s",
+        )
+        # generate 自己按音频指纹查缓存，在此先查一次会把文件指纹计算两遍
+        self._generate_transcript = _make_stage(
+            TranscriptionError, "转录生成失败",
+            self.transcript_generator, None, "generate",
+            "", "[%s] 转录生成完成，长度: %d",
+            done_arg=len,
+        )
+        
         # 初始化消息队列和线程池
         self.message_queue = MessageQueue(max_size=queue_size)
         self.thread_pool = ThreadPool(max_workers=max_workers)
         
         # 任务结果存储
-        self.results: Dict[str, ProcessingResult] = {}
-        self.task_metadata: Dict[str, Dict[str, Any]] = {}
+        self._result_spill_dir = Path(result_spill_dir) if result_spill_dir else None
+        if self._result_spill_dir is not None:
+            self._result_spill_dir.mkdir(parents=True, exist_ok=True)
+        self.results = LRUCache(
+            max_size=result_cache_size,
+            on_evict=self._spill_result if self._result_spill_dir is not None else None,
+        )
+        self.task_metadata = TaskTable(capacity=result_cache_size)
+        
+        # 队列阶段处理函数表
+        self._task_handlers: Dict[TaskType, Callable[[str, Dict[str, Any]], Optional[Dict[str, Any]]]] = {
+            TaskType.DOWNLOAD: self._process_download_task,
+            TaskType.EXTRACT: self._process_extract_task,
+            TaskType.TRANSCRIBE: self._process_transcribe_task,
+            TaskType.SUMMARIZE: self._process_summarize_task,
+        }
         
         logger.info("编排器初始化完成")
     
@@ -107,22 +253,18 @@ class Orchestrator:
         """
         try:
             # 生成任务 ID
-            task_id = str(uuid.uuid4())
+            task_id = fast_uuid()
             start_time = time.time()
             
-            logger.info(f"开始处理视频: {video_url} (任务 ID: {task_id})")
+            logger.info("开始处理视频: %s (任务 ID: %s)", video_url, task_id)
             
             # 记录任务元数据
-            self.task_metadata[task_id] = {
-                "video_url": video_url,
-                "start_time": start_time,
-                "status": "processing",
-            }
+            self.task_metadata.add(task_id, video_url, start_time)
             
             if use_queue:
                 # 使用消息队列进行异步处理
                 self._enqueue_pipeline_tasks(task_id, video_url)
-                logger.info(f"[{task_id}] 任务已入队，等待处理")
+                logger.info("[%s] 任务已入队，等待处理", task_id)
             else:
                 # 同步处理
                 self._process_video_sync(task_id, video_url, start_time)
@@ -131,9 +273,7 @@ class Orchestrator:
         
         except Exception as e:
             logger.error(f"视频处理失败: {str(e)}")
-            if task_id in self.task_metadata:
-                self.task_metadata[task_id]["status"] = "failed"
-                self.task_metadata[task_id]["error"] = str(e)
+            self.task_metadata.mark_failed(task_id, str(e))
             raise VideoProcessingError(f"视频处理失败: {str(e)}")
     
     def _process_video_sync(self, task_id: str, video_url: str, start_time: float) -> None:
@@ -146,19 +286,19 @@ class Orchestrator:
             start_time: 开始时间
         """
         # 步骤 1: 下载视频
-        logger.info(f"[{task_id}] 步骤 1: 下载视频")
+        logger.info("[%s] 步骤 1: 下载视频", task_id)
         video_path = self._download_video(task_id, video_url)
         
         # 步骤 2: 提取音频
-        logger.info(f"[{task_id}] 步骤 2: 提取音频")
+        logger.info("[%s] 步骤 2: 提取音频", task_id)
         audio_path = self._extract_audio(task_id, video_path)
         
         # 步骤 3: 生成转录
-        logger.info(f"[{task_id}] 步骤 3: 生成转录")
+        logger.info("[%s] 步骤 3: 生成转录", task_id)
         transcript = self._generate_transcript(task_id, audio_path)
         
         # 步骤 4: 生成总结
-        logger.info(f"[{task_id}] 步骤 4: 生成总结")
+        logger.info("[%s] 步骤 4: 生成总结", task_id)
         summary = self._generate_summary(task_id, transcript)
         
         # 获取视频元数据
@@ -177,11 +317,10 @@ class Orchestrator:
         )
         
         # 存储结果
-        self.results[task_id] = result
-        self.task_metadata[task_id]["status"] = "completed"
-        self.task_metadata[task_id]["end_time"] = time.time()
+        self.results.set_str(task_id, result)
+        self.task_metadata.mark_completed(task_id, time.time())
         
-        logger.info(f"[{task_id}] 视频处理完成，耗时: {processing_time:.2f}s")
+        logger.info("[%s] 视频处理完成，耗时: %.2fs", task_id, processing_time)
     
     def process_batch(self, video_urls: List[str]) -> List[str]:
         """
@@ -215,7 +354,49 @@ class Orchestrator:
         Returns:
             处理结果，如果不存在则返回 None
         """
-        return self.results.get(task_id)
+        result = self.results.get_str(task_id)
+        if result is None and self._result_spill_dir is not None:
+            result = self._load_spilled_result(task_id)
+        return result
+    
+    def _spill_result(self, task_id: str, result: ProcessingResult) -> None:
+        """
+        将被驱逐出内存的结果写入落盘目录
+        
+        Args:
+            task_id: 任务 ID
+            result: 处理结果
+        """
+        path = self._result_spill_dir / f"{task_id}.json"
+        path.write_bytes(result.to_json())
+        logger.debug("[%s] 结果已驱逐到磁盘: %s", task_id, path)
+    
+    def _load_spilled_result(self, task_id: str) -> Optional[ProcessingResult]:
+        """
+        从落盘目录读回结果并放回内存
+        
+        Args:
+            task_id: 任务 ID
+        
+        Returns:
+            处理结果，没有落盘记录或读取失败时返回 None
+        """
+        path = self._result_spill_dir / f"{task_id}.json"
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        
+        try:
+            result_dict = orjson.loads(data) if orjson is not None else json.loads(data)
+            result = ResultAggregator._dict_to_result(result_dict)
+        except Exception as e:
+            logger.error(f"[{task_id}] 读取落盘结果失败: {str(e)}")
+            return None
+        
+        self.results.set_str(task_id, result)
+        logger.debug("[%s] 结果已从磁盘读回", task_id)
+        return result
     
     def get_status(self, task_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -227,10 +408,10 @@ class Orchestrator:
         Returns:
             任务状态信息
         """
-        if task_id not in self.task_metadata:
+        metadata = self.task_metadata.get(task_id)
+        if metadata is None:
             return None
         
-        metadata = self.task_metadata[task_id]
         status_info = {
             "task_id": task_id,
             "video_url": metadata.get("video_url"),
@@ -248,102 +429,6 @@ class Orchestrator:
         
         return status_info
     
-    def _download_video(self, task_id: str, video_url: str) -> str:
-        """
-        下载视频
-        
-        Args:
-            task_id: 任务 ID
-            video_url: 视频 URL
-        
-        Returns:
-            视频文件路径
-        
-        Raises:
-            DownloadError: 如果下载失败
-        """
-        try:
-            # 检查缓存
-            cached_file = self.downloader.get_cached_file(video_url)
-            if cached_file:
-                logger.info(f"[{task_id}] 从缓存返回视频: {cached_file}")
-                return cached_file
-            
-            # 下载视频
-            video_path = self.downloader.download(video_url)
-            logger.info(f"[{task_id}] 视频下载完成: {video_path}")
-            
-            return video_path
-        
-        except DownloadError:
-            raise
-        except Exception as e:
-            raise DownloadError(f"视频下载失败: {str(e)}")
-    
-    def _extract_audio(self, task_id: str, video_path: str) -> str:
-        """
-        提取音频
-        
-        Args:
-            task_id: 任务 ID
-            video_path: 视频文件路径
-        
-        Returns:
-            音频文件路径
-        
-        Raises:
-            ExtractionError: 如果提取失败
-        """
-        try:
-            # 检查缓存
-            cached_audio = self.audio_extractor.get_cached_audio(video_path)
-            if cached_audio:
-                logger.info(f"[{task_id}] 从缓存返回音频: {cached_audio}")
-                return cached_audio
-            
-            # 提取音频
-            audio_path = self.audio_extractor.extract(video_path)
-            logger.info(f"[{task_id}] 音频提取完成: {audio_path}")
-            
-            return audio_path
-        
-        except ExtractionError:
-            raise
-        except Exception as e:
-            raise ExtractionError(f"音频提取失败: {str(e)}")
-    
-    def _generate_transcript(self, task_id: str, audio_path: str) -> str:
-        """
-        生成转录文本
-        
-        Args:
-            task_id: 任务 ID
-            audio_path: 音频文件路径
-        
-        Returns:
-            转录文本
-        
-        Raises:
-            TranscriptionError: 如果生成失败
-        """
-        try:
-            # 检查缓存
-            cached_transcript = self.transcript_generator.get_cached_transcript(audio_path)
-            if cached_transcript:
-                logger.info(f"[{task_id}] 从缓存返回转录文本")
-                return cached_transcript
-            
-            # 生成转录
-            transcript = self.transcript_generator.generate(audio_path)
-            logger.info(f"[{task_id}] 转录生成完成，长度: {len(transcript)}")
-            
-            return transcript
-        
-        except TranscriptionError:
-            raise
-        except Exception as e:
-            raise TranscriptionError(f"转录生成失败: {str(e)}")
-    
     def _generate_summary(self, task_id: str, transcript: str) -> str:
         """
         生成总结
@@ -361,17 +446,17 @@ class Orchestrator:
         try:
             # 动态选择模型
             model = self.model_selector.select_model(transcript)
-            logger.info(f"[{task_id}] 选择模型: {model}")
+            logger.info("[%s] 选择模型: %s", task_id, model)
             
             # 检查缓存
             cached_summary = self.summary_generator.get_cached_summary(transcript, model)
             if cached_summary:
-                logger.info(f"[{task_id}] 从缓存返回总结")
+                logger.info("[%s] 从缓存返回总结", task_id)
                 return cached_summary
             
             # 生成总结
             summary = self.summary_generator.generate(transcript, model=model)
-            logger.info(f"[{task_id}] 总结生成完成，长度: {len(summary)}")
+            logger.info("[%s] 总结生成完成，长度: %s", task_id, len(summary))
             
             return summary
         
@@ -382,7 +467,7 @@ class Orchestrator:
     
     def _get_video_metadata(self, video_url: str) -> VideoMetadata:
         """
-        获取视频元数据
+        获取视频元数据（按 URL 缓存，重复处理同一视频时不再请求）
         
         Args:
             video_url: 视频 URL
@@ -390,11 +475,16 @@ class Orchestrator:
         Returns:
             视频元数据
         """
+        cache_key = CacheKeyGenerator.plain_metadata_key(video_url)
+        cached = self.cache.get_str(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             info = self.downloader.get_video_info(video_url)
             
             if info:
-                return VideoMetadata(
+                metadata = VideoMetadata(
                     url=video_url,
                     title=info.get("title"),
                     duration=info.get("duration"),
@@ -402,10 +492,14 @@ class Orchestrator:
                     channel=info.get("uploader"),
                 )
             else:
-                return VideoMetadata(url=video_url)
+                metadata = VideoMetadata(url=video_url)
+            
+            # 仅缓存成功获取的结果，失败时下次调用仍会重新请求
+            self.cache.set_str(cache_key, metadata)
+            return metadata
         
         except Exception as e:
-            logger.warning(f"获取视频元数据失败: {str(e)}")
+            logger.warning("获取视频元数据失败: %s", e)
             return VideoMetadata(url=video_url)
     
     def get_cache_stats(self) -> Dict[str, Any]:
@@ -423,6 +517,7 @@ class Orchestrator:
     def shutdown(self) -> None:
         """关闭编排器"""
         logger.info("关闭编排器...")
+        self.message_queue.close()
         self.thread_pool.shutdown(wait=True)
         self.message_queue.clear()
         logger.info("编排器已关闭")
@@ -439,30 +534,30 @@ class Orchestrator:
         """
         将管道任务入队到消息队列
         
-        按顺序入队：下载 → 提取音频 → 生成转录 → 生成总结
+        只入队下载任务，后续阶段（提取音频 → 生成转录 → 生成总结）作为链接阶段
+        附在任务上，由取到该任务的工作线程依次执行。
         
         Args:
             task_id: 任务 ID
             video_url: 视频 URL
         """
         try:
-            # 入队下载任务
+            # 入队下载任务（附带后续阶段）
             download_task_id = self.message_queue.enqueue(
                 TaskType.DOWNLOAD,
                 {
                     "parent_task_id": task_id,
                     "video_url": video_url,
-                }
+                },
+                next_stages=PIPELINE_NEXT_STAGES,
             )
-            logger.info(f"[{task_id}] 下载任务已入队: {download_task_id}")
+            logger.info("[%s] 下载任务已入队: %s", task_id, download_task_id)
             
             # 记录任务链
             if task_id not in self.task_metadata:
-                self.task_metadata[task_id] = {}
+                self.task_metadata.add(task_id, video_url, time.time())
             
-            self.task_metadata[task_id]["queue_tasks"] = {
-                "download": download_task_id,
-            }
+            self.task_metadata.set_extra(task_id, "queue_tasks", {"download": download_task_id})
         
         except Exception as e:
             logger.error(f"入队任务失败: {str(e)}")
@@ -475,122 +570,151 @@ class Orchestrator:
         Args:
             task: 消息队列任务
         """
+        if self._run_queue_task(task):
+            # 标记任务完成
+            self.message_queue.mark_completed(task.task_id)
+    
+    def _run_queue_task(self, task: Task) -> bool:
+        """
+        执行队列任务及其链接的后续阶段，失败时标记失败（由队列决定是否重试）
+        
+        每个阶段的输出直接作为下一阶段的输入，不经过消息队列。链上执行时间
+        超过 PIPELINE_CHAIN_TIME_SLICE 且队列中还有其他任务时，把剩余阶段
+        交回队列，让其他视频得到处理机会。
+        
+        重试时整条链从头执行，已完成的阶段会命中各自的缓存。
+        
+        Args:
+            task: 消息队列任务
+        
+        Returns:
+            是否执行成功（成功时由调用方标记完成）
+        """
         try:
             parent_task_id = task.input_data.get("parent_task_id")
+            task_type = task.task_type
+            input_data = task.input_data
+            next_stages = task.next_stages
+            chain_start = time.monotonic()
             
-            if task.task_type == TaskType.DOWNLOAD:
-                self._process_download_task(task, parent_task_id)
-            elif task.task_type == TaskType.EXTRACT:
-                self._process_extract_task(task, parent_task_id)
-            elif task.task_type == TaskType.TRANSCRIBE:
-                self._process_transcribe_task(task, parent_task_id)
-            elif task.task_type == TaskType.SUMMARIZE:
-                self._process_summarize_task(task, parent_task_id)
-            else:
-                raise ValueError(f"未知的任务类型: {task.task_type}")
+            while True:
+                output = self._run_stage(task_type, parent_task_id, input_data)
+                
+                if not next_stages:
+                    break
+                
+                task_type, next_stages = next_stages[0], next_stages[1:]
+                input_data = output
+                
+                if (
+                    time.monotonic() - chain_start > PIPELINE_CHAIN_TIME_SLICE
+                    and self.message_queue.get_queue_length() > 0
+                ):
+                    self._enqueue_stage(parent_task_id, task_type, input_data, next_stages)
+                    break
             
-            # 标记任务完成
-            self.message_queue.mark_completed(task.task_id)
+            return True
         
         except Exception as e:
             logger.error(f"处理队列任务失败: {str(e)}")
             self.message_queue.mark_failed(task.task_id, str(e))
+            return False
+    
+    def _run_stage(
+        self,
+        task_type: TaskType,
+        parent_task_id: str,
+        input_data: Dict[str, Any],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        执行单个管道阶段
+        
+        Args:
+            task_type: 阶段类型
+            parent_task_id: 父任务 ID
+            input_data: 阶段输入
+        
+        Returns:
+            下一阶段的输入，最后一个阶段返回 None
+        """
+        handler = self._task_handlers.get(task_type)
+        if handler is None:
+            raise ValueError(f"未知的任务类型: {task_type!r}")
+        return handler(parent_task_id, input_data)
     
-    def _process_download_task(self, task: Task, parent_task_id: str) -> None:
-        """处理下载任务"""
-        video_url = task.input_data.get("video_url")
-        logger.info(f"[{parent_task_id}] 处理下载任务: {video_url}")
+    def _enqueue_stage(
+        self,
+        parent_task_id: str,
+        task_type: TaskType,
+        input_data: Dict[str, Any],
+        next_stages: Tuple[TaskType, ...],
+    ) -> None:
+        """把链上剩余的阶段交回消息队列"""
+        stage_task_id = self.message_queue.enqueue(task_type, input_data, next_stages=next_stages)
+        stage_name = _TASK_TYPE_NAMES[task_type]
+        self.task_metadata.set_extra_item(parent_task_id, "queue_tasks", stage_name, stage_task_id)
+        logger.info("[%s] %s 任务已交回队列: %s", parent_task_id, stage_name, stage_task_id)
+    
+    def _process_download_task(self, parent_task_id: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """处理下载任务，返回提取阶段的输入"""
+        video_url = input_data.get("video_url")
+        logger.info("[%s] 处理下载任务: %s", parent_task_id, video_url)
         
         try:
             video_path = self._download_video(parent_task_id, video_url)
-            
-            # 入队提取任务
-            extract_task_id = self.message_queue.enqueue(
-                TaskType.EXTRACT,
-                {
-                    "parent_task_id": parent_task_id,
-                    "video_path": video_path,
-                }
-            )
-            
-            # 更新任务链
-            if parent_task_id in self.task_metadata:
-                self.task_metadata[parent_task_id]["queue_tasks"]["extract"] = extract_task_id
-            
-            logger.info(f"[{parent_task_id}] 提取任务已入队: {extract_task_id}")
+            return {
+                "parent_task_id": parent_task_id,
+                "video_path": video_path,
+            }
         
         except Exception as e:
             logger.error(f"[{parent_task_id}] 下载任务失败: {str(e)}")
             raise
     
-    def _process_extract_task(self, task: Task, parent_task_id: str) -> None:
-        """处理提取任务"""
-        video_path = task.input_data.get("video_path")
-        logger.info(f"[{parent_task_id}] 处理提取任务: {video_path}")
+    def _process_extract_task(self, parent_task_id: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """处理提取任务，返回转录阶段的输入"""
+        video_path = input_data.get("video_path")
+        logger.info("[%s] 处理提取任务: %s", parent_task_id, video_path)
         
         try:
             audio_path = self._extract_audio(parent_task_id, video_path)
-            
-            # 入队转录任务
-            transcribe_task_id = self.message_queue.enqueue(
-                TaskType.TRANSCRIBE,
-                {
-                    "parent_task_id": parent_task_id,
-                    "audio_path": audio_path,
-                }
-            )
-            
-            # 更新任务链
-            if parent_task_id in self.task_metadata:
-                self.task_metadata[parent_task_id]["queue_tasks"]["transcribe"] = transcribe_task_id
-            
-            logger.info(f"[{parent_task_id}] 转录任务已入队: {transcribe_task_id}")
+            return {
+                "parent_task_id": parent_task_id,
+                "audio_path": audio_path,
+            }
         
         except Exception as e:
             logger.error(f"[{parent_task_id}] 提取任务失败: {str(e)}")
             raise
     
-    def _process_transcribe_task(self, task: Task, parent_task_id: str) -> None:
-        """处理转录任务"""
-        audio_path = task.input_data.get("audio_path")
-        logger.info(f"[{parent_task_id}] 处理转录任务: {audio_path}")
+    def _process_transcribe_task(self, parent_task_id: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """处理转录任务，返回总结阶段的输入"""
+        audio_path = input_data.get("audio_path")
+        logger.info("[%s] 处理转录任务: %s", parent_task_id, audio_path)
         
         try:
             transcript = self._generate_transcript(parent_task_id, audio_path)
-            
-            # 入队总结任务
-            summarize_task_id = self.message_queue.enqueue(
-                TaskType.SUMMARIZE,
-                {
-                    "parent_task_id": parent_task_id,
-                    "transcript": transcript,
-                }
-            )
-            
-            # 更新任务链
-            if parent_task_id in self.task_metadata:
-                self.task_metadata[parent_task_id]["queue_tasks"]["summarize"] = summarize_task_id
-            
-            logger.info(f"[{parent_task_id}] 总结任务已入队: {summarize_task_id}")
+            return {
+                "parent_task_id": parent_task_id,
+                "transcript": transcript,
+            }
         
         except Exception as e:
             logger.error(f"[{parent_task_id}] 转录任务失败: {str(e)}")
             raise
     
-    def _process_summarize_task(self, task: Task, parent_task_id: str) -> None:
+    def _process_summarize_task(self, parent_task_id: str, input_data: Dict[str, Any]) -> None:
         """处理总结任务"""
-        transcript = task.input_data.get("transcript")
-        logger.info(f"[{parent_task_id}] 处理总结任务")
+        transcript = input_data.get("transcript")
+        logger.info("[%s] 处理总结任务", parent_task_id)
         
         try:
             summary = self._generate_summary(parent_task_id, transcript)
             
             # 标记父任务完成
-            if parent_task_id in self.task_metadata:
-                self.task_metadata[parent_task_id]["status"] = "completed"
-                self.task_metadata[parent_task_id]["end_time"] = time.time()
+            self.task_metadata.mark_completed(parent_task_id, time.time())
             
-            logger.info(f"[{parent_task_id}] 总结任务完成")
+            logger.info("[%s] 总结任务完成", parent_task_id)
         
         except Exception as e:
             logger.error(f"[{parent_task_id}] 总结任务失败: {str(e)}")
@@ -600,7 +724,8 @@ class Orchestrator:
         """
         并发处理多个视频
         
-        支持多个视频的并发处理，每个视频在单独的线程中执行。
+        视频放入共享工作队列，由固定数量的工作线程循环取出处理，
+        线程数不随视频数量增长（上限为线程池大小和 BATCH_MAX_WORKERS）。
         
         Args:
             video_urls: 视频 URL 列表
@@ -608,38 +733,57 @@ class Orchestrator:
         Returns:
             任务 ID 列表
         """
-        task_ids = []
-        futures = {}
+        task_ids = [fast_uuid() for _ in video_urls]
+        work: "queue.SimpleQueue[Tuple[str, str]]" = queue.SimpleQueue()
+        for item in zip(task_ids, video_urls):
+            work.put(item)
         
-        logger.info(f"开始并发处理 {len(video_urls)} 个视频")
+        num_workers = min(len(video_urls), self.thread_pool.max_workers, BATCH_MAX_WORKERS)
+        logger.info("开始并发处理 %s 个视频，工作线程数: %s", len(video_urls), num_workers)
         
-        # 为每个视频提交任务到线程池
-        for i, video_url in enumerate(video_urls):
-            task_id = str(uuid.uuid4())
-            task_ids.append(task_id)
-            
-            # 提交到线程池
+        # 每个工作线程使用唯一 ID 提交，并发的多个批次互不覆盖
+        workers = []
+        for _ in range(num_workers):
             try:
-                future = self.thread_pool.submit(
-                    task_id,
-                    self._process_video_isolated,
-                    task_id,
-                    video_url
+                workers.append(
+                    self.thread_pool.submit(fast_uuid(), self._drain_batch_queue, work)
                 )
-                futures[task_id] = future
-                logger.info(f"视频处理任务已提交到线程池: {task_id}")
             except Exception as e:
-                logger.error(f"提交任务失败: {str(e)}")
-                task_ids[-1] = None
+                logger.error(f"提交工作线程失败: {str(e)}")
         
-        # 等待所有任务完成
+        # 只等待本批次的工作线程排空队列
         logger.info("等待所有视频处理完成...")
-        self.thread_pool.wait_all()
+        futures_wait(workers)
+        
+        # 工作线程全部提交失败时，未被取走的视频没有对应任务
+        unprocessed = set()
+        while True:
+            try:
+                unprocessed.add(work.get_nowait()[0])
+            except queue.Empty:
+                break
+        if unprocessed:
+            task_ids = [None if t in unprocessed else t for t in task_ids]
         
-        logger.info(f"并发处理完成，共处理 {len([t for t in task_ids if t])} 个视频")
+        logger.info("并发处理完成，共处理 %s 个视频", len([t for t in task_ids if t]))
         
         return task_ids
     
+    def _drain_batch_queue(self, work: "queue.SimpleQueue[Tuple[str, str]]") -> None:
+        """
+        批处理工作线程主循环：不断从工作队列取出视频处理，直到队列为空
+        
+        Args:
+            work: (任务 ID, 视频 URL) 工作队列
+        """
+        get = work.get_nowait
+        while True:
+            try:
+                task_id, video_url = get()
+            except queue.Empty:
+                return
+            self._process_video_isolated(task_id, video_url)
+    
     def _process_video_isolated(self, task_id: str, video_url: str) -> None:
         """
         在隔离的线程中处理视频
@@ -653,61 +797,70 @@ class Orchestrator:
         try:
             start_time = time.time()
             
-            logger.info(f"[{task_id}] 在线程中开始处理视频: {video_url}")
+            logger.info("[%s] 在线程中开始处理视频: %s", task_id, video_url)
             
             # 记录任务元数据
-            self.task_metadata[task_id] = {
-                "video_url": video_url,
-                "start_time": start_time,
-                "status": "processing",
-                "thread_isolated": True,
-            }
+            self.task_metadata.add(task_id, video_url, start_time, thread_isolated=True)
             
             # 同步处理视频
             self._process_video_sync(task_id, video_url, start_time)
             
-            logger.info(f"[{task_id}] 线程中的视频处理完成")
+            logger.info("[%s] 线程中的视频处理完成", task_id)
         
         except Exception as e:
             logger.error(f"[{task_id}] 线程中的视频处理失败: {str(e)}")
-            if task_id in self.task_metadata:
-                self.task_metadata[task_id]["status"] = "failed"
-                self.task_metadata[task_id]["error"] = str(e)
+            self.task_metadata.mark_failed(task_id, str(e))
     
-    def process_queue_worker(self, worker_id: int, timeout: float = 1.0) -> None:
+    def process_queue_worker(
+        self,
+        worker_id: int,
+        timeout: Optional[float] = None,
+        batch_size: int = QUEUE_BATCH_SIZE,
+    ) -> None:
         """
         消息队列工作线程
         
-        从消息队列中获取任务并处理，支持多个工作线程并发处理。
+        从消息队列中批量获取任务并依次处理，支持多个工作线程并发处理。
+        每批任务的完成状态在整批处理后一次性回写。队列空闲时阻塞等待，
+        队列关闭且任务取完后退出。
         
         Args:
             worker_id: 工作线程 ID
-            timeout: 队列获取超时时间（秒）
+            timeout: 队列获取超时时间（秒），None 表示一直等待到有任务或队列关闭
+            batch_size: 每次最多取出的任务数；只处理耗时很短的单阶段任务时
+                可调大以减少出队和回写的开销
         """
-        logger.info(f"工作线程 {worker_id} 启动")
+        logger.info("工作线程 %s 启动", worker_id)
         
         while True:
             try:
-                # 从队列中获取任务
-                task = self.message_queue.dequeue(timeout=timeout)
+                # 从队列中批量获取任务
+                tasks = self.message_queue.dequeue_batch(batch_size, timeout=timeout)
                 
-                if task is None:
-                    # 队列为空，继续等待
+                if not tasks:
+                    if self.message_queue.closed:
+                        break
+                    # 等待超时，继续等待
                     continue
                 
-                logger.info(f"工作线程 {worker_id} 获取任务: {task.task_id}")
+                logger.info("工作线程 %s 获取 %s 个任务", worker_id, len(tasks))
                 
-                # 处理任务
-                self.process_queue_task(task)
+                # 处理任务，成功的任务统一标记完成
+                completed_ids = [
+                    task.task_id for task in tasks if self._run_queue_task(task)
+                ]
+                self.message_queue.mark_completed_many(completed_ids)
                 
-                logger.info(f"工作线程 {worker_id} 完成任务: {task.task_id}")
+                logger.info("工作线程 %s 完成 %s/%s 个任务", worker_id, len(completed_ids), len(tasks))
             
             except KeyboardInterrupt:
-                logger.info(f"工作线程 {worker_id} 被中断")
+                logger.info("工作线程 %s 被中断", worker_id)
                 break
             except Exception as e:
                 logger.error(f"工作线程 {worker_id} 出错: {str(e)}")
                 continue
+        
+        logger.info("工作线程 %s 退出", worker_id)
     
     def start_queue_workers(self, num_workers: int = 2) -> List[str]:
         """
@@ -721,10 +874,10 @@ class Orchestrator:
         """
         worker_task_ids = []
         
-        logger.info(f"启动 {num_workers} 个工作线程")
+        logger.info("启动 %s 个工作线程", num_workers)
         
         for i in range(num_workers):
-            worker_id = str(uuid.uuid4())
+            worker_id = fast_uuid()
             
             try:
                 future = self.thread_pool.submit(
@@ -733,7 +886,7 @@ class Orchestrator:
                     i
                 )
                 worker_task_ids.append(worker_id)
-                logger.info(f"工作线程 {i} 已启动: {worker_id}")
+                logger.info("工作线程 %s 已启动: %s", i, worker_id)
             except Exception as e:
                 logger.error(f"启动工作线程失败: {str(e)}")
         
@@ -743,23 +896,38 @@ class Orchestrator:
         """
         将多个视频提交到消息队列进行异步处理
         
+        所有视频的下载任务（附带后续链接阶段）一次性批量入队；
+        队列容量不足时整批提交失败。
+        
         Args:
             video_urls: 视频 URL 列表
         
         Returns:
-            任务 ID 列表
+            任务 ID 列表，提交失败的位置为 None
         """
-        task_ids = []
+        logger.info("将 %s 个视频提交到消息队列", len(video_urls))
         
-        logger.info(f"将 {len(video_urls)} 个视频提交到消息队列")
+        start_time = time.time()
+        task_ids = [fast_uuid() for _ in video_urls]
+        for task_id, video_url in zip(task_ids, video_urls):
+            self.task_metadata.add(task_id, video_url, start_time)
         
-        for video_url in video_urls:
-            try:
-                task_id = self.process_video(video_url, use_queue=True)
-                task_ids.append(task_id)
-            except Exception as e:
-                logger.error(f"提交视频失败: {video_url}, 错误: {str(e)}")
-                task_ids.append(None)
+        try:
+            download_task_ids = self.message_queue.enqueue_many(
+                [
+                    (TaskType.DOWNLOAD, {"parent_task_id": task_id, "video_url": video_url})
+                    for task_id, video_url in zip(task_ids, video_urls)
+                ],
+                next_stages=PIPELINE_NEXT_STAGES,
+            )
+        except Exception as e:
+            logger.error(f"批量提交视频失败: {str(e)}")
+            for task_id in task_ids:
+                self.task_metadata.mark_failed(task_id, str(e))
+            return [None] * len(video_urls)
+        
+        for task_id, download_task_id in zip(task_ids, download_task_ids):
+            self.task_metadata.set_extra(task_id, "queue_tasks", {"download": download_task_id})
         
         return task_ids
 
@@ -776,12 +944,29 @@ class Orchestrator:
             结果字典，如果不存在则返回 None
         """
         result = self.get_result(task_id)
+        if result is not None:
+            return result.to_dict()
         
-        if result is None:
-            logger.warning(f"结果不存在: {task_id}")
-            return None
+        logger.warning("结果不存在: %s", task_id)
+        return None
+    
+    def iter_batch_results(self, task_ids: Iterable[Optional[str]]) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        逐个生成多个任务的处理结果
+        
+        每次只构造一个结果字典，适合边生成边写出的大批量导出。
+        
+        Args:
+            task_ids: 任务 ID 序列
         
-        return result.to_dict()
+        Yields:
+            结果字典，任务 ID 为 None 或结果不存在时为 None
+        """
+        for task_id in task_ids:
+            if task_id is None:
+                yield None
+            else:
+                yield self.get_result_dict(task_id)
     
     def get_batch_results(self, task_ids: List[str]) -> List[Dict[str, Any]]:
         """
@@ -793,17 +978,17 @@ class Orchestrator:
         Returns:
             结果字典列表
         """
-        results = []
-        
-        for task_id in task_ids:
-            if task_id is None:
-                results.append(None)
-                continue
-            
-            result_dict = self.get_result_dict(task_id)
-            results.append(result_dict)
+        return list(self.iter_batch_results(task_ids))
+    
+    def iter_all_results(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        逐个生成内存中的所有处理结果（已驱逐到磁盘的结果不包含在内）
         
-        return results
+        Yields:
+            (任务 ID, 结果字典)
+        """
+        for task_id, result in self.results.items():
+            yield task_id, result.to_dict()
     
     def get_all_results(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -812,12 +997,7 @@ class Orchestrator:
         Returns:
             任务 ID 到结果字典的映射
         """
-        all_results = {}
-        
-        for task_id, result in self.results.items():
-            all_results[task_id] = result.to_dict()
-        
-        return all_results
+        return dict(self.iter_all_results())
     
     def get_result_summary(self, task_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -832,7 +1012,6 @@ class Orchestrator:
             结果摘要字典
         """
         result = self.get_result(task_id)
-        
         if result is None:
             return None
         
@@ -856,15 +1035,13 @@ class Orchestrator:
         Returns:
             JSON 字符串，如果不存在则返回 None
         """
-        import json
-        
-        result_dict = self.get_result_dict(task_id)
-        
-        if result_dict is None:
+        result = self.get_result(task_id)
+        if result is None:
+            logger.warning("结果不存在: %s", task_id)
             return None
         
         try:
-            return json.dumps(result_dict, ensure_ascii=False, indent=2)
+            return _dumps_indented(result.to_dict())
         except Exception as e:
             logger.error(f"导出结果为 JSON 失败: {str(e)}")
             return None
@@ -879,12 +1056,10 @@ class Orchestrator:
         Returns:
             JSON 字符串，如果导出失败则返回 None
         """
-        import json
-        
         results = self.get_batch_results(task_ids)
         
         try:
-            return json.dumps(results, ensure_ascii=False, indent=2)
+            return _dumps_indented(results)
         except Exception as e:
             logger.error(f"导出批量结果为 JSON 失败: {str(e)}")
             return None
@@ -900,19 +1075,18 @@ class Orchestrator:
         Returns:
             是否成功保存
         """
-        import json
-        
-        result_json = self.export_result_json(task_id)
-        
-        if result_json is None:
+        result = self.get_result(task_id)
+        if result is None:
             logger.error(f"无法导出结果: {task_id}")
             return False
         
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(result_json)
+            # 直接写出序列化得到的 UTF-8 字节，不经过 str 中转
+            data = _dumps_indented_bytes(result.to_dict())
+            with open(filepath, 'wb') as f:
+                f.write(data)
             
-            logger.info(f"结果已保存到文件: {filepath}")
+            logger.info("结果已保存到文件: %s", filepath)
             return True
         
         except Exception as e:
@@ -923,6 +1097,8 @@ class Orchestrator:
         """
         将多个结果保存到文件
         
+        逐条序列化并写入，不在内存中构造整批结果；不存在的结果写为 null。
+        
         Args:
             task_ids: 任务 ID 列表
             filepath: 文件路径
@@ -930,19 +1106,23 @@ class Orchestrator:
         Returns:
             是否成功保存
         """
-        import json
-        
-        results_json = self.export_batch_results_json(task_ids)
-        
-        if results_json is None:
-            logger.error(f"无法导出批量结果")
-            return False
-        
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(results_json)
+            with open(filepath, 'wb') as f:
+                f.write(b"[\n")
+                for i, task_id in enumerate(task_ids):
+                    if i:
+                        f.write(b",\n")
+                    
+                    result = self.get_result(task_id) if task_id is not None else None
+                    if result is None:
+                        if task_id is not None:
+                            logger.warning("结果不存在: %s", task_id)
+                        f.write(b"null")
+                    else:
+                        f.write(result.to_json())
+                f.write(b"\n]")
             
-            logger.info(f"批量结果已保存到文件: {filepath}")
+            logger.info("批量结果已保存到文件: %s", filepath)
             return True
         
         except Exception as e:
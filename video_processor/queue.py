@@ -1,18 +1,54 @@
 """
 消息队列系统 - 任务队列实现
 """
-from queue import Queue, Empty
-from typing import Optional, Dict, Any
-from threading import Lock
-import uuid
+from collections import deque
+from dataclasses import replace
+from itertools import count
+from typing import Optional, Dict, Any, List, Iterable, Tuple
+from threading import Event, Lock, Semaphore
+import time
 from datetime import datetime
 
-from .models import Task, TaskStatus, TaskType
+from .models import Task, TaskStatus, TaskType, _STATUS_NAMES, _TASK_TYPE_NAMES
 from .logger import get_logger
+from ._uuid_pool import fast_hex_id
 from .exceptions import QueueError
 
 logger = get_logger(__name__)
 
+# 已结束（完成或最终失败）的任务在任务映射中保留的时间（秒）
+TERMINAL_TASK_TTL = 300.0
+
+# 任务映射中最多保留的已结束任务数，超出时不等到期即移除最早结束的任务
+TERMINAL_TASK_LIMIT = 10000
+
+_TERMINAL_STATUSES = (TaskStatus.COMPLETED, TaskStatus.FAILED)
+
+# 重试队列非空时，每 RETRY_SHARE 次取任务优先取一次重试任务（批量时最多占 1/RETRY_SHARE）
+RETRY_SHARE = 4
+
+# 任务时间戳的缓存精度（秒），同一精度区间内的状态变更共用一个 datetime
+NOW_CACHE_RESOLUTION = 0.001
+
+_now_cache: Tuple[datetime, float] = (datetime.now(), time.monotonic())
+
+
+def _cached_now() -> datetime:
+    """
+    返回当前时间，NOW_CACHE_RESOLUTION 内重复调用复用同一个 datetime 对象
+    
+    Returns:
+        当前时间（误差不超过缓存精度）
+    """
+    global _now_cache
+    mono = time.monotonic()
+    now, stamp = _now_cache
+    if mono - stamp < NOW_CACHE_RESOLUTION:
+        return now
+    now = datetime.now()
+    _now_cache = (now, mono)  # 整体替换元组，读取方不会看到不一致的值
+    return now
+
 
 class MessageQueue:
     """
@@ -23,32 +59,221 @@ class MessageQueue:
     - 任务状态跟踪
     - 重试机制
     - 线程安全
+    
+    待处理任务存放在 deque 中：append/popleft 在 CPython 下原子，入队和出队
+    不经过互斥锁。容量由信号量限制，Event 只在队列由空变为非空时唤醒消费者。
+    重试任务放入单独的重试队列，按 RETRY_SHARE 的比例与新任务交替取出，
+    既不阻塞新任务，也不会因新任务源源不断而饿死。
+    
+    任务映射的读写不加锁：每次更新都是一次字典赋值（GIL 下原子），且同一任务
+    同一时刻只由一个线程推进状态。每次状态迁移以 (原状态, 新状态, 数量) 事件
+    追加到 deque，读取统计时一次性汇总为各状态计数，无需遍历任务映射。
+    
+    已结束的任务保留 terminal_ttl 秒供查询状态，之后从任务映射中移除；
+    已结束任务超过 terminal_limit 个时提前移除最早结束的任务。长时间运行或
+    突发大量任务时任务映射都不会无限增长。
     """
     
-    def __init__(self, max_size: int = 10000):
+    def __init__(
+        self,
+        max_size: int = 10000,
+        terminal_ttl: Optional[float] = TERMINAL_TASK_TTL,
+        terminal_limit: Optional[int] = TERMINAL_TASK_LIMIT,
+    ):
         """
         初始化消息队列
         
         Args:
             max_size: 最大队列大小
+            terminal_ttl: 已结束任务的保留时间（秒），None 表示不按时间移除
+            terminal_limit: 最多保留的已结束任务数，None 表示不限
         """
         if max_size <= 0:
             raise QueueError("max_size 必须大于 0")
         
         self.max_size = max_size
-        self.queue: Queue[Task] = Queue(maxsize=max_size)
+        self._deque: deque = deque()  # 待处理的新任务（FIFO）
+        self._retry_queue: deque = deque()  # 待重试的任务（FIFO）
+        self._retry_turns = count(1)  # 重试队列非空时的取任务计数，next() 在 CPython 下原子
+        self._slots = Semaphore(max_size)  # 剩余容量
+        self._not_empty = Event()  # 入队或关闭时置位
         self.tasks: Dict[str, Task] = {}  # 任务 ID 到任务的映射
-        self.lock = Lock()
-        self.completed_count = 0
-        self.failed_count = 0
+        self.closed = False
+        self.terminal_ttl = terminal_ttl
+        self.terminal_limit = terminal_limit
+        
+        # 已结束任务的移除计划 (到期时间, 任务 ID)，按到期时间先后追加
+        self._expiry: deque = deque()
+        self._expiry_lock = Lock()
+        
+        # 状态迁移事件 (原状态或 None, 新状态或 None, 数量)，append/popleft 线程安全；
+        # None 表示任务新建或被移除
+        self._transitions: deque = deque()
+        self._stats_lock = Lock()  # 仅在汇总迁移事件时使用
+        self._status_counts = [0] * len(TaskStatus)  # 按 TaskStatus 值索引
+        self._completed_total = 0
+        self._failed_total = 0
     
-    def enqueue(self, task_type: TaskType, input_data: Dict[str, Any]) -> str:
+    def _drain_transitions(self) -> List[int]:
+        """
+        汇总积压的状态迁移事件（调用方持有 _stats_lock）
+        
+        Returns:
+            按 TaskStatus 值索引的各状态任务数
+        """
+        counts = self._status_counts
+        pop = self._transitions.popleft
+        while True:
+            try:
+                src, dst, n = pop()
+            except IndexError:
+                break
+            if src is not None:
+                counts[src] -= n
+            if dst is None:
+                continue
+            counts[dst] += n
+            if dst is TaskStatus.COMPLETED:
+                self._completed_total += n
+            elif dst is TaskStatus.FAILED:
+                self._failed_total += n
+        return counts
+    
+    @property
+    def completed_count(self) -> int:
+        """累计完成的任务数"""
+        with self._stats_lock:
+            self._drain_transitions()
+            return self._completed_total
+    
+    @property
+    def failed_count(self) -> int:
+        """累计最终失败的任务数"""
+        with self._stats_lock:
+            self._drain_transitions()
+            return self._failed_total
+    
+    def _schedule_expiry(self, task_ids: Iterable[str]) -> None:
+        """登记已结束的任务，到期或超出数量上限后从任务映射移除；顺带清理"""
+        ttl = self.terminal_ttl
+        limit = self.terminal_limit
+        if ttl is None and limit is None:
+            return
+        
+        now = time.monotonic()
+        deadline = now + ttl if ttl is not None else float("inf")
+        expiry = self._expiry
+        expiry.extend((deadline, task_id) for task_id in task_ids)
+        
+        over_limit = limit is not None and len(expiry) > limit
+        if not over_limit and (not expiry or expiry[0][0] > now):
+            return
+        # 只需一个线程清理，其他线程直接跳过
+        if not self._expiry_lock.acquire(blocking=False):
+            return
+        try:
+            while expiry and (
+                expiry[0][0] <= now or (limit is not None and len(expiry) > limit)
+            ):
+                _, task_id = expiry.popleft()
+                task = self.tasks.get(task_id)
+                # 期间被重新标记为未结束的任务不移除
+                if task is None or task.status not in _TERMINAL_STATUSES:
+                    continue
+                removed = self.tasks.pop(task_id, None)
+                if removed is not None:
+                    self._transitions.append((removed.status, None, 1))
+        finally:
+            self._expiry_lock.release()
+    
+    def _put_nowait(self, task: Task, retry: bool = False) -> bool:
+        """
+        放入单个任务（不阻塞）
+        
+        Args:
+            task: 任务
+            retry: 是否放入重试队列
+        
+        Returns:
+            是否放入成功，队列已满时返回 False
+        """
+        if not self._slots.acquire(blocking=False):
+            return False
+        (self._retry_queue if retry else self._deque).append(task)
+        self._not_empty.set()
+        return True
+    
+    def _pop_available(self, max_items: int) -> List[Task]:
+        """
+        不等待地取出最多 max_items 个任务
+        
+        轮到重试队列时先取至多 max_items // RETRY_SHARE（至少 1）个重试任务，
+        再从新任务队列取满；新任务不足时用重试任务补足。
+        """
+        batch: List[Task] = []
+        retry_pop = self._retry_queue.popleft
+        try:
+            if self._retry_queue and next(self._retry_turns) % RETRY_SHARE == 0:
+                for _ in range(max(1, max_items // RETRY_SHARE)):
+                    batch.append(retry_pop())
+        except IndexError:
+            pass
+        for pop in (self._deque.popleft, retry_pop):
+            try:
+                while len(batch) < max_items:
+                    batch.append(pop())
+            except IndexError:
+                pass
+        return batch
+    
+    def _take(self, max_items: int, timeout: Optional[float]) -> List[Task]:
+        """
+        取出最多 max_items 个任务，队列为空时等待
+        
+        等待前先清除 Event 再检查一次队列：生产者总是先 append 再 set，
+        因此清除之后的入队一定能被看到或唤醒等待者，不会丢失通知。
+        
+        Args:
+            max_items: 最多取出的任务数
+            timeout: 等待第一个任务的超时时间（秒），None 表示一直等待
+        
+        Returns:
+            任务列表，超时或队列已关闭且为空时返回空列表
+        """
+        not_empty = self._not_empty
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            batch = self._pop_available(max_items)
+            if batch:
+                self._slots.release(len(batch))
+                return batch
+            
+            if self.closed:
+                return batch
+            not_empty.clear()
+            if self._deque or self._retry_queue or self.closed:
+                continue
+            if deadline is None:
+                not_empty.wait()
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return batch
+                not_empty.wait(remaining)  # 超时后回到循环开头再检查一次
+    
+    def enqueue(
+        self,
+        task_type: TaskType,
+        input_data: Dict[str, Any],
+        next_stages: Tuple[TaskType, ...] = (),
+    ) -> str:
         """
         入队任务
         
         Args:
             task_type: 任务类型
             input_data: 输入数据
+            next_stages: 本任务完成后由同一工作线程接着执行的后续阶段
         
         Returns:
             任务 ID
@@ -57,31 +282,92 @@ class MessageQueue:
             QueueError: 如果队列已满
         """
         try:
-            task_id = str(uuid.uuid4())
+            task_id = fast_hex_id()
+            now = _cached_now()
             task = Task(
                 task_id=task_id,
                 task_type=task_type,
                 input_data=input_data,
                 status=TaskStatus.PENDING,
+                created_at=now,
+                updated_at=now,
+                next_stages=next_stages,
             )
             
-            # 尝试入队
-            try:
-                self.queue.put(task, block=False)
-            except Exception as e:
-                raise QueueError(f"队列已满: {str(e)}")
-            
-            # 记录任务
-            with self.lock:
-                self.tasks[task_id] = task
+            # 先登记并记录 PENDING 再入队：消费者取到任务时任务映射中一定已有记录，
+            # 其 RUNNING 转换也不会先于 PENDING 被统计
+            self.tasks[task_id] = task
+            self._transitions.append((None, TaskStatus.PENDING, 1))
+            if not self._put_nowait(task):
+                self._transitions.append((TaskStatus.PENDING, None, 1))
+                del self.tasks[task_id]
+                raise QueueError(f"队列已满: 容量 {self.max_size}")
             
-            logger.info(f"任务入队: {task_id} (类型: {task_type})")
+            logger.info("任务入队: %s (类型: %s)", task_id, _TASK_TYPE_NAMES[task_type])
             return task_id
         except QueueError:
             raise
         except Exception as e:
             raise QueueError(f"入队失败: {str(e)}")
     
+    def enqueue_many(
+        self,
+        entries: Iterable[Tuple[TaskType, Dict[str, Any]]],
+        next_stages: Tuple[TaskType, ...] = (),
+    ) -> List[str]:
+        """
+        批量入队任务
+        
+        整批任务一次性放入队列，只唤醒一次等待的消费者；
+        队列剩余容量不足时整批都不入队。
+        
+        Args:
+            entries: (任务类型, 输入数据) 序列
+            next_stages: 每个任务完成后由同一工作线程接着执行的后续阶段
+        
+        Returns:
+            任务 ID 列表，与 entries 顺序一致
+        
+        Raises:
+            QueueError: 如果队列剩余容量不足
+        """
+        pending = TaskStatus.PENDING
+        now = _cached_now()
+        tasks = [
+            Task(
+                task_id=fast_hex_id(),
+                task_type=task_type,
+                input_data=input_data,
+                status=pending,
+                created_at=now,
+                updated_at=now,
+                next_stages=next_stages,
+            )
+            for task_type, input_data in entries
+        ]
+        if not tasks:
+            return []
+        
+        # 逐个占用容量，不足时归还已占用的部分
+        acquire = self._slots.acquire
+        acquired = 0
+        while acquired < len(tasks) and acquire(blocking=False):
+            acquired += 1
+        if acquired < len(tasks):
+            if acquired:
+                self._slots.release(acquired)
+            raise QueueError(
+                f"队列已满: 剩余容量 {acquired}，需要 {len(tasks)}"
+            )
+        # 容量已占用，先登记再放入队列
+        self.tasks.update({task.task_id: task for task in tasks})
+        self._transitions.append((None, TaskStatus.PENDING, len(tasks)))
+        self._deque.extend(tasks)
+        self._not_empty.set()
+        
+        logger.info("批量入队: %s 个任务", len(tasks))
+        return [task.task_id for task in tasks]
+    
     def dequeue(self, timeout: Optional[float] = None) -> Optional[Task]:
         """
         出队任务
@@ -93,22 +379,67 @@ class MessageQueue:
             任务，如果队列为空则返回 None
         """
         try:
-            task = self.queue.get(timeout=timeout)
+            batch = self._take(1, timeout)
+            if not batch:
+                return None
+            task = batch[0]
             
-            # 更新任务状态
-            with self.lock:
-                task.status = TaskStatus.RUNNING
-                task.updated_at = datetime.now()
-                self.tasks[task.task_id] = task
+            # 更新任务状态（Task 不可变，替换为新实例）
+            self._transitions.append((task.status, TaskStatus.RUNNING, 1))
+            task = replace(task, status=TaskStatus.RUNNING, updated_at=_cached_now())
+            self.tasks[task.task_id] = task
             
-            logger.info(f"任务出队: {task.task_id}")
+            logger.info("任务出队: %s", task.task_id)
             return task
-        except Empty:
-            return None
         except Exception as e:
             logger.error(f"出队失败: {str(e)}")
             return None
     
+    def dequeue_batch(self, max_items: int = 32, timeout: Optional[float] = None) -> List[Task]:
+        """
+        批量出队任务
+        
+        等待至少一个任务可用，然后取出最多 max_items 个任务。
+        等待期间不轮询，入队或 close() 时才被唤醒。
+        
+        Args:
+            max_items: 单次最多取出的任务数
+            timeout: 等待第一个任务的超时时间（秒），None 表示一直等待
+        
+        Returns:
+            任务列表，超时或队列已关闭且为空时返回空列表
+        """
+        try:
+            batch = self._take(max_items, timeout)
+            if not batch:
+                return batch
+            
+            # 整批任务共用一个时间戳更新状态
+            now = _cached_now()
+            running = TaskStatus.RUNNING
+            for i, task in enumerate(batch):
+                batch[i] = replace(task, status=running, updated_at=now)
+            self.tasks.update({task.task_id: task for task in batch})
+            # 队列中的任务都处于 PENDING
+            self._transitions.append((TaskStatus.PENDING, running, len(batch)))
+            
+            logger.info("批量出队: %s 个任务", len(batch))
+            return batch
+        except Exception as e:
+            logger.error(f"批量出队失败: {str(e)}")
+            return []
+    
+    def close(self) -> None:
+        """
+        关闭队列，唤醒所有阻塞在 dequeue_batch 上的消费者
+        
+        关闭后 dequeue_batch 仍会取出剩余任务，队列为空时立即返回空列表。
+        """
+        self.closed = True
+        self._not_empty.set()
+        
+        logger.info("队列已关闭")
+    
     def mark_completed(self, task_id: str) -> bool:
         """
         标记任务为完成
@@ -119,19 +450,60 @@ class MessageQueue:
         Returns:
             是否成功
         """
-        with self.lock:
-            if task_id not in self.tasks:
-                logger.warning(f"任务不存在: {task_id}")
-                return False
-            
-            task = self.tasks[task_id]
-            task.status = TaskStatus.COMPLETED
-            task.updated_at = datetime.now()
-            self.tasks[task_id] = task
-            self.completed_count += 1
+        task = self.tasks.get(task_id)
+        if task is None:
+            logger.warning("任务不存在: %s", task_id)
+            return False
+        
+        self.tasks[task_id] = replace(
+            task,
+            status=TaskStatus.COMPLETED,
+            updated_at=_cached_now()
+        )
+        self._transitions.append((task.status, TaskStatus.COMPLETED, 1))
+        self._schedule_expiry((task_id,))
+        
+        logger.info("任务完成: %s", task_id)
+        return True
+    
+    def mark_completed_many(self, task_ids: Iterable[str]) -> int:
+        """
+        批量标记任务为完成（共用一个时间戳，只记录一次计数事件）
+        
+        Args:
+            task_ids: 任务 ID 列表
+        
+        Returns:
+            成功标记的任务数
+        """
+        completed = TaskStatus.COMPLETED
+        moved = [0] * len(TaskStatus)  # 按原状态统计
+        marked_ids = []
+        tasks = self.tasks
+        now = _cached_now()
+        for task_id in task_ids:
+            task = tasks.get(task_id)
+            if task is None:
+                logger.warning("任务不存在: %s", task_id)
+                continue
             
-            logger.info(f"任务完成: {task_id}")
-            return True
+            tasks[task_id] = replace(
+                task,
+                status=completed,
+                updated_at=now
+            )
+            moved[task.status] += 1
+            marked_ids.append(task_id)
+        
+        for status, n in zip(TaskStatus, moved):
+            if n:
+                self._transitions.append((status, completed, n))
+        self._schedule_expiry(marked_ids)
+        
+        marked = sum(moved)
+        if marked:
+            logger.info("批量完成: %s 个任务", marked)
+        return marked
     
     def mark_failed(self, task_id: str, error_message: str = "") -> bool:
         """
@@ -144,37 +516,40 @@ class MessageQueue:
         Returns:
             是否成功
         """
-        with self.lock:
-            if task_id not in self.tasks:
-                logger.warning(f"任务不存在: {task_id}")
-                return False
-            
-            task = self.tasks[task_id]
-            task.error_message = error_message
-            task.updated_at = datetime.now()
-            
-            # 增加重试计数
-            task.retry_count += 1
-            
-            # 检查是否应该重试
-            if task.retry_count <= task.max_retries:
-                task.status = TaskStatus.PENDING
-                logger.info(f"任务重试: {task_id} (重试 {task.retry_count}/{task.max_retries})")
-                
-                # 重新入队
-                try:
-                    self.queue.put(task, block=False)
-                except Exception as e:
-                    logger.error(f"重新入队失败: {str(e)}")
-                    task.status = TaskStatus.FAILED
-                    self.failed_count += 1
-            else:
-                task.status = TaskStatus.FAILED
-                self.failed_count += 1
-                logger.error(f"任务失败（已达最大重试次数）: {task_id}")
+        task = self.tasks.get(task_id)
+        if task is None:
+            logger.warning("任务不存在: %s", task_id)
+            return False
+        previous_status = task.status
+        
+        # 增加重试计数，并一次性确定新状态，只构造一个新实例
+        retry_count = task.retry_count + 1
+        retry = retry_count <= task.max_retries
+        task = replace(
+            task,
+            status=TaskStatus.PENDING if retry else TaskStatus.FAILED,
+            error_message=error_message,
+            updated_at=_cached_now(),
+            retry_count=retry_count
+        )
+        
+        # 先登记再放入重试队列：消费者取到任务后写入的 RUNNING 不会被这里覆盖
+        self.tasks[task_id] = task
+        if retry:
+            logger.info("任务重试: %s (重试 %s/%s)", task_id, retry_count, task.max_retries)
+            self._transitions.append((previous_status, TaskStatus.PENDING, 1))
+            if self._put_nowait(task, retry=True):
+                return True
             
-            self.tasks[task_id] = task
-            return True
+            logger.error(f"重新入队失败: 队列已满 (容量 {self.max_size})")
+            self.tasks[task_id] = task = replace(task, status=TaskStatus.FAILED)
+            self._transitions.append((TaskStatus.PENDING, TaskStatus.FAILED, 1))
+        else:
+            logger.error(f"任务失败（已达最大重试次数）: {task_id}")
+            self._transitions.append((previous_status, TaskStatus.FAILED, 1))
+        
+        self._schedule_expiry((task_id,))
+        return True
     
     def get_status(self, task_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -186,30 +561,29 @@ class MessageQueue:
         Returns:
             任务状态信息
         """
-        with self.lock:
-            if task_id not in self.tasks:
-                return None
-            
-            task = self.tasks[task_id]
-            return {
-                "task_id": task.task_id,
-                "task_type": task.task_type.value,
-                "status": task.status.value,
-                "retry_count": task.retry_count,
-                "max_retries": task.max_retries,
-                "error_message": task.error_message,
-                "created_at": task.created_at.isoformat(),
-                "updated_at": task.updated_at.isoformat(),
-            }
+        task = self.tasks.get(task_id)
+        if task is None:
+            return None
+        
+        return {
+            "task_id": task.task_id,
+            "task_type": _TASK_TYPE_NAMES[task.task_type],
+            "status": _STATUS_NAMES[task.status],
+            "retry_count": task.retry_count,
+            "max_retries": task.max_retries,
+            "error_message": task.error_message,
+            "created_at": task.created_at.isoformat(),
+            "updated_at": task.updated_at.isoformat(),
+        }
     
     def get_queue_length(self) -> int:
         """获取队列长度"""
-        return self.queue.qsize()
+        return len(self._deque) + len(self._retry_queue)
     
     def get_pending_count(self) -> int:
         """获取待处理任务数"""
-        with self.lock:
-            return sum(1 for task in self.tasks.values() if task.status == TaskStatus.PENDING)
+        with self._stats_lock:
+            return self._drain_transitions()[TaskStatus.PENDING]
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -218,39 +592,44 @@ class MessageQueue:
         Returns:
             统计信息字典
         """
-        with self.lock:
-            total_tasks = len(self.tasks)
-            pending_tasks = sum(1 for task in self.tasks.values() if task.status == TaskStatus.PENDING)
-            running_tasks = sum(1 for task in self.tasks.values() if task.status == TaskStatus.RUNNING)
-            completed_tasks = sum(1 for task in self.tasks.values() if task.status == TaskStatus.COMPLETED)
-            failed_tasks = sum(1 for task in self.tasks.values() if task.status == TaskStatus.FAILED)
-            
+        with self._stats_lock:
+            counts = self._drain_transitions()
             return {
-                "queue_length": self.queue.qsize(),
+                "queue_length": len(self._deque) + len(self._retry_queue),
+                "retry_queue_length": len(self._retry_queue),
                 "max_size": self.max_size,
-                "total_tasks": total_tasks,
-                "pending_tasks": pending_tasks,
-                "running_tasks": running_tasks,
-                "completed_tasks": completed_tasks,
-                "failed_tasks": failed_tasks,
-                "completed_count": self.completed_count,
-                "failed_count": self.failed_count,
+                "total_tasks": len(self.tasks),
+                "pending_tasks": counts[TaskStatus.PENDING],
+                "running_tasks": counts[TaskStatus.RUNNING],
+                "completed_tasks": counts[TaskStatus.COMPLETED],
+                "failed_tasks": counts[TaskStatus.FAILED],
+                "completed_count": self._completed_total,
+                "failed_count": self._failed_total,
             }
     
     def clear(self) -> None:
         """清空队列"""
-        with self.lock:
-            # 清空队列
-            while not self.queue.empty():
-                try:
-                    self.queue.get_nowait()
-                except Empty:
-                    break
+        with self._stats_lock:
+            # 清空队列，归还占用的容量
+            removed = 0
+            for pending in (self._deque, self._retry_queue):
+                pop = pending.popleft
+                while True:
+                    try:
+                        pop()
+                    except IndexError:
+                        break
+                    removed += 1
+            if removed:
+                self._slots.release(removed)
             
             # 清空任务映射
             self.tasks.clear()
-            self.completed_count = 0
-            self.failed_count = 0
+            self._expiry.clear()
+            self._transitions.clear()
+            self._status_counts = [0] * len(TaskStatus)
+            self._completed_total = 0
+            self._failed_total = 0
             
             logger.info("队列已清空")
     
@@ -0,0 +1,177 @@
+"""
+速率限制器 - 按每分钟请求数和 token 数限流的异步令牌桶
+"""
+import asyncio
+import functools
+import threading
+import time
+
+from .logger import get_logger
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken 为可选依赖，缺失时按字符数估计
+    tiktoken = None
+
+logger = get_logger(__name__)
+
+# 默认限额（偏保守，按账户等级调高）
+DEFAULT_MAX_REQUESTS_PER_MINUTE = 500
+DEFAULT_MAX_TOKENS_PER_MINUTE = 30000
+
+# 容量不足时的最短等待时间（秒），避免忙等
+MIN_WAIT = 0.001
+
+# 精确计数使用的编码（gpt-3.5-turbo / gpt-4 系列）
+TOKEN_ENCODING = "cl100k_base"
+
+
+def estimate_tokens(text: str, max_length: int = 0) -> int:
+    """
+    粗略估计一次请求消耗的 token 数（1 个 token ≈ 4 个字符）
+    
+    Args:
+        text: 输入文本
+        max_length: 输出的最大字符数
+    
+    Returns:
+        估计的 token 数
+    """
+    return len(text) // 4 + max_length // 4
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    """加载并缓存 tiktoken 编码"""
+    return tiktoken.get_encoding(TOKEN_ENCODING)
+
+
+def count_tokens(text: str) -> int:
+    """
+    计算文本的 token 数
+    
+    安装了 tiktoken 时按 cl100k_base 编码精确计数，否则按 1 个 token ≈ 4 个
+    字符估计。不做记忆化：以整段转录文本为键的缓存会长期持有这些文本，
+    需要多次使用计数的调用方应自行保留结果。
+    
+    Args:
+        text: 输入文本
+    
+    Returns:
+        token 数
+    """
+    if tiktoken is None:
+        return len(text) // 4
+    return len(_encoding().encode(text, disallowed_special=()))
+
+
+class RateLimiter:
+    """
+    速率限制器
+    
+    请求数和 token 数各一个令牌桶，容量为每分钟限额，按每秒 限额/60 的速度
+    连续补充。acquire 在两个桶都有足够容量时扣减并返回，否则等待到可以满足
+    为止，使请求在发出前就不超过服务端限额，而不是靠 429 重试退避。
+    
+    补充在每次 acquire 时按流逝时间计算，不需要后台任务。检查与扣减在一把
+    线程锁内完成且中间没有 await，事件循环中的异步调用与各线程中的同步调用
+    （acquire_sync）可以共用同一个限速器。
+    """
+    
+    def __init__(
+        self,
+        max_requests_per_minute: float = DEFAULT_MAX_REQUESTS_PER_MINUTE,
+        max_tokens_per_minute: float = DEFAULT_MAX_TOKENS_PER_MINUTE,
+    ):
+        """
+        初始化速率限制器
+        
+        Args:
+            max_requests_per_minute: 每分钟最多请求数
+            max_tokens_per_minute: 每分钟最多 token 数
+        
+        Raises:
+            ValueError: 如果限额不大于 0
+        """
+        if max_requests_per_minute <= 0 or max_tokens_per_minute <= 0:
+            raise ValueError("限额必须大于 0")
+        
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self._request_rate = max_requests_per_minute / 60.0
+        self._token_rate = max_tokens_per_minute / 60.0
+        
+        self.available_request_capacity = float(max_requests_per_minute)
+        self.available_token_capacity = float(max_tokens_per_minute)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self) -> None:
+        """按流逝时间补充两个桶，不超过容量"""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self.available_request_capacity = min(
+            self.max_requests_per_minute,
+            self.available_request_capacity + elapsed * self._request_rate,
+        )
+        self.available_token_capacity = min(
+            self.max_tokens_per_minute,
+            self.available_token_capacity + elapsed * self._token_rate,
+        )
+    
+    def _try_acquire(self, token_estimate: int) -> float:
+        """
+        补充后尝试扣减一次请求的容量
+        
+        Args:
+            token_estimate: 本次请求估计消耗的 token 数
+        
+        Returns:
+            0 表示已扣减；否则为容量足够前还需等待的秒数
+        """
+        tokens = min(token_estimate, self.max_tokens_per_minute)
+        with self._lock:
+            self._refill()
+            if self.available_request_capacity >= 1 and self.available_token_capacity >= tokens:
+                self.available_request_capacity -= 1
+                self.available_token_capacity -= tokens
+                return 0.0
+            
+            return max(
+                (1 - self.available_request_capacity) / self._request_rate,
+                (tokens - self.available_token_capacity) / self._token_rate,
+                MIN_WAIT,
+            )
+    
+    async def acquire(self, token_estimate: int = 0) -> None:
+        """
+        等待直到可以发出一个请求，并扣减对应容量
+        
+        单次请求估计超过每分钟 token 限额时按桶满处理，避免永远等待。
+        
+        Args:
+            token_estimate: 本次请求估计消耗的 token 数
+        """
+        while True:
+            wait = self._try_acquire(token_estimate)
+            if not wait:
+                return
+            logger.debug("速率限制，等待 %.3fs", wait)
+            await asyncio.sleep(wait)
+    
+    def acquire_sync(self, token_estimate: int = 0) -> None:
+        """
+        acquire 的同步版本，供在线程中发出请求的同步调用使用
+        
+        与 acquire 共用同一组令牌桶，等待时阻塞当前线程。
+        
+        Args:
+            token_estimate: 本次请求估计消耗的 token 数
+        """
+        while True:
+            wait = self._try_acquire(token_estimate)
+            if not wait:
+                return
+            logger.debug("速率限制，等待 %.3fs", wait)
+            time.sleep(wait)
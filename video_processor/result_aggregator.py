@@ -2,31 +2,365 @@
 结果聚合器 - 收集、格式化和持久化处理结果
 """
 import json
+import mmap
 import os
+import queue
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from threading import Lock, Thread
+from typing import Optional, Dict, Any, List, Tuple
 from video_processor.models import ProcessingResult, VideoMetadata
 from video_processor.config import RESULTS_DIR
 from video_processor.logger import get_logger
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，缺失时退回标准库 json
+    orjson = None
+
 logger = get_logger(__name__)
 
+# 预先绑定，_dict_to_result 省去每次的属性查找
+_fromisoformat = datetime.fromisoformat
+
+# 内存中缓存的结果数上限
+RESULTS_CACHE_SIZE = 512
+
+# 批量读取结果文件的 I/O 线程数
+IO_POOL_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# 后台写入队列容量（队列满时 save 阻塞，形成背压）
+SAVE_QUEUE_SIZE = 1024
+
+# 后台写入线程每轮最多处理的结果数（索引更新合并为一次提交）
+PERSIST_BATCH_SIZE = 64
+
+# 不小于该大小（字节）的结果文件通过 mmap 直接交给 orjson 解析
+MMAP_THRESHOLD = 64 * 1024
+
+# 元数据索引库文件名（位于存储目录下，不匹配 *.json）
+INDEX_FILENAME = "_index.db"
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    valid INTEGER NOT NULL,
+    task_id TEXT,
+    platform TEXT,
+    created_at TEXT,
+    status TEXT,
+    processing_time REAL
+);
+CREATE INDEX IF NOT EXISTS idx_results_platform ON results(platform);
+CREATE INDEX IF NOT EXISTS idx_results_created_at ON results(created_at);
+CREATE INDEX IF NOT EXISTS idx_results_status ON results(status);
+"""
+
+
+def _dumps(obj: Any) -> bytes:
+    """序列化为紧凑的 UTF-8 JSON 字节串（优先使用 orjson）"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass  # 含孤立代理字符等 orjson 拒绝的字符串，退回标准库
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _write_atomic(path: Path, data: bytes, fsync: bool = False) -> None:
+    """
+    原子写入文件：先一次性写入同目录下的隐藏临时文件，再 os.replace 覆盖目标
+    
+    临时文件以 "." 开头且不以 .json 结尾，不会被目录扫描当作结果文件。
+    
+    Args:
+        path: 目标文件路径
+        data: 文件内容
+        fsync: 是否在替换前将数据刷到磁盘
+    """
+    tmp = path.with_name(f".{path.name}.tmp")
+    try:
+        with open(tmp, 'wb', buffering=0) as f:
+            f.write(data)
+            if fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _read_bytes(path: Any) -> bytes:
+    """读取文件的全部字节"""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _loads(data: bytes) -> Dict[str, Any]:
+    """解析 JSON 字节串（优先使用 orjson）"""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # 标准库写出的 \ud800 之类转义 orjson 不接受，交给标准库判断
+    return json.loads(data)
+
+
+def _load_file(path: Any) -> Dict[str, Any]:
+    """
+    读取并解析 JSON 结果文件
+    
+    大文件在 orjson 可用时映射到内存后直接解析，不再复制出一份 bytes；
+    小文件或 orjson 无法解析时退回整体读取。
+    """
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    try:
+                        return orjson.loads(view)
+                    except orjson.JSONDecodeError:
+                        pass
+    return _loads(_read_bytes(path))
+
+
+def _try_load_file(path: str) -> Tuple[Optional[Dict[str, Any]], Optional[Exception]]:
+    """读取结果文件，返回 (结果字典, None) 或 (None, 异常)，供线程池批量读取"""
+    try:
+        return _load_file(path), None
+    except Exception as e:
+        return None, e
+
+
+# 读取和解析结果文件的共享线程池（线程按需创建）
+_IO_POOL = ThreadPoolExecutor(max_workers=IO_POOL_WORKERS, thread_name_prefix="result-io")
+
 
 class ResultAggregator:
     """结果聚合器 - 收集所有处理结果，格式化为 JSON，并持久化"""
     
-    def __init__(self, storage_dir: Optional[Path] = None):
+    def __init__(self, storage_dir: Optional[Path] = None, cache_size: int = RESULTS_CACHE_SIZE,
+                 fsync: bool = False, write_behind: bool = False):
         """
         初始化结果聚合器
         
         Args:
             storage_dir: 结果存储目录，默认为 RESULTS_DIR
+            cache_size: 内存中缓存的结果数上限，超出时驱逐最久未使用的结果
+            fsync: 保存结果时是否 fsync，需要掉电持久性时开启
+            write_behind: 是否由后台线程写入结果文件，save 只入队不等待磁盘
         """
         self.storage_dir = storage_dir or RESULTS_DIR
         self.storage_dir.mkdir(parents=True, exist_ok=True)
-        self._results_cache: Dict[str, ProcessingResult] = {}
-        logger.info(f"Result aggregator initialized with storage dir: {self.storage_dir}")
+        self._cache_max = cache_size
+        self._fsync = fsync
+        self._results_cache: "OrderedDict[str, ProcessingResult]" = OrderedDict()
+        # 已落盘结果的序列化字节，query 直接解析而不经过 ProcessingResult
+        self._bytes_cache: "OrderedDict[str, bytes]" = OrderedDict()
+        
+        # 元数据索引：过滤和统计只查索引，只读取命中的结果文件
+        self._index_lock = Lock()
+        self._index = sqlite3.connect(
+            str(self.storage_dir / INDEX_FILENAME), check_same_thread=False
+        )
+        self._index.executescript(_INDEX_SCHEMA)
+        
+        # 后台写入：有界队列 + 单个写入线程
+        self._save_queue: Optional["queue.Queue[Optional[ProcessingResult]]"] = None
+        self._persister: Optional[Thread] = None
+        if write_behind:
+            self._save_queue = queue.Queue(maxsize=SAVE_QUEUE_SIZE)
+            self._persister = Thread(
+                target=self._persist_loop, name="result-persister", daemon=True
+            )
+            self._persister.start()
+        
+        self._sync_index()
+        logger.info("Result aggregator initialized with storage dir: %s", self.storage_dir)
+    
+    def _cache_result(self, task_id: str, result: ProcessingResult) -> None:
+        """放入结果缓存，超出上限时驱逐最久未使用的结果"""
+        cache = self._results_cache
+        cache[task_id] = result
+        cache.move_to_end(task_id)
+        if len(cache) > self._cache_max:
+            cache.popitem(last=False)
+        # 对象可能比已缓存的字节新，字节缓存由 save 或 retrieve 重新填充
+        self._bytes_cache.pop(task_id, None)
+    
+    def _cache_bytes(self, task_id: str, payload: bytes) -> None:
+        """放入序列化字节缓存，超出上限时驱逐最久未使用的条目"""
+        cache = self._bytes_cache
+        cache[task_id] = payload
+        cache.move_to_end(task_id)
+        if len(cache) > self._cache_max:
+            cache.popitem(last=False)
+    
+    def flush(self) -> None:
+        """等待后台写入队列中的结果全部落盘（未开启后台写入时立即返回）"""
+        if self._save_queue is not None and self._persister.is_alive():
+            self._save_queue.join()
+    
+    def close(self) -> None:
+        """写完排队中的结果，停止后台写入线程并关闭元数据索引连接"""
+        if self._persister is not None and self._persister.is_alive():
+            self._save_queue.put(None)
+            self._persister.join()
+        with self._index_lock:
+            self._index.close()
+    
+    def _persist_loop(self) -> None:
+        """后台写入线程：批量取出结果写入文件，每批的索引更新一次提交"""
+        save_queue = self._save_queue
+        while True:
+            batch = [save_queue.get()]
+            while len(batch) < PERSIST_BATCH_SIZE:
+                try:
+                    batch.append(save_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stop = False
+            rows = []
+            for result in batch:
+                if result is None:
+                    stop = True
+                    continue
+                try:
+                    rows.append(self._write_result_file(result)[1])
+                except Exception as e:
+                    logger.error(f"Failed to save result for task {result.task_id}: {str(e)}")
+            
+            try:
+                if rows:
+                    with self._index_lock:
+                        self._index.executemany(
+                            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?)", rows
+                        )
+                        self._index.commit()
+                    logger.debug("Persisted %s results", len(rows))
+            except Exception as e:
+                logger.error(f"Failed to index persisted results: {str(e)}")
+            finally:
+                for _ in batch:
+                    save_queue.task_done()
+            
+            if stop:
+                return
+    
+    def _write_result_file(self, result: ProcessingResult) -> Tuple[Path, Tuple[Any, ...], bytes]:
+        """
+        将结果写入文件
+        
+        Returns:
+            (文件路径, 索引行, 写入的字节)
+        """
+        filepath = self.storage_dir / f"{result.task_id}.json"
+        result_dict = result.to_dict()
+        payload = _dumps(result_dict)
+        _write_atomic(filepath, payload, self._fsync)
+        
+        stat = os.stat(filepath)
+        row = (os.path.join(self.storage_dir, filepath.name), stat.st_mtime_ns, stat.st_size)
+        return filepath, row + self._index_row(result_dict), payload
+    
+    @staticmethod
+    def _index_row(result_dict: Dict[str, Any]) -> Tuple[str, Optional[str], str, Optional[str], float]:
+        """
+        从结果字典提取索引字段
+        
+        Returns:
+            (task_id, platform, created_at, status, processing_time)
+        """
+        return (
+            result_dict["task_id"],
+            result_dict["video_metadata"].get("platform"),
+            result_dict["created_at"],
+            result_dict.get("status"),
+            result_dict["processing_time"],
+        )
+    
+    def _sync_index(self) -> None:
+        """
+        使索引与存储目录一致
+        
+        先等待后台写入完成；只对目录做 stat：新增或修改时间/大小有变化的文件
+        才重新解析，已删除的文件从索引移除。无法解析的文件记为无效，直到再次被修改。
+        """
+        self.flush()
+        with self._index_lock:
+            index = self._index
+            indexed = {
+                path: (mtime_ns, size)
+                for path, mtime_ns, size in index.execute("SELECT path, mtime_ns, size FROM results")
+            }
+            
+            upserts = []
+            with os.scandir(self.storage_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    # 与 glob("*.json") 一致：跳过隐藏文件
+                    if not name.endswith(".json") or name.startswith("."):
+                        continue
+                    stat = entry.stat()
+                    signature = (stat.st_mtime_ns, stat.st_size)
+                    if indexed.pop(entry.path, None) == signature:
+                        continue
+                    
+                    try:
+                        row = (1,) + self._index_row(_load_file(entry.path))
+                    except Exception as e:
+                        logger.warning("Failed to index result file %s: %s", entry.path, e)
+                        row = (0, None, None, None, None, None)
+                    upserts.append((entry.path,) + signature + row)
+            
+            if upserts:
+                index.executemany(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", upserts
+                )
+            if indexed:
+                index.executemany("DELETE FROM results WHERE path = ?", [(p,) for p in indexed])
+            index.commit()
+    
+    def _load_indexed(self, where: str, params: Tuple[Any, ...] = ()) -> List[ProcessingResult]:
+        """
+        按索引条件加载结果文件
+        
+        Args:
+            where: SQL 过滤条件
+            params: 条件参数
+        
+        Returns:
+            命中的结果列表
+        """
+        self._sync_index()
+        with self._index_lock:
+            paths = [
+                path for (path,) in self._index.execute(
+                    f"SELECT path FROM results WHERE valid = 1 AND ({where}) ORDER BY path", params
+                )
+            ]
+        
+        # 文件读取和 JSON 解析并行进行，结果按 paths 顺序返回
+        loaded = _IO_POOL.map(_try_load_file, paths) if len(paths) > 1 else map(_try_load_file, paths)
+        
+        results = []
+        for path, (result_dict, error) in zip(paths, loaded):
+            try:
+                if error is not None:
+                    raise error
+                results.append(self._dict_to_result(result_dict))
+            except Exception as e:
+                logger.warning("Failed to process result file %s: %s", path, e)
+        return results
     
     def aggregate(self, task_id: str, video_metadata: VideoMetadata, 
                   video_path: str, audio_path: str, 
@@ -59,8 +393,8 @@ class ResultAggregator:
         )
         
         # 缓存结果
-        self._results_cache[task_id] = result
-        logger.info(f"Result aggregated for task {task_id}")
+        self._cache_result(task_id, result)
+        logger.info("Result aggregated for task %s", task_id)
         
         return result
     
@@ -68,24 +402,30 @@ class ResultAggregator:
         """
         保存结果到文件系统
         
+        开启后台写入时只将结果放入写入队列（队列满时阻塞），文件稍后写入；
+        读取类操作会先等待队列写完。
+        
         Args:
             result: 处理结果
         
         Returns:
             str: 保存的文件路径
         """
+        if self._save_queue is not None:
+            self._save_queue.put(result)
+            return str(self.storage_dir / f"{result.task_id}.json")
+        
         try:
-            # 生成文件名
-            filename = f"{result.task_id}.json"
-            filepath = self.storage_dir / filename
-            
-            # 转换为字典并序列化
-            result_dict = result.to_dict()
+            filepath, row, payload = self._write_result_file(result)
+            self._cache_bytes(result.task_id, payload)
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(result_dict, f, ensure_ascii=False, indent=2)
+            with self._index_lock:
+                self._index.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?)", row
+                )
+                self._index.commit()
             
-            logger.info(f"Result saved to {filepath}")
+            logger.info("Result saved to %s", filepath)
             return str(filepath)
         
         except Exception as e:
@@ -103,28 +443,31 @@ class ResultAggregator:
             ProcessingResult: 处理结果，如果不存在则返回 None
         """
         # 先检查缓存
-        if task_id in self._results_cache:
-            logger.debug(f"Result retrieved from cache for task {task_id}")
-            return self._results_cache[task_id]
+        result = self._results_cache.get(task_id)
+        if result is not None:
+            self._results_cache.move_to_end(task_id)
+            logger.debug("Result retrieved from cache for task %s", task_id)
+            return result
         
         # 从文件系统读取
         try:
+            self.flush()
             filename = f"{task_id}.json"
             filepath = self.storage_dir / filename
             
             if not filepath.exists():
-                logger.warning(f"Result file not found for task {task_id}")
+                logger.warning("Result file not found for task %s", task_id)
                 return None
             
-            with open(filepath, 'r', encoding='utf-8') as f:
-                result_dict = json.load(f)
+            payload = _read_bytes(filepath)
             
             # 重构 ProcessingResult 对象
-            result = self._dict_to_result(result_dict)
+            result = self._dict_to_result(_loads(payload))
             
             # 更新缓存
-            self._results_cache[task_id] = result
-            logger.info(f"Result retrieved from file for task {task_id}")
+            self._cache_result(task_id, result)
+            self._cache_bytes(task_id, payload)
+            logger.info("Result retrieved from file for task %s", task_id)
             
             return result
         
@@ -142,6 +485,11 @@ class ResultAggregator:
         Returns:
             Dict: 结果字典，包含完整输出及时间戳
         """
+        payload = self._bytes_cache.get(task_id)
+        if payload is not None:
+            self._bytes_cache.move_to_end(task_id)
+            return _loads(payload)
+        
         result = self.retrieve(task_id)
         if result is None:
             return None
@@ -159,26 +507,12 @@ class ResultAggregator:
         Returns:
             List[ProcessingResult]: 符合条件的结果列表
         """
-        results = []
-        
         try:
-            # 遍历结果目录中的所有文件
-            for filepath in self.storage_dir.glob("*.json"):
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        result_dict = json.load(f)
-                    
-                    result = self._dict_to_result(result_dict)
-                    
-                    # 检查日期范围
-                    if start_date <= result.created_at <= end_date:
-                        results.append(result)
-                
-                except Exception as e:
-                    logger.warning(f"Failed to process result file {filepath}: {str(e)}")
-                    continue
-            
-            logger.info(f"Found {len(results)} results between {start_date} and {end_date}")
+            # created_at 以 ISO 格式存储，字符串顺序即时间顺序
+            results = self._load_indexed(
+                "created_at BETWEEN ? AND ?", (start_date.isoformat(), end_date.isoformat())
+            )
+            logger.info("Found %s results between %s and %s", len(results), start_date, end_date)
             return results
         
         except Exception as e:
@@ -195,26 +529,9 @@ class ResultAggregator:
         Returns:
             List[ProcessingResult]: 符合条件的结果列表
         """
-        results = []
-        
         try:
-            # 遍历结果目录中的所有文件
-            for filepath in self.storage_dir.glob("*.json"):
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        result_dict = json.load(f)
-                    
-                    result = self._dict_to_result(result_dict)
-                    
-                    # 检查平台
-                    if result.video_metadata.platform == platform:
-                        results.append(result)
-                
-                except Exception as e:
-                    logger.warning(f"Failed to process result file {filepath}: {str(e)}")
-                    continue
-            
-            logger.info(f"Found {len(results)} results from platform {platform}")
+            results = self._load_indexed("platform = ?", (platform,))
+            logger.info("Found %s results from platform %s", len(results), platform)
             return results
         
         except Exception as e:
@@ -231,25 +548,9 @@ class ResultAggregator:
         Returns:
             List[ProcessingResult]: 符合条件的结果列表
         """
-        results = []
-        
         try:
-            # 遍历结果目录中的所有文件
-            for filepath in self.storage_dir.glob("*.json"):
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        result_dict = json.load(f)
-                    
-                    # 检查状态字段（如果存在）
-                    if result_dict.get("status") == status:
-                        result = self._dict_to_result(result_dict)
-                        results.append(result)
-                
-                except Exception as e:
-                    logger.warning(f"Failed to process result file {filepath}: {str(e)}")
-                    continue
-            
-            logger.info(f"Found {len(results)} results with status {status}")
+            results = self._load_indexed("status = ?", (status,))
+            logger.info("Found %s results with status %s", len(results), status)
             return results
         
         except Exception as e:
@@ -263,23 +564,9 @@ class ResultAggregator:
         Returns:
             List[ProcessingResult]: 所有结果列表
         """
-        results = []
-        
         try:
-            # 遍历结果目录中的所有文件
-            for filepath in self.storage_dir.glob("*.json"):
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        result_dict = json.load(f)
-                    
-                    result = self._dict_to_result(result_dict)
-                    results.append(result)
-                
-                except Exception as e:
-                    logger.warning(f"Failed to process result file {filepath}: {str(e)}")
-                    continue
-            
-            logger.info(f"Listed {len(results)} total results")
+            results = self._load_indexed("1")
+            logger.info("Listed %s total results", len(results))
             return results
         
         except Exception as e:
@@ -297,9 +584,11 @@ class ResultAggregator:
             bool: 是否成功删除
         """
         try:
+            self.flush()
+            
             # 从缓存中删除
-            if task_id in self._results_cache:
-                del self._results_cache[task_id]
+            self._results_cache.pop(task_id, None)
+            self._bytes_cache.pop(task_id, None)
             
             # 从文件系统中删除
             filename = f"{task_id}.json"
@@ -307,10 +596,15 @@ class ResultAggregator:
             
             if filepath.exists():
                 os.remove(filepath)
-                logger.info(f"Result deleted for task {task_id}")
+                with self._index_lock:
+                    self._index.execute(
+                        "DELETE FROM results WHERE path = ?", (os.path.join(self.storage_dir, filename),)
+                    )
+                    self._index.commit()
+                logger.info("Result deleted for task %s", task_id)
                 return True
             
-            logger.warning(f"Result file not found for task {task_id}")
+            logger.warning("Result file not found for task %s", task_id)
             return False
         
         except Exception as e:
@@ -325,15 +619,23 @@ class ResultAggregator:
             bool: 是否成功清空
         """
         try:
+            self.flush()
+            
             # 清空缓存
             self._results_cache.clear()
+            self._bytes_cache.clear()
             
             # 删除所有结果文件
             for filepath in self.storage_dir.glob("*.json"):
                 try:
                     os.remove(filepath)
                 except Exception as e:
-                    logger.warning(f"Failed to delete file {filepath}: {str(e)}")
+                    logger.warning("Failed to delete file %s: %s", filepath, e)
+            
+            # 删除失败的文件在下次同步时重新登记
+            with self._index_lock:
+                self._index.execute("DELETE FROM results")
+                self._index.commit()
             
             logger.info("All results cleared")
             return True
@@ -350,23 +652,22 @@ class ResultAggregator:
             Dict: 统计信息
         """
         try:
-            all_results = self.list_all()
+            self._sync_index()
+            with self._index_lock:
+                rows = self._index.execute(
+                    "SELECT COALESCE(NULLIF(platform, ''), 'unknown'), COUNT(*), SUM(processing_time) "
+                    "FROM results WHERE valid = 1 GROUP BY 1"
+                ).fetchall()
             
             stats = {
-                "total_results": len(all_results),
+                "total_results": sum(count for _, count, _ in rows),
                 "cache_size": len(self._results_cache),
                 "storage_dir": str(self.storage_dir),
-                "results_by_platform": {},
-                "total_processing_time": 0.0,
+                "results_by_platform": {platform: count for platform, count, _ in rows},
+                "total_processing_time": sum((total for _, _, total in rows), 0.0),
             }
             
-            # 统计各平台的结果数
-            for result in all_results:
-                platform = result.video_metadata.platform or "unknown"
-                stats["results_by_platform"][platform] = stats["results_by_platform"].get(platform, 0) + 1
-                stats["total_processing_time"] += result.processing_time
-            
-            logger.info(f"Stats: {stats}")
+            logger.info("Stats: %s", stats)
             return stats
         
         except Exception as e:
@@ -384,24 +685,25 @@ class ResultAggregator:
         Returns:
             ProcessingResult: 处理结果对象
         """
+        # 过滤扫描的热路径：子字典只取一次，按字段顺序传位置参数
+        vm = result_dict["video_metadata"]
+        vm_get = vm.get
         video_metadata = VideoMetadata(
-            url=result_dict["video_metadata"]["url"],
-            title=result_dict["video_metadata"].get("title"),
-            duration=result_dict["video_metadata"].get("duration"),
-            platform=result_dict["video_metadata"].get("platform"),
-            upload_date=result_dict["video_metadata"].get("upload_date"),
-            channel=result_dict["video_metadata"].get("channel"),
+            vm["url"],
+            vm_get("title"),
+            vm_get("duration"),
+            vm_get("platform"),
+            vm_get("upload_date"),
+            vm_get("channel"),
         )
         
-        created_at = datetime.fromisoformat(result_dict["created_at"])
-        
         return ProcessingResult(
-            task_id=result_dict["task_id"],
-            video_metadata=video_metadata,
-            video_path=result_dict["video_path"],
-            audio_path=result_dict["audio_path"],
-            transcript=result_dict["transcript"],
-            summary=result_dict["summary"],
-            processing_time=result_dict["processing_time"],
-            created_at=created_at,
+            result_dict["task_id"],
+            video_metadata,
+            result_dict["video_path"],
+            result_dict["audio_path"],
+            result_dict["transcript"],
+            result_dict["summary"],
+            result_dict["processing_time"],
+            _fromisoformat(result_dict["created_at"]),
         )
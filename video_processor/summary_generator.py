@@ -3,21 +3,86 @@
 
 从转录文本生成总结，支持多种 LLM 模型和动态模型选择。
 """
+import asyncio
+import functools
+import json
 import os
-from typing import Optional, Dict, List
+from typing import Any, Iterator, Optional, Dict, List, Tuple
 import hashlib
 
 from video_processor.exceptions import SummarizationError
 from video_processor.cache import LRUCache, CacheKeyGenerator
+from video_processor.rate_limiter import (
+    RateLimiter,
+    count_tokens,
+    estimate_tokens,
+    DEFAULT_MAX_REQUESTS_PER_MINUTE,
+    DEFAULT_MAX_TOKENS_PER_MINUTE,
+)
+from video_processor.http_session import shared_openai_session
 from video_processor.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 异步并发生成时同时进行的 API 请求数上限
+MAX_CONCURRENT_REQUESTS = 10
+
+# generate_batched 单个请求中合并的转录文本数
+BATCH_SIZE = 10
+
+# 支持 response_format={"type": "json_object"} 的模型；其他模型（如 gpt-4）
+# 传入该参数会被拒绝，只靠提示词要求 JSON 输出
+JSON_MODE_MODELS = frozenset({"gpt-3.5-turbo", "gpt-4-turbo"})
+
+# 单个 API 请求的超时时间（秒），避免挂起的连接长期占用工作线程
+REQUEST_TIMEOUT = 60.0
+
+_SYSTEM_PROMPT = "你是一个专业的内容总结助手。请根据提供的转录文本生成简洁、准确的总结。"
+
+# 总结提示词的头部模板和尾部，转录文本夹在两者之间
+_PROMPT_HEADER = """请根据以下转录文本生成一个总结。总结应该：
+1. 简洁明了，最多 {max_length} 个字符
+2. 保留关键信息和主要观点
+3. 使用清晰的语言
+4. 避免冗余和重复
+
+转录文本：
+"""
+_PROMPT_FOOTER = """
+
+请生成总结："""
+
+
+@functools.lru_cache(maxsize=16)
+def _prompt_header(max_length: int) -> str:
+    """按最大长度填充提示词头部（结果按 max_length 缓存）"""
+    return _PROMPT_HEADER.format(max_length=max_length)
+
+
+def _parse_json_object(content: str) -> Any:
+    """解析回复中的 JSON 对象
+    
+    未启用 JSON 模式的模型可能在对象外包上代码块或说明文字，
+    直接解析失败时取第一个 "{" 到最后一个 "}" 之间的部分再解析。
+    
+    Raises:
+        ValueError: 回复中没有可解析的 JSON
+    """
+    try:
+        return json.loads(content)
+    except ValueError:
+        start, end = content.find("{"), content.rfind("}")
+        if start < 0 or end < start:
+            raise
+        return json.loads(content[start:end + 1])
+
 
 class ModelSelector:
     """模型选择器
     
-    根据转录长度和内容类型动态选择最合适的 LLM 模型。
+    根据转录的 token 数和内容类型动态选择最合适的 LLM 模型。按内容类型的
+    分档规则选出模型后，若输入加预计输出超出其上下文窗口，改用能容纳的
+    最便宜模型。
     """
     
     # 模型配置
@@ -42,10 +107,33 @@ class ModelSelector:
         },
     }
     
-    # 转录长度阈值（字符数）
-    SHORT_THRESHOLD = 1000
-    MEDIUM_THRESHOLD = 5000
-    LONG_THRESHOLD = 10000
+    # 转录长度阈值（token 数；未安装 tiktoken 时按 4 个字符 1 个 token 估计，
+    # 与原先 1000 / 5000 / 10000 字符的阈值一致）
+    SHORT_THRESHOLD = 250
+    MEDIUM_THRESHOLD = 1250
+    LONG_THRESHOLD = 2500
+    
+    # 各内容类型总结的预计输出 token 数
+    OUTPUT_TOKENS = {
+        "general": 300,
+        "technical": 600,
+        "news": 150,
+        "entertainment": 200,
+    }
+    
+    # 提示词和回复格式的预留 token 数
+    SAFETY_TOKENS = 256
+    
+    # 由 MODELS 派生的查找表，选择时不再遍历字典：
+    # 模型名到上下文窗口，以及按 (价格, 窗口) 升序排列的并行元组
+    _MAX_TOKENS = {name: info["max_tokens"] for name, info in MODELS.items()}
+    _NAMES_BY_COST = tuple(name for _, _, name in sorted(
+        (info["cost_per_1k"], info["max_tokens"], name) for name, info in MODELS.items()
+    ))
+    _MAX_TOKENS_BY_COST = tuple(map(_MAX_TOKENS.__getitem__, _NAMES_BY_COST))
+    _LARGEST = max((info["max_tokens"], name) for name, info in MODELS.items())[1]
+    # 未知模型按已知模型中最小的上下文窗口保守估计
+    _MIN_CONTEXT = min(_MAX_TOKENS.values())
     
     def __init__(self):
         """初始化模型选择器"""
@@ -55,7 +143,8 @@ class ModelSelector:
         self,
         transcript: str,
         content_type: str = "general",
-        user_preference: Optional[str] = None
+        user_preference: Optional[str] = None,
+        token_count: Optional[int] = None
     ) -> str:
         """根据多个因素选择最合适的模型
         
@@ -63,6 +152,7 @@ class ModelSelector:
             transcript: 转录文本
             content_type: 内容类型（"general", "technical", "news", "entertainment"）
             user_preference: 用户偏好的模型（如果指定则使用该模型）
+            token_count: 已计算好的转录 token 数（为 None 时在此计数）
             
         Returns:
             选择的模型名称
@@ -74,20 +164,50 @@ class ModelSelector:
         if user_preference:
             if user_preference not in self.MODELS:
                 raise SummarizationError(f"不支持的模型: {user_preference}")
-            self.logger.info(f"使用用户指定的模型: {user_preference}")
+            self.logger.info("使用用户指定的模型: %s", user_preference)
             return user_preference
         
-        # 根据转录长度选择模型
-        transcript_length = len(transcript)
+        # 根据转录的 token 数选择模型
+        transcript_length = count_tokens(transcript) if token_count is None else token_count
         
         if content_type == "technical":
-            return self._select_technical_model(transcript_length)
+            model = self._select_technical_model(transcript_length)
         elif content_type == "news":
-            return self._select_news_model(transcript_length)
+            model = self._select_news_model(transcript_length)
         elif content_type == "entertainment":
-            return self._select_entertainment_model(transcript_length)
+            model = self._select_entertainment_model(transcript_length)
         else:
-            return self._select_general_model(transcript_length)
+            model = self._select_general_model(transcript_length)
+        
+        required = (
+            transcript_length
+            + self.OUTPUT_TOKENS.get(content_type, self.OUTPUT_TOKENS["general"])
+            + self.SAFETY_TOKENS
+        )
+        return self._fit_context(model, required)
+    
+    def _fit_context(self, model: str, required: int) -> str:
+        """
+        确保模型的上下文窗口能容纳所需 token 数
+        
+        Args:
+            model: 按分档规则选出的模型
+            required: 输入、预计输出和预留的 token 总数
+        
+        Returns:
+            原模型；容纳不下时为能容纳的最便宜模型，都容纳不下时为窗口最大的模型
+        """
+        if self._MAX_TOKENS[model] >= required:
+            return model
+        
+        # 按价格从低到高找第一个容纳得下的模型
+        fitted = self._LARGEST
+        for name, max_tokens in zip(self._NAMES_BY_COST, self._MAX_TOKENS_BY_COST):
+            if max_tokens >= required:
+                fitted = name
+                break
+        self.logger.info("%s 上下文窗口不足 %d tokens，改用 %s", model, required, fitted)
+        return fitted
     
     def _select_general_model(self, transcript_length: int) -> str:
         """为通用内容选择模型"""
@@ -148,7 +268,10 @@ class SummaryGenerator:
         self,
         cache: Optional[LRUCache] = None,
         api_key: Optional[str] = None,
-        model_selector: Optional[ModelSelector] = None
+        model_selector: Optional[ModelSelector] = None,
+        max_requests_per_minute: float = DEFAULT_MAX_REQUESTS_PER_MINUTE,
+        max_tokens_per_minute: float = DEFAULT_MAX_TOKENS_PER_MINUTE,
+        request_timeout: float = REQUEST_TIMEOUT
     ):
         """初始化总结生成器
         
@@ -156,11 +279,16 @@ class SummaryGenerator:
             cache: LRU 缓存实例（可选）
             api_key: OpenAI API 密钥（可选）
             model_selector: 模型选择器实例（可选）
+            max_requests_per_minute: 异步生成时每分钟最多发出的请求数
+            max_tokens_per_minute: 异步生成时每分钟最多消耗的 token 数（估计值）
+            request_timeout: 单个 API 请求的超时时间（秒）
         """
         self.cache = cache
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.request_timeout = request_timeout
         self.model_selector = model_selector or ModelSelector()
         self.key_generator = CacheKeyGenerator()
+        self.rate_limiter = RateLimiter(max_requests_per_minute, max_tokens_per_minute)
     
     def generate(
         self,
@@ -186,6 +314,122 @@ class SummaryGenerator:
             SummarizationError: 总结生成失败
             ValueError: 输入参数无效
         """
+        model, cache_key, cached_result = self._prepare(transcript, model, content_type)
+        if cached_result:
+            return cached_result
+        
+        try:
+            # 调用 OpenAI API 生成总结
+            summary = self._generate_with_openai(
+                transcript,
+                model,
+                max_length
+            )
+        except Exception as e:
+            logger.error("总结生成失败: %s", e)
+            raise SummarizationError(f"总结生成失败: {e}")
+        
+        return self._store(cache_key, summary)
+    
+    def generate_stream(
+        self,
+        transcript: str,
+        model: Optional[str] = None,
+        content_type: str = "general",
+        max_length: int = 500
+    ) -> Iterator[str]:
+        """流式生成总结
+        
+        与 generate 使用相同的模型选择和缓存，但以流式请求逐段返回总结内容，
+        调用方收到第一段即可开始处理，不必等待整个总结生成完毕。缓存命中时
+        一次返回完整总结；流结束后完整总结写入缓存。
+        
+        Args:
+            transcript: 转录文本
+            model: 使用的模型（如果为 None 则自动选择）
+            content_type: 内容类型
+            max_length: 总结最大长度（字符数）
+            
+        Yields:
+            总结的片段
+            
+        Raises:
+            SummarizationError: 总结生成失败
+            ValueError: 输入参数无效
+        """
+        model, cache_key, cached_result = self._prepare(transcript, model, content_type)
+        if cached_result:
+            yield cached_result
+            return
+        
+        parts = []
+        try:
+            for part in self._generate_with_openai_stream(transcript, model, max_length):
+                parts.append(part)
+                yield part
+        except SummarizationError:
+            raise
+        except Exception as e:
+            logger.error("总结生成失败: %s", e)
+            raise SummarizationError(f"总结生成失败: {e}")
+        
+        summary = "".join(parts).strip()
+        if not summary:
+            raise SummarizationError("OpenAI API 返回空总结")
+        self._store(cache_key, summary)
+    
+    async def agenerate(
+        self,
+        transcript: str,
+        model: Optional[str] = None,
+        content_type: str = "general",
+        max_length: int = 500
+    ) -> str:
+        """异步生成总结
+        
+        与 generate 行为一致，API 调用在事件循环中异步等待，不占用线程。
+        
+        Args:
+            transcript: 转录文本
+            model: 使用的模型（如果为 None 则自动选择）
+            content_type: 内容类型
+            max_length: 总结最大长度（字符数）
+            
+        Returns:
+            生成的总结
+            
+        Raises:
+            SummarizationError: 总结生成失败
+            ValueError: 输入参数无效
+        """
+        model, cache_key, cached_result = self._prepare(transcript, model, content_type)
+        if cached_result:
+            return cached_result
+        
+        # 发出请求前按估计的 token 数限流
+        await self.rate_limiter.acquire(estimate_tokens(transcript, max_length))
+        try:
+            summary = await self._agenerate_with_openai(transcript, model, max_length)
+        except Exception as e:
+            logger.error("总结生成失败: %s", e)
+            raise SummarizationError(f"总结生成失败: {e}")
+        
+        return self._store(cache_key, summary)
+    
+    def _prepare(
+        self,
+        transcript: str,
+        model: Optional[str],
+        content_type: str
+    ) -> Tuple[str, str, Optional[str]]:
+        """校验输入、选择模型并查询缓存
+        
+        Returns:
+            (模型名称, 缓存键, 缓存的总结或 None)
+            
+        Raises:
+            ValueError: 转录文本为空
+        """
         if not transcript or not transcript.strip():
             raise ValueError("转录文本不能为空")
         
@@ -196,36 +440,27 @@ class SummaryGenerator:
                 content_type=content_type
             )
         
-        logger.info(f"使用模型 {model} 生成总结")
+        logger.info("使用模型 %s 生成总结", model)
         
         # 生成缓存键 - 使用转录文本、模型和最大长度
         cache_key = self.key_generator.generate_summary_key(transcript, model)
         
         # 检查缓存
+        cached_result = None
         if self.cache is not None:
             cached_result = self.cache.get(cache_key)
             if cached_result:
-                logger.info(f"从缓存返回总结: {cached_result[:50]}...")
-                return cached_result
+                logger.info("从缓存返回总结: %.50s...", cached_result)
         
-        try:
-            # 调用 OpenAI API 生成总结
-            summary = self._generate_with_openai(
-                transcript,
-                model,
-                max_length
-            )
-            
-            # 缓存结果
-            if self.cache is not None:
-                self.cache.set(cache_key, summary)
-            
-            logger.info(f"成功生成总结，长度: {len(summary)}")
-            return summary
+        return model, cache_key, cached_result
+    
+    def _store(self, cache_key: str, summary: str) -> str:
+        """缓存生成的总结并返回"""
+        if self.cache is not None:
+            self.cache.set(cache_key, summary)
         
-        except Exception as e:
-            logger.error(f"总结生成失败: {e}")
-            raise SummarizationError(f"总结生成失败: {e}")
+        logger.info("成功生成总结，长度: %d", len(summary))
+        return summary
     
     def _generate_with_openai(
         self,
@@ -246,51 +481,121 @@ class SummaryGenerator:
         Raises:
             SummarizationError: 生成失败
         """
+        openai = self._openai()
         try:
-            # 尝试导入 openai
-            try:
-                import openai
-            except ImportError:
-                raise SummarizationError("openai 库未安装，请运行 pip install openai")
-            
-            # 设置 API 密钥
-            if not self.api_key:
-                raise SummarizationError("未设置 OPENAI_API_KEY 环境变量")
-            
-            openai.api_key = self.api_key
-            
-            # 构建提示词
-            prompt = self._build_prompt(transcript, max_length)
-            
-            # 调用 OpenAI API
             response = openai.ChatCompletion.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "你是一个专业的内容总结助手。请根据提供的转录文本生成简洁、准确的总结。"
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=max_length // 4,  # 粗略估计：1 个 token ≈ 4 个字符
+                **self._chat_request(transcript, model, max_length)
             )
+        except Exception as e:
+            raise SummarizationError(f"OpenAI API 调用失败: {str(e)}")
+        return self._extract_summary(response)
+    
+    def _generate_with_openai_stream(
+        self,
+        transcript: str,
+        model: str,
+        max_length: int
+    ) -> Iterator[str]:
+        """使用 OpenAI API 流式生成总结
+        
+        Args:
+            transcript: 转录文本
+            model: 模型名称
+            max_length: 总结最大长度
             
-            # 提取总结
-            summary = response.choices[0].message.content.strip()
+        Yields:
+            总结的片段（跳过不含内容的增量，如首个只带角色的增量）
+            
+        Raises:
+            SummarizationError: 生成失败
+        """
+        openai = self._openai()
+        try:
+            for chunk in openai.ChatCompletion.create(
+                stream=True, **self._chat_request(transcript, model, max_length)
+            ):
+                content = chunk.choices[0].delta.get("content")
+                if content:
+                    yield content
+        except Exception as e:
+            raise SummarizationError(f"OpenAI API 调用失败: {str(e)}")
+    
+    async def _agenerate_with_openai(
+        self,
+        transcript: str,
+        model: str,
+        max_length: int
+    ) -> str:
+        """使用 OpenAI API 异步生成总结
+        
+        Args:
+            transcript: 转录文本
+            model: 模型名称
+            max_length: 总结最大长度
             
-            if not summary:
-                raise SummarizationError("OpenAI API 返回空总结")
+        Returns:
+            生成的总结
             
-            return summary
+        Raises:
+            SummarizationError: 生成失败
+        """
+        openai = self._openai()
+        try:
+            response = await openai.ChatCompletion.acreate(
+                **self._chat_request(transcript, model, max_length)
+            )
+        except Exception as e:
+            raise SummarizationError(f"OpenAI API 调用失败: {str(e)}")
+        return self._extract_summary(response)
+    
+    def _openai(self):
+        """导入 openai 并检查 API 密钥
         
-        except SummarizationError:
-            raise
+        密钥随每个请求传入，不写入 openai 模块的全局配置。
+        
+        Raises:
+            SummarizationError: openai 未安装或未设置 API 密钥
+        """
+        try:
+            import openai
+        except ImportError:
+            raise SummarizationError("openai 库未安装，请运行 pip install openai")
+        
+        if not self.api_key:
+            raise SummarizationError("未设置 OPENAI_API_KEY 环境变量")
+        
+        return openai
+    
+    def _chat_request(self, transcript: str, model: str, max_length: int) -> Dict[str, Any]:
+        """构建 ChatCompletion 请求参数"""
+        return {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": self._build_prompt(transcript, max_length)},
+            ],
+            "temperature": 0.7,
+            "max_tokens": max_length // 4,  # 粗略估计：1 个 token ≈ 4 个字符
+            "api_key": self.api_key,
+            "request_timeout": self.request_timeout,
+        }
+    
+    @staticmethod
+    def _extract_summary(response: Any) -> str:
+        """从 API 响应中提取总结
+        
+        Raises:
+            SummarizationError: 响应格式异常或总结为空
+        """
+        try:
+            summary = response.choices[0].message.content.strip()
         except Exception as e:
             raise SummarizationError(f"OpenAI API 调用失败: {str(e)}")
+        
+        if not summary:
+            raise SummarizationError("OpenAI API 返回空总结")
+        
+        return summary
     
     def _build_prompt(self, transcript: str, max_length: int) -> str:
         """构建提示词
@@ -302,16 +607,184 @@ class SummaryGenerator:
         Returns:
             提示词
         """
-        return f"""请根据以下转录文本生成一个总结。总结应该：
+        # 头部只在 max_length 变化时重新格式化，转录文本只复制一次
+        return "".join((_prompt_header(max_length), transcript, _PROMPT_FOOTER))
+    
+    def _build_batched_prompt(self, transcripts: List[str], max_length: int) -> str:
+        """构建合并多段转录文本的提示词，要求以 JSON 对象按编号返回各段总结
+        
+        Args:
+            transcripts: 转录文本列表
+            max_length: 每段总结最大长度
+            
+        Returns:
+            提示词
+        """
+        sections = "\n\n".join(
+            f"转录文本 {i}：\n{transcript}" for i, transcript in enumerate(transcripts, 1)
+        )
+        return f"""请分别为以下 {len(transcripts)} 段转录文本各生成一个总结。每个总结应该：
 1. 简洁明了，最多 {max_length} 个字符
 2. 保留关键信息和主要观点
 3. 使用清晰的语言
 4. 避免冗余和重复
 
-转录文本：
-{transcript}
+只返回一个 JSON 对象：键为转录文本编号（"1"、"2"……），值为对应的总结。
 
-请生成总结："""
+{sections}"""
+    
+    def generate_batched(
+        self,
+        transcripts: List[str],
+        model: Optional[str] = None,
+        max_length: int = 500,
+        batch_size: int = BATCH_SIZE
+    ) -> List[Optional[str]]:
+        """批量生成总结，每 batch_size 段转录文本只发一次请求
+        
+        先查缓存，未命中的转录文本按 batch_size 和模型上下文窗口分组，每组合并为一个要求
+        JSON 输出的请求，再按编号拆分回各项。回复无法解析或缺少某项时，
+        对应项单独请求生成，沿用已算出的缓存键。
+        
+        Args:
+            transcripts: 转录文本列表
+            model: 使用的模型（如果为 None 则为每项自动选择，同一模型的项合并请求）
+            max_length: 每段总结最大长度（字符数）
+            batch_size: 单个请求合并的转录文本数
+            
+        Returns:
+            与 transcripts 顺序一致的总结列表，失败的项为 None
+            
+        Raises:
+            ValueError: batch_size 不大于 0
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size 必须大于 0")
+        
+        results: List[Optional[str]] = [None] * len(transcripts)
+        
+        # 按与 generate 相同的规则为每项选择模型，缓存命中的直接返回，空文本保持 None；
+        # 未命中的按模型分组
+        # 每项的 token 数和缓存键只计算一次：token 数供选择模型和分组共用，
+        # 缓存键供查询和写入（包括逐条生成的回退）共用
+        misses: Dict[str, List[Tuple[int, int]]] = {}
+        keys: List[Optional[str]] = [None] * len(transcripts)
+        for i, transcript in enumerate(transcripts):
+            if not transcript or not transcript.strip():
+                continue
+            tokens = count_tokens(transcript)
+            item_model = model or self.model_selector.select_model(transcript, token_count=tokens)
+            keys[i] = self.key_generator.generate_summary_key(transcript, item_model)
+            if self.cache is not None:
+                cached = self.cache.get(keys[i])
+                if cached:
+                    results[i] = cached
+                    continue
+            misses.setdefault(item_model, []).append((i, tokens))
+        
+        for item_model, items in misses.items():
+            for chunk in self._split_batches(items, item_model, max_length, batch_size):
+                chunk_transcripts = [transcripts[i] for i in chunk]
+                summaries = self._generate_batch_with_openai(chunk_transcripts, item_model, max_length)
+                
+                for i, transcript, summary in zip(chunk, chunk_transcripts, summaries):
+                    if not summary:
+                        # 合并请求未给出该项，单独生成（已确认缓存未命中，不再经过 generate 重新查询）
+                        self.rate_limiter.acquire_sync(estimate_tokens(transcript, max_length))
+                        try:
+                            summary = self._generate_with_openai(transcript, item_model, max_length)
+                        except Exception as e:
+                            logger.error("生成总结失败: %s", e)
+                            continue
+                    results[i] = self._store(keys[i], summary)
+        
+        return results
+    
+    def _split_batches(
+        self,
+        items: List[Tuple[int, int]],
+        model: str,
+        max_length: int,
+        batch_size: int
+    ) -> Iterator[List[int]]:
+        """按条数和模型上下文窗口把待生成的项分组
+        
+        每组最多 batch_size 项，且各项转录文本的 token 数加上预计输出和
+        预留的总和不超过模型的上下文窗口（不在 ModelSelector.MODELS 中的模型
+        按最小的已知窗口计算）；单项已超出时单独成组。
+        
+        Args:
+            items: 待生成项的 (在 transcripts 中的下标, 转录 token 数)
+            model: 模型名称
+            max_length: 每段总结最大长度
+            batch_size: 单个请求合并的转录文本数
+            
+        Yields:
+            每组项的下标列表
+        """
+        context = ModelSelector._MAX_TOKENS.get(model, ModelSelector._MIN_CONTEXT)
+        budget = context - ModelSelector.SAFETY_TOKENS
+        chunk: List[int] = []
+        used = 0
+        for i, tokens in items:
+            tokens += max_length // 4
+            if chunk and (len(chunk) >= batch_size or used + tokens > budget):
+                yield chunk
+                chunk, used = [], 0
+            chunk.append(i)
+            used += tokens
+        if chunk:
+            yield chunk
+    
+    def _generate_batch_with_openai(
+        self,
+        transcripts: List[str],
+        model: str,
+        max_length: int
+    ) -> List[Optional[str]]:
+        """一次请求生成多段转录文本的总结
+        
+        Args:
+            transcripts: 转录文本列表
+            model: 模型名称
+            max_length: 每段总结最大长度
+            
+        Returns:
+            与 transcripts 顺序一致的总结列表；请求失败或回复无法解析时全部为 None，
+            回复中缺少的项为 None
+        """
+        prompt = self._build_batched_prompt(transcripts, max_length)
+        kwargs: Dict[str, Any] = {}
+        if model in JSON_MODE_MODELS:
+            kwargs["response_format"] = {"type": "json_object"}
+        
+        self.rate_limiter.acquire_sync(estimate_tokens(prompt, max_length * len(transcripts)))
+        try:
+            openai = self._openai()
+            response = openai.ChatCompletion.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": _SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0.7,
+                max_tokens=(max_length // 4) * len(transcripts),
+                api_key=self.api_key,
+                request_timeout=self.request_timeout,
+                **kwargs,
+            )
+            data = _parse_json_object(response.choices[0].message.content)
+            if not isinstance(data, dict):
+                raise ValueError("回复不是 JSON 对象")
+        except Exception as e:
+            logger.warning("合并请求失败，逐条生成: %s", e)
+            return [None] * len(transcripts)
+        
+        summaries: List[Optional[str]] = []
+        for i in range(1, len(transcripts) + 1):
+            summary = data.get(str(i))
+            summaries.append(summary.strip() or None if isinstance(summary, str) else None)
+        return summaries
     
     def is_cached(self, transcript: str, model: str) -> bool:
         """检查总结是否已缓存
@@ -357,53 +830,112 @@ class SummaryGenerator:
         
         cache_key = self.key_generator.generate_summary_key(transcript, model)
         self.cache.delete(cache_key)
-        logger.info(f"已删除缓存的总结")
+        logger.info("已删除缓存的总结")
     
     def generate_concurrent(
         self,
         transcripts: List[str],
         models: Optional[List[str]] = None,
-        thread_pool=None
-    ) -> Dict[str, str]:
+        thread_pool=None,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+        fail_fast: bool = False,
+        deadline: Optional[float] = None
+    ) -> List[Optional[str]]:
         """并发生成多个转录文本的总结
         
+        agenerate_concurrent 的同步包装，在新的事件循环中运行；
+        不能在已运行的事件循环中调用，此时请直接 await agenerate_concurrent。
+        
         Args:
             transcripts: 转录文本列表
             models: 模型列表（如果为 None 则自动选择）
-            thread_pool: 线程池实例（可选）
+            thread_pool: 已不再使用，仅为兼容保留；API 调用是 I/O 密集型，改由事件循环并发
+            max_concurrency: 同时进行的 API 请求数上限
+            fail_fast: 为 True 时任一项失败即取消其余请求
+            deadline: 整批的最长等待时间（秒），到时仍未完成的请求被取消
         
         Returns:
-            转录文本到总结的映射字典
+            与 transcripts 按下标对应的总结列表，失败或被取消的项为 None
         """
-        results = {}
+        return asyncio.run(
+            self.agenerate_concurrent(
+                transcripts,
+                models,
+                max_concurrency=max_concurrency,
+                fail_fast=fail_fast,
+                deadline=deadline,
+            )
+        )
+    
+    async def agenerate_concurrent(
+        self,
+        transcripts: List[str],
+        models: Optional[List[str]] = None,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+        fail_fast: bool = False,
+        deadline: Optional[float] = None
+    ) -> List[Optional[str]]:
+        """异步并发生成多个转录文本的总结
+        
+        所有请求在同一事件循环中发出，由信号量限制同时进行的请求数。
+        相同的（转录文本, 模型）只发出一次请求，结果按下标分发给所有重复项。
+        fail_fast 适合一项失败即整批无效的场景（如 API 密钥失效），
+        第一个失败出现后不再等待其余请求。deadline 限制整批的等待时间，
+        单个请求另受 request_timeout 限制。
+        
+        Args:
+            transcripts: 转录文本列表
+            models: 模型列表（如果为 None 则自动选择）
+            max_concurrency: 同时进行的 API 请求数上限
+            fail_fast: 为 True 时任一项失败即取消其余请求
+            deadline: 整批的最长等待时间（秒），到时仍未完成的请求被取消
         
+        Returns:
+            与 transcripts 按下标对应的总结列表，失败或被取消的项为 None
+        """
         if models is None:
             models = [None] * len(transcripts)
         
-        if thread_pool is None:
-            # 如果没有提供线程池，直接顺序生成
-            for transcript, model in zip(transcripts, models):
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(transcript: str, model: Optional[str]) -> Optional[str]:
+            async with semaphore:
                 try:
-                    summary = self.generate(transcript, model=model)
-                    results[transcript[:50]] = summary
+                    return await self.agenerate(transcript, model=model)
                 except Exception as e:
-                    logger.error(f"生成总结失败: {e}")
-                    results[transcript[:50]] = None
-        else:
-            # 使用线程池并发生成
-            futures = {}
-            for i, (transcript, model) in enumerate(zip(transcripts, models)):
-                task_id = f"summarize_{i}"
-                future = thread_pool.submit(task_id, self.generate, transcript, model)
-                futures[i] = (transcript, future)
+                    logger.error("生成总结失败: %s", e)
+                    if fail_fast:
+                        raise
+                    return None
+        
+        # 每个下标对应的去重后请求序号
+        unique: Dict[Tuple[str, Optional[str]], int] = {}
+        mapping = [unique.setdefault(item, len(unique)) for item in zip(transcripts, models)]
+        
+        # 整批请求共用一个连接池，不再为每个请求重新建立 TLS 连接
+        async with shared_openai_session(max_concurrency):
+            if not fail_fast and deadline is None:
+                summaries = await asyncio.gather(
+                    *(run(transcript, model) for transcript, model in unique)
+                )
+                return [summaries[j] for j in mapping]
             
-            # 收集结果
-            for i, (transcript, future) in futures.items():
-                try:
-                    summary = thread_pool.get_result(f"summarize_{i}")
-                    results[transcript[:50]] = summary
-                except Exception as e:
-                    logger.error(f"生成总结失败: {e}")
-                    results[transcript[:50]] = None
+            tasks = [asyncio.ensure_future(run(transcript, model)) for transcript, model in unique]
+            if not tasks:
+                return []
+            done, pending = await asyncio.wait(
+                tasks,
+                timeout=deadline,
+                return_when=asyncio.FIRST_EXCEPTION if fail_fast else asyncio.ALL_COMPLETED,
+            )
+            for task in pending:
+                task.cancel()
+            if pending:
+                logger.warning("总结生成失败或超时，已取消其余 %d 个请求", len(pending))
+                await asyncio.wait(pending)
         
-        return results
+        summaries = [
+            task.result() if task in done and task.exception() is None else None
+            for task in tasks
+        ]
+        return [summaries[j] for j in mapping]
@@ -0,0 +1,219 @@
+"""
+任务元数据表 - 按列存储的有界任务状态表
+"""
+import math
+from array import array
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Dict, Any, List
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# 状态码（0 表示空槽位）
+STATUS_PROCESSING = 1
+STATUS_COMPLETED = 2
+STATUS_FAILED = 3
+
+# 状态码到对外状态名称的映射，按状态码索引
+_STATUS_NAMES = (None, "processing", "completed", "failed")
+
+_UNSET = math.nan
+
+
+class TaskTable:
+    """
+    任务元数据表
+    
+    时间戳和状态码分别存放在连续的 array 中，按槽位下标访问；
+    URL、错误信息等对象字段存放在并行列表中。task_id 到槽位的映射按
+    最近使用顺序维护，表满时回收最久未使用的槽位，内存占用以 capacity 为上限。
+    
+    特性：
+    - 列式存储，状态变更只是一次下标赋值
+    - 容量有界，LRU 回收槽位
+    - 线程安全
+    """
+    
+    def __init__(self, capacity: int = 1000):
+        """
+        初始化任务元数据表
+        
+        Args:
+            capacity: 最多保留的任务数
+        
+        Raises:
+            ValueError: 如果 capacity 不大于 0
+        """
+        if capacity <= 0:
+            raise ValueError("capacity 必须大于 0")
+        
+        self.capacity = capacity
+        self.start_time = array('d', [_UNSET]) * capacity
+        self.end_time = array('d', [_UNSET]) * capacity
+        self.status = array('b', [0]) * capacity
+        self.video_url: List[Optional[str]] = [None] * capacity
+        self.error: List[Optional[str]] = [None] * capacity
+        self.extra: List[Optional[Dict[str, Any]]] = [None] * capacity
+        
+        self._slots: "OrderedDict[str, int]" = OrderedDict()
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+        self._lock = Lock()
+    
+    def add(self, task_id: str, video_url: Optional[str], start_time: float, **extra: Any) -> int:
+        """
+        登记任务（已存在时覆盖原有记录）
+        
+        Args:
+            task_id: 任务 ID
+            video_url: 视频 URL
+            start_time: 开始时间
+            **extra: 附加字段
+        
+        Returns:
+            任务所在槽位
+        """
+        with self._lock:
+            slot = self._slots.pop(task_id, None)
+            if slot is None:
+                slot = self._allocate()
+            self._slots[task_id] = slot
+            
+            self.start_time[slot] = start_time
+            self.end_time[slot] = _UNSET
+            self.status[slot] = STATUS_PROCESSING
+            self.video_url[slot] = video_url
+            self.error[slot] = None
+            self.extra[slot] = extra or None
+            return slot
+    
+    def _allocate(self) -> int:
+        """分配槽位，无空闲槽位时回收最久未使用的任务（调用方持有锁）"""
+        if self._free:
+            return self._free.pop()
+        
+        evicted_id, slot = self._slots.popitem(last=False)
+        logger.debug("任务元数据表已满，回收任务: %s", evicted_id)
+        return slot
+    
+    def mark_completed(self, task_id: str, end_time: float) -> bool:
+        """
+        标记任务完成
+        
+        Args:
+            task_id: 任务 ID
+            end_time: 结束时间
+        
+        Returns:
+            任务是否存在
+        """
+        with self._lock:
+            slot = self._slots.get(task_id)
+            if slot is None:
+                return False
+            self.status[slot] = STATUS_COMPLETED
+            self.end_time[slot] = end_time
+            return True
+    
+    def mark_failed(self, task_id: str, error: str) -> bool:
+        """
+        标记任务失败
+        
+        Args:
+            task_id: 任务 ID
+            error: 错误信息
+        
+        Returns:
+            任务是否存在
+        """
+        with self._lock:
+            slot = self._slots.get(task_id)
+            if slot is None:
+                return False
+            self.status[slot] = STATUS_FAILED
+            self.error[slot] = error
+            return True
+    
+    def set_extra(self, task_id: str, key: str, value: Any) -> bool:
+        """
+        设置任务的附加字段
+        
+        Args:
+            task_id: 任务 ID
+            key: 字段名
+            value: 字段值
+        
+        Returns:
+            任务是否存在
+        """
+        with self._lock:
+            slot = self._slots.get(task_id)
+            if slot is None:
+                return False
+            extra = self.extra[slot]
+            if extra is None:
+                extra = self.extra[slot] = {}
+            extra[key] = value
+            return True
+    
+    def set_extra_item(self, task_id: str, key: str, item: str, value: Any) -> bool:
+        """
+        设置字典型附加字段中的一项（字段不存在时创建）
+        
+        Args:
+            task_id: 任务 ID
+            key: 字段名
+            item: 字段内的键
+            value: 值
+        
+        Returns:
+            任务是否存在
+        """
+        with self._lock:
+            slot = self._slots.get(task_id)
+            if slot is None:
+                return False
+            extra = self.extra[slot]
+            if extra is None:
+                extra = self.extra[slot] = {}
+            extra.setdefault(key, {})[item] = value
+            return True
+    
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        获取任务元数据（按需从各列组装字典）
+        
+        Args:
+            task_id: 任务 ID
+        
+        Returns:
+            元数据字典，任务不存在时返回 None；未设置的时间字段不出现在字典中
+        """
+        with self._lock:
+            slot = self._slots.get(task_id)
+            if slot is None:
+                return None
+            self._slots.move_to_end(task_id)
+            
+            metadata: Dict[str, Any] = {
+                "video_url": self.video_url[slot],
+                "status": _STATUS_NAMES[self.status[slot]],
+            }
+            start_time = self.start_time[slot]
+            if start_time == start_time:  # 非 NaN
+                metadata["start_time"] = start_time
+            end_time = self.end_time[slot]
+            if end_time == end_time:
+                metadata["end_time"] = end_time
+            if self.error[slot] is not None:
+                metadata["error"] = self.error[slot]
+            if self.extra[slot]:
+                metadata.update(self.extra[slot])
+            return metadata
+    
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._slots
+    
+    def __len__(self) -> int:
+        return len(self._slots)
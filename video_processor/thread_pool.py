@@ -1,7 +1,8 @@
 """
 线程池管理系统
 """
-from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, Future, as_completed, wait
 from typing import Callable, Any, Optional, Dict, List
 from threading import Lock
 import time
@@ -12,6 +13,16 @@ from .config import THREAD_POOL_SIZE, THREAD_POOL_TIMEOUT
 
 logger = get_logger(__name__)
 
+# 计数事件，按值索引计数列表
+_SUBMITTED = 0
+_COMPLETED = 1
+_FAILED = 2
+_CANCELLED = 3
+_STARTED = 4
+
+# 默认最多保留的已结束任务 Future 数
+MAX_RETAINED_FUTURES = 10000
+
 
 class ThreadPool:
     """
@@ -22,25 +33,114 @@ class ThreadPool:
     - 任务提交和监控
     - 优雅关闭
     - 线程安全
+    
+    任务映射的读写不加锁（单键读写在 GIL 下原子）。提交、开始、完成、失败和
+    取消以事件形式追加到 deque，读取计数时才一次性汇总，提交路径上没有锁；
+    运行中和排队中的任务数由这些计数推出，统计不再遍历 Future。
+    完成和失败事件由工作线程在任务函数返回后、Future 置为完成之前记录，
+    因此等待 Future 返回后读到的计数已包含该任务。
+    
+    get_result 成功取回结果后即释放对应的 Future；未被取回的已结束任务按结束
+    顺序最多保留 max_retained 个，超出时丢弃最早结束的，映射的内存占用不随
+    累计提交数增长。未结束的任务始终保留。
     """
     
-    def __init__(self, max_workers: Optional[int] = None, timeout: int = THREAD_POOL_TIMEOUT):
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        timeout: int = THREAD_POOL_TIMEOUT,
+        max_retained: int = MAX_RETAINED_FUTURES,
+    ):
         """
         初始化线程池
         
         Args:
             max_workers: 最大工作线程数，None 表示使用 CPU 核心数
             timeout: 线程超时时间（秒）
+            max_retained: 最多保留的已结束、未取回结果的任务数
+        
+        Raises:
+            ValueError: 如果 max_retained 不大于 0
         """
+        if max_retained <= 0:
+            raise ValueError("max_retained 必须大于 0")
+        
         self.max_workers = max_workers or THREAD_POOL_SIZE
         self.timeout = timeout
+        self.max_retained = max_retained
         self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
         self.futures: Dict[str, Future] = {}
-        self.lock = Lock()
-        self.submitted_count = 0
-        self.completed_count = 0
-        self.failed_count = 0
         self.is_shutdown = False
+        
+        # 已结束任务的 ID，按结束顺序排列；单次 OrderedDict 操作在 GIL 下原子
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        
+        # 计数事件，append/popleft 线程安全
+        self._events: deque = deque()
+        self._stats_lock = Lock()  # 仅在汇总计数事件时使用
+        self._counts = [0, 0, 0, 0, 0]  # 按事件值索引
+    
+    def _run(self, func: Callable, args: tuple, kwargs: dict) -> Any:
+        """在工作线程中执行任务并记录开始、完成或失败事件"""
+        self._events.append(_STARTED)
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            self._events.append(_FAILED)
+            raise
+        self._events.append(_COMPLETED)
+        return result
+    
+    def _on_done(self, task_id: str, future: Future) -> None:
+        """Future 结束回调：登记结束顺序，超出保留上限时丢弃最早结束的任务"""
+        if self.futures.get(task_id) is not future:
+            return  # 已被取回，或同一 ID 已重新提交
+        
+        finished = self._finished
+        finished[task_id] = None
+        while len(finished) > self.max_retained:
+            try:
+                old_id, _ = finished.popitem(last=False)
+            except KeyError:
+                return
+            old = self.futures.get(old_id)
+            if old is not None and old.done():
+                self.futures.pop(old_id, None)
+    
+    def _drain_events(self) -> List[int]:
+        """
+        汇总积压的计数事件（调用方持有 _stats_lock）
+        
+        Returns:
+            按事件值索引的累计计数
+        """
+        counts = self._counts
+        pop = self._events.popleft
+        while True:
+            try:
+                counts[pop()] += 1
+            except IndexError:
+                return counts
+    
+    def _count(self, event: int) -> int:
+        """读取某类事件的累计计数"""
+        with self._stats_lock:
+            return self._drain_events()[event]
+    
+    @property
+    def submitted_count(self) -> int:
+        """累计提交的任务数"""
+        return self._count(_SUBMITTED)
+    
+    @property
+    def completed_count(self) -> int:
+        """累计成功完成的任务数"""
+        return self._count(_COMPLETED)
+    
+    @property
+    def failed_count(self) -> int:
+        """累计执行失败（抛出异常）的任务数"""
+        return self._count(_FAILED)
     
     def submit(self, task_id: str, func: Callable, *args, **kwargs) -> Optional[Future]:
         """
@@ -62,13 +162,14 @@ class ThreadPool:
             raise ThreadPoolError("线程池已关闭")
         
         try:
-            future = self.executor.submit(func, *args, **kwargs)
+            future = self.executor.submit(self._run, func, args, kwargs)
             
-            with self.lock:
-                self.futures[task_id] = future
-                self.submitted_count += 1
+            self._finished.pop(task_id, None)
+            self.futures[task_id] = future
+            self._events.append(_SUBMITTED)
+            future.add_done_callback(lambda f: self._on_done(task_id, f))
             
-            logger.info(f"任务提交到线程池: {task_id}")
+            logger.info("任务提交到线程池: %s", task_id)
             return future
         except Exception as e:
             raise ThreadPoolError(f"任务提交失败: {str(e)}")
@@ -81,22 +182,25 @@ class ThreadPool:
             task_id: 任务 ID
             timeout: 超时时间（秒）
         
+        成功取回后释放该任务的 Future，之后再次获取视为任务不存在。
+        
         Returns:
             任务结果，如果任务不存在或超时则返回 None
         """
-        with self.lock:
-            if task_id not in self.futures:
-                logger.warning(f"任务不存在: {task_id}")
-                return None
-            
-            future = self.futures[task_id]
+        future = self.futures.get(task_id)
+        if future is None:
+            logger.warning("任务不存在: %s", task_id)
+            return None
         
         try:
             result = future.result(timeout=timeout or self.timeout)
-            logger.info(f"任务完成: {task_id}")
+            if self.futures.get(task_id) is future:
+                self.futures.pop(task_id, None)
+            self._finished.pop(task_id, None)
+            logger.info("任务完成: %s", task_id)
             return result
         except Exception as e:
-            logger.error(f"获取任务结果失败: {task_id}, 错误: {str(e)}")
+            logger.error("获取任务结果失败: %s, 错误: %s", task_id, e)
             return None
     
     def is_done(self, task_id: str) -> bool:
@@ -109,10 +213,8 @@ class ThreadPool:
         Returns:
             是否完成
         """
-        with self.lock:
-            if task_id not in self.futures:
-                return False
-            return self.futures[task_id].done()
+        future = self.futures.get(task_id)
+        return future is not None and future.done()
     
     def cancel(self, task_id: str) -> bool:
         """
@@ -124,56 +226,91 @@ class ThreadPool:
         Returns:
             是否成功取消
         """
-        with self.lock:
-            if task_id not in self.futures:
-                return False
-            
-            future = self.futures[task_id]
-            cancelled = future.cancel()
-            
-            if cancelled:
-                logger.info(f"任务已取消: {task_id}")
-            
-            return cancelled
+        future = self.futures.get(task_id)
+        if future is None:
+            return False
+        
+        cancelled = future.cancel()
+        
+        if cancelled:
+            self._events.append(_CANCELLED)
+            logger.info("任务已取消: %s", task_id)
+        
+        return cancelled
     
-    def wait_all(self, timeout: Optional[float] = None) -> bool:
+    def wait_all(self, timeout: Optional[float] = None, fail_fast: bool = False) -> bool:
         """
         等待所有任务完成
         
         Args:
             timeout: 超时时间（秒）
+            fail_fast: 为 True 时任一任务失败即取消尚未开始的任务并返回
         
         Returns:
-            是否所有任务都完成
+            是否所有任务都完成；fail_fast 下有任务失败时返回 False
         """
-        with self.lock:
-            futures = list(self.futures.values())
+        if fail_fast:
+            return self._wait_fail_fast(timeout)
+        
+        futures = list(self.futures.values())
         
         try:
+            # 完成和失败计数由工作线程记录，这里只报告失败
             for future in as_completed(futures, timeout=timeout):
-                try:
-                    future.result()
-                    self.completed_count += 1
-                except Exception as e:
-                    logger.error(f"任务执行失败: {str(e)}")
-                    self.failed_count += 1
+                if not future.cancelled() and future.exception() is not None:
+                    logger.error("任务执行失败: %s", future.exception())
             
             return True
         except Exception as e:
-            logger.error(f"等待任务超时: {str(e)}")
+            logger.error("等待任务超时: %s", e)
+            return False
+    
+    def _wait_fail_fast(self, timeout: Optional[float]) -> bool:
+        """
+        等待所有任务完成，出现第一个失败即取消其余任务
+        
+        已开始的任务无法中断，只有排队中的任务会被取消。
+        
+        Args:
+            timeout: 超时时间（秒）
+        
+        Returns:
+            是否所有任务都成功完成
+        """
+        futures = list(self.futures.values())
+        done, not_done = wait(futures, timeout=timeout, return_when=FIRST_EXCEPTION)
+        
+        failed = [
+            future for future in done
+            if not future.cancelled() and future.exception() is not None
+        ]
+        if failed:
+            logger.error("任务执行失败: %s", failed[0].exception())
+            cancelled = 0
+            for future in not_done:
+                if future.cancel():
+                    self._events.append(_CANCELLED)
+                    cancelled += 1
+            logger.warning("已取消 %d 个未开始的任务", cancelled)
+            return False
+        
+        if not_done:
+            logger.error("等待任务超时: %d 个任务未完成", len(not_done))
             return False
+        return True
     
     def get_active_count(self) -> int:
         """获取活跃线程数"""
-        with self.lock:
-            active = sum(1 for future in self.futures.values() if not future.done())
-            return active
+        with self._stats_lock:
+            counts = self._drain_events()
+            return counts[_SUBMITTED] - counts[_COMPLETED] - counts[_FAILED] - counts[_CANCELLED]
     
     def get_pending_count(self) -> int:
         """获取待处理任务数"""
-        with self.lock:
-            pending = sum(1 for future in self.futures.values() if not future.running() and not future.done())
-            return pending
+        with self._stats_lock:
+            counts = self._drain_events()
+            # 只有尚未开始的任务可以被取消
+            return counts[_SUBMITTED] - counts[_STARTED] - counts[_CANCELLED]
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -182,25 +319,21 @@ class ThreadPool:
         Returns:
             统计信息字典
         """
-        with self.lock:
-            total_tasks = len(self.futures)
-            active_tasks = sum(1 for future in self.futures.values() if future.running())
-            pending_tasks = sum(1 for future in self.futures.values() if not future.running() and not future.done())
-            completed_tasks = sum(1 for future in self.futures.values() if future.done() and not future.cancelled())
-            cancelled_tasks = sum(1 for future in self.futures.values() if future.cancelled())
-            
-            return {
-                "max_workers": self.max_workers,
-                "total_tasks": total_tasks,
-                "active_tasks": active_tasks,
-                "pending_tasks": pending_tasks,
-                "completed_tasks": completed_tasks,
-                "cancelled_tasks": cancelled_tasks,
-                "submitted_count": self.submitted_count,
-                "completed_count": self.completed_count,
-                "failed_count": self.failed_count,
-                "is_shutdown": self.is_shutdown,
-            }
+        with self._stats_lock:
+            submitted, completed, failed, cancelled, started = self._drain_events()
+        
+        return {
+            "max_workers": self.max_workers,
+            "total_tasks": len(self.futures),
+            "active_tasks": started - completed - failed,
+            "pending_tasks": submitted - started - cancelled,
+            "completed_tasks": completed + failed,
+            "cancelled_tasks": cancelled,
+            "submitted_count": submitted,
+            "completed_count": completed,
+            "failed_count": failed,
+            "is_shutdown": self.is_shutdown,
+        }
     
     def shutdown(self, wait: bool = True) -> None:
         """
@@ -218,7 +351,7 @@ class ThreadPool:
             self.is_shutdown = True
             logger.info("线程池已关闭")
         except Exception as e:
-            logger.error(f"关闭线程池失败: {str(e)}")
+            logger.error("关闭线程池失败: %s", e)
     
     def __enter__(self):
         """上下文管理器入口"""
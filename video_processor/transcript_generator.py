@@ -3,17 +3,26 @@
 
 从音频文件生成转录文本，支持多种语言和并发处理。
 """
+import asyncio
 import os
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Any, Optional, Dict, Tuple
 import hashlib
 
 from video_processor.exceptions import TranscriptionError
 from video_processor.cache import LRUCache, CacheKeyGenerator
+from video_processor.http_session import shared_openai_session
 from video_processor.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 异步并发转录时同时进行的 API 请求数上限
+MAX_CONCURRENT_REQUESTS = 10
+
+# 异步转录直接上传音频的接口路径（拼接在 openai.api_base 之后）与超时时间（秒）
+TRANSCRIPTIONS_PATH = "/audio/transcriptions"
+WHISPER_TIMEOUT = 300
+
 
 class TranscriptGenerator:
     """转录生成器类
@@ -55,36 +64,88 @@ class TranscriptGenerator:
             TranscriptionError: 转录失败
             FileNotFoundError: 音频文件不存在
         """
+        audio_path_obj, cache_key, cached_result = self._prepare(audio_path)
+        if cached_result:
+            return cached_result
+        
+        try:
+            # 调用 Whisper API 生成转录
+            transcript = self._transcribe_with_whisper(str(audio_path_obj), language)
+        except Exception as e:
+            logger.error(f"转录生成失败: {e}")
+            raise TranscriptionError(f"转录生成失败: {e}")
+        
+        return self._store(cache_key, transcript)
+    
+    async def agenerate(self, audio_path: str, language: str = "auto") -> str:
+        """异步生成转录文本
+        
+        与 generate 行为一致，API 调用在事件循环中异步等待，不占用线程。
+        
+        Args:
+            audio_path: 音频文件路径
+            language: 语言代码（默认 "auto" 自动检测）
+            
+        Returns:
+            转录文本
+            
+        Raises:
+            TranscriptionError: 转录失败
+            FileNotFoundError: 音频文件不存在
+        """
+        audio_path_obj, cache_key, cached_result = self._prepare(audio_path)
+        if cached_result:
+            return cached_result
+        
+        try:
+            transcript = await self._atranscribe_with_whisper(str(audio_path_obj), language)
+        except Exception as e:
+            logger.error(f"转录生成失败: {e}")
+            raise TranscriptionError(f"转录生成失败: {e}")
+        
+        return self._store(cache_key, transcript)
+    
+    def _prepare(self, audio_path: str) -> Tuple[Path, str, Optional[str]]:
+        """检查音频文件并查询缓存
+        
+        指纹键每次调用只计算一次，查询缓存和写入缓存共用。
+        
+        Returns:
+            (音频路径, 缓存键, 缓存的转录文本或 None)
+            
+        Raises:
+            FileNotFoundError: 音频文件不存在
+            TranscriptionError: 音频文件无法读取
+        """
         audio_path_obj = Path(audio_path)
         
         if not audio_path_obj.exists():
             logger.error(f"音频文件不存在: {audio_path_obj}")
             raise FileNotFoundError(f"音频文件不存在: {audio_path_obj}")
         
-        # 生成缓存键 - 使用原始音频路径和语言
-        cache_key = self.key_generator.generate_transcript_key(audio_path)
+        # 生成缓存键 - 使用音频文件的内容指纹
+        try:
+            cache_key = self.key_generator.generate_transcript_fingerprint_key(audio_path_obj)
+        except OSError as e:
+            logger.error(f"无法读取音频文件: {e}")
+            raise TranscriptionError(f"无法读取音频文件: {e}")
         
         # 检查缓存
+        cached_result = None
         if self.cache is not None:
             cached_result = self.cache.get(cache_key)
             if cached_result:
                 logger.info(f"从缓存返回转录文本: {cached_result[:50]}...")
-                return cached_result
         
-        try:
-            # 调用 Whisper API 生成转录
-            transcript = self._transcribe_with_whisper(str(audio_path_obj), language)
-            
-            # 缓存结果
-            if self.cache is not None:
-                self.cache.set(cache_key, transcript)
-            
-            logger.info(f"成功生成转录文本，长度: {len(transcript)}")
-            return transcript
+        return audio_path_obj, cache_key, cached_result
+    
+    def _store(self, cache_key: str, transcript: str) -> str:
+        """缓存生成的转录文本并返回"""
+        if self.cache is not None:
+            self.cache.set(cache_key, transcript)
         
-        except Exception as e:
-            logger.error(f"转录生成失败: {e}")
-            raise TranscriptionError(f"转录生成失败: {e}")
+        logger.info(f"成功生成转录文本，长度: {len(transcript)}")
+        return transcript
     
     def _transcribe_with_whisper(self, audio_path: str, language: str = "auto") -> str:
         """使用 Whisper API 生成转录
@@ -99,42 +160,149 @@ class TranscriptGenerator:
         Raises:
             TranscriptionError: 转录失败
         """
+        openai = self._openai()
         try:
-            # 尝试导入 openai
-            try:
-                import openai
-            except ImportError:
-                raise TranscriptionError("openai 库未安装，请运行 pip install openai")
-            
-            # 设置 API 密钥
-            if not self.api_key:
-                raise TranscriptionError("未设置 OPENAI_API_KEY 环境变量")
-            
-            openai.api_key = self.api_key
-            
-            # 打开音频文件
+            # 打开音频文件并调用 Whisper API
             with open(audio_path, "rb") as audio_file:
-                # 调用 Whisper API
                 transcript_response = openai.Audio.transcribe(
-                    model="whisper-1",
-                    file=audio_file,
-                    language=language if language != "auto" else None
+                    **self._whisper_request(audio_file, language)
                 )
+        except FileNotFoundError:
+            raise TranscriptionError(f"音频文件不存在: {audio_path}")
+        except Exception as e:
+            raise TranscriptionError(f"Whisper API 调用失败: {str(e)}")
+        return self._extract_transcript(transcript_response)
+    
+    async def _atranscribe_with_whisper(self, audio_path: str, language: str = "auto") -> str:
+        """使用 Whisper API 异步生成转录
+        
+        不经过 openai.Audio.atranscribe：该接口先把整个音频文件编码进内存中的
+        multipart 请求体再发送，并发转录 N 个文件就要常驻 N 份音频。这里用
+        aiohttp 的 multipart 表单直接上传，文件按块从磁盘读出写入连接；
+        已通过 shared_openai_session 设置共用会话时复用其连接池。
+        
+        Args:
+            audio_path: 音频文件路径
+            language: 语言代码
             
-            # 提取转录文本
-            transcript = transcript_response.get("text", "")
-            
-            if not transcript:
-                raise TranscriptionError("Whisper API 返回空转录文本")
+        Returns:
+            转录文本
             
-            return transcript
+        Raises:
+            TranscriptionError: 转录失败
+        """
+        openai = self._openai()
+        try:
+            import aiohttp
+        except ImportError:
+            raise TranscriptionError("aiohttp 库未安装，请运行 pip install aiohttp")
         
-        except TranscriptionError:
-            raise
+        try:
+            with open(audio_path, "rb") as audio_file:
+                form = aiohttp.FormData()
+                form.add_field("model", "whisper-1")
+                if language != "auto":
+                    form.add_field("language", language)
+                form.add_field(
+                    "file",
+                    audio_file,
+                    filename=Path(audio_path).name,
+                    content_type="application/octet-stream",
+                )
+                
+                url = openai.api_base.rstrip("/") + TRANSCRIPTIONS_PATH
+                session = openai.aiosession.get()
+                if session is not None:
+                    transcript_response = await self._post_transcription(session, url, form)
+                else:
+                    async with aiohttp.ClientSession() as session:
+                        transcript_response = await self._post_transcription(session, url, form)
         except FileNotFoundError:
             raise TranscriptionError(f"音频文件不存在: {audio_path}")
+        except TranscriptionError:
+            raise
         except Exception as e:
             raise TranscriptionError(f"Whisper API 调用失败: {str(e)}")
+        return self._extract_transcript(transcript_response)
+    
+    async def _post_transcription(self, session: Any, url: str, form: Any) -> Dict[str, Any]:
+        """
+        上传 multipart 表单并解析转录接口的 JSON 回复
+        
+        Args:
+            session: aiohttp 会话
+            url: 转录接口地址
+            form: 包含音频文件的 multipart 表单
+        
+        Returns:
+            回复的 JSON 对象
+        
+        Raises:
+            TranscriptionError: 接口返回错误状态
+        """
+        import aiohttp
+        
+        async with session.post(
+            url,
+            data=form,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            timeout=aiohttp.ClientTimeout(total=WHISPER_TIMEOUT),
+        ) as response:
+            payload = await response.json(content_type=None)
+        
+        if response.status >= 400:
+            error = payload.get("error") if isinstance(payload, dict) else None
+            message = error.get("message") if isinstance(error, dict) else payload
+            raise TranscriptionError(f"Whisper API 调用失败: HTTP {response.status}: {message}")
+        return payload
+    
+    def _openai(self):
+        """导入 openai 并检查 API 密钥
+        
+        密钥随每个请求传入，不写入 openai 模块的全局配置。
+        
+        Raises:
+            TranscriptionError: openai 未安装或未设置 API 密钥
+        """
+        try:
+            import openai
+        except ImportError:
+            raise TranscriptionError("openai 库未安装，请运行 pip install openai")
+        
+        if not self.api_key:
+            raise TranscriptionError("未设置 OPENAI_API_KEY 环境变量")
+        
+        return openai
+    
+    def _whisper_request(self, audio_file: Any, language: str) -> Dict[str, Any]:
+        """构建 Whisper 请求参数"""
+        return {
+            "model": "whisper-1",
+            "file": audio_file,
+            "language": language if language != "auto" else None,
+            "api_key": self.api_key,
+        }
+    
+    @staticmethod
+    def _extract_transcript(transcript_response: Any) -> str:
+        """从 API 响应中提取转录文本
+        
+        Raises:
+            TranscriptionError: 转录文本为空
+        """
+        transcript = transcript_response.get("text", "")
+        
+        if not transcript:
+            raise TranscriptionError("Whisper API 返回空转录文本")
+        
+        return transcript
+    
+    def _cache_key(self, audio_path: str) -> Optional[str]:
+        """计算音频文件的缓存键，文件不存在或无法读取时返回 None"""
+        try:
+            return self.key_generator.generate_transcript_fingerprint_key(audio_path)
+        except OSError:
+            return None
     
     def is_cached(self, audio_path: str) -> bool:
         """检查转录文本是否已缓存
@@ -148,8 +316,8 @@ class TranscriptGenerator:
         if self.cache is None:
             return False
         
-        cache_key = self.key_generator.generate_transcript_key(str(audio_path))
-        return self.cache.get(cache_key) is not None
+        cache_key = self._cache_key(audio_path)
+        return cache_key is not None and self.cache.get(cache_key) is not None
     
     def get_cached_transcript(self, audio_path: str) -> Optional[str]:
         """获取缓存的转录文本
@@ -163,8 +331,8 @@ class TranscriptGenerator:
         if self.cache is None:
             return None
         
-        cache_key = self.key_generator.generate_transcript_key(str(audio_path))
-        return self.cache.get(cache_key)
+        cache_key = self._cache_key(audio_path)
+        return self.cache.get(cache_key) if cache_key is not None else None
     
     def delete_cached_transcript(self, audio_path: str) -> None:
         """删除缓存的转录文本
@@ -175,46 +343,74 @@ class TranscriptGenerator:
         if self.cache is None:
             return
         
-        cache_key = self.key_generator.generate_transcript_key(str(audio_path))
+        cache_key = self._cache_key(audio_path)
+        if cache_key is None:
+            return
         self.cache.delete(cache_key)
         logger.info(f"已删除缓存的转录文本: {audio_path}")
     
-    def generate_concurrent(self, audio_paths: list, thread_pool=None) -> Dict[str, str]:
+    def generate_concurrent(
+        self,
+        audio_paths: list,
+        thread_pool=None,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS
+    ) -> Dict[str, str]:
         """并发生成多个音频的转录文本
         
+        agenerate_concurrent 的同步包装，在新的事件循环中运行；
+        不能在已运行的事件循环中调用，此时请直接 await agenerate_concurrent。
+        
         Args:
             audio_paths: 音频文件路径列表
-            thread_pool: 线程池实例（可选）
+            thread_pool: 已不再使用，仅为兼容保留；API 调用是 I/O 密集型，改由事件循环并发
+            max_concurrency: 同时进行的 API 请求数上限
         
         Returns:
             音频路径到转录文本的映射字典
         """
-        results = {}
+        return asyncio.run(
+            self.agenerate_concurrent(audio_paths, max_concurrency=max_concurrency)
+        )
+    
+    async def agenerate_concurrent(
+        self,
+        audio_paths: list,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS
+    ) -> Dict[str, str]:
+        """异步并发生成多个音频的转录文本
         
-        if thread_pool is None:
-            # 如果没有提供线程池，直接顺序生成
-            for audio_path in audio_paths:
-                try:
-                    transcript = self.generate(audio_path)
-                    results[audio_path] = transcript
-                except Exception as e:
-                    logger.error(f"生成 {audio_path} 的转录失败: {e}")
-                    results[audio_path] = None
-        else:
-            # 使用线程池并发生成
-            futures = {}
-            for audio_path in audio_paths:
-                task_id = f"transcribe_{hash(audio_path)}"
-                future = thread_pool.submit(task_id, self.generate, audio_path)
-                futures[audio_path] = future
-            
-            # 收集结果
-            for audio_path, future in futures.items():
+        所有请求在同一事件循环中发出，由信号量限制同时进行的请求数。
+        指向同一文件（绝对路径相同）的多个路径只转录一次。
+        
+        Args:
+            audio_paths: 音频文件路径列表
+            max_concurrency: 同时进行的 API 请求数上限
+        
+        Returns:
+            音频路径到转录文本的映射字典，失败的项为 None
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(audio_path: str) -> Optional[str]:
+            async with semaphore:
                 try:
-                    transcript = thread_pool.get_result(f"transcribe_{hash(audio_path)}")
-                    results[audio_path] = transcript
+                    return await self.agenerate(audio_path)
                 except Exception as e:
                     logger.error(f"生成 {audio_path} 的转录失败: {e}")
-                    results[audio_path] = None
+                    return None
+        
+        # 绝对路径 -> 首次出现的原始路径
+        unique: Dict[str, str] = {}
+        for audio_path in audio_paths:
+            unique.setdefault(os.path.abspath(audio_path), audio_path)
         
-        return results
+        # 整批请求共用一个连接池，不再为每个请求重新建立 TLS 连接
+        async with shared_openai_session(max_concurrency):
+            transcripts = dict(zip(
+                unique,
+                await asyncio.gather(*(run(audio_path) for audio_path in unique.values())),
+            ))
+        return {
+            audio_path: transcripts[os.path.abspath(audio_path)]
+            for audio_path in audio_paths
+        }